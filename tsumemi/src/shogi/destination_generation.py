@@ -5,11 +5,11 @@ import itertools
 
 from typing import TYPE_CHECKING
 
-from tsumemi.src.shogi.basetypes import Koma, Side
+from tsumemi.src.shogi.basetypes import Koma, KomaType, Side
 from tsumemi.src.shogi.position_internals import Dir
 
 if TYPE_CHECKING:
-    from typing import Any, Callable, Iterable, Generator
+    from typing import Any, Callable, Dict, Iterable, Generator, List, Tuple
     from tsumemi.src.shogi.position_internals import MailboxBoard
     Steps = Generator[int, None, None]
     IdxIterable = Iterable[int]
@@ -144,3 +144,64 @@ def generate_dests_ry(
         start_idx+Dir.SW, start_idx+Dir.NW
     )
     return itertools.chain(hisha, alfil)
+
+
+# Attack patterns, for asking which koma attack a square rather than
+# which squares a koma attacks. Steps are found by running the step
+# generators from index 0, which gives the offsets themselves.
+_ORTHOGONAL_DIRS = (Dir.N, Dir.S, Dir.E, Dir.W)
+_DIAGONAL_DIRS = (Dir.NE, Dir.SE, Dir.SW, Dir.NW)
+_ATTACK_STEPS: Dict[KomaType, Callable[[int, Side], Steps]] = {
+    KomaType.FU: steps_fu,
+    KomaType.KE: steps_ke,
+    KomaType.GI: steps_gi,
+    KomaType.KI: steps_ki,
+    KomaType.OU: steps_ou,
+    KomaType.TO: steps_ki,
+    KomaType.NY: steps_ki,
+    KomaType.NK: steps_ki,
+    KomaType.NG: steps_ki,
+}
+
+@functools.lru_cache(maxsize=None)
+def get_attack_pattern(ktype: KomaType, side: Side
+    ) -> Tuple[Tuple[int, ...], Tuple[Dir, ...]]:
+    """Return the step offsets and ray directions along which a koma
+    of the given type and side attacks.
+    """
+    if ktype in _ATTACK_STEPS:
+        return tuple(_ATTACK_STEPS[ktype](0, side)), ()
+    elif ktype == KomaType.KY:
+        return (), (_forward(side),)
+    elif ktype == KomaType.KA:
+        return (), _DIAGONAL_DIRS
+    elif ktype == KomaType.HI:
+        return (), _ORTHOGONAL_DIRS
+    elif ktype == KomaType.UM:
+        return tuple(map(int, _ORTHOGONAL_DIRS)), _DIAGONAL_DIRS
+    elif ktype == KomaType.RY:
+        return tuple(map(int, _DIAGONAL_DIRS)), _ORTHOGONAL_DIRS
+    raise ValueError(f"No attack pattern for {ktype}")
+
+def generate_attacker_idxs(
+        board: MailboxBoard, target_idx: int, side: Side, ktype: KomaType
+    ) -> List[int]:
+    """Return the indices of the koma of the given type and side that
+    attack the target square, whatever is on it. Only the squares a
+    koma could attack from are looked at: each step offset backwards,
+    and each ray backwards up to the first occupied square.
+    """
+    koma = Koma.make(side, ktype)
+    mailbox = board.mailbox
+    steps, rays = get_attack_pattern(ktype, side)
+    res = [
+        target_idx-step for step in steps
+        if mailbox[target_idx-step] == koma
+    ]
+    for ray in rays:
+        idx = target_idx - ray
+        while mailbox[idx] == Koma.NONE:
+            idx -= ray
+        if mailbox[idx] == koma:
+            res.append(idx)
+    return res
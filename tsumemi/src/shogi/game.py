@@ -163,6 +163,7 @@ class Game:
         nodes = self.movetree.traverse_mainline()
         nodes.__next__() # exclude the root node
         for node in nodes:
-            pos.make_move(node.move)
+            # Written from the position before the move, for disambiguation
             res.append(node.write_move(move_writer, pos))
+            pos.make_move(node.move)
         return res
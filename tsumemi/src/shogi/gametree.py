@@ -5,7 +5,7 @@ from typing import NewType, TYPE_CHECKING
 from tsumemi.src.shogi.move import NullMove
 
 if TYPE_CHECKING:
-    from typing import Any, Callable, Generator, Iterator, List
+    from typing import Any, Callable, Generator, Iterator, List, Optional
     from tsumemi.src.shogi.move import Move
     from tsumemi.src.shogi.notation import AbstractMoveWriter
     from tsumemi.src.shogi.position import Position
@@ -111,9 +111,11 @@ class MoveNode:
     def write_move(self,
             move_writer: AbstractMoveWriter,
             position: Position,
+            ambiguous_moves: Optional[List[Move]] = None,
         ) -> str:
         """Returns the node's move as a string in the format of
-        `move_writer`. The `position` is required for disambiguation.
+        `move_writer`. The `position` is required for disambiguation;
+        see `AbstractMoveWriter.write_move` for `ambiguous_moves`.
         """
         if self.move.is_null():
             return ""
@@ -121,7 +123,9 @@ class MoveNode:
             not self.parent.move.is_null()
             and self.parent.move.end_sq == self.move.end_sq
         )
-        return move_writer.write_move(self.move, position, is_same_sq)
+        return move_writer.write_move(
+            self.move, position, is_same_sq, ambiguous_moves
+        )
 
     def _rec_str(self, acc: List[Any],
             func: Callable[[MoveNode, List[Any]], None]
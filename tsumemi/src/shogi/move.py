@@ -3,11 +3,12 @@ from __future__ import annotations
 from typing import TYPE_CHECKING
 
 from tsumemi.src.shogi.basetypes import Koma, KomaType, SFEN_FROM_KOMA, KANJI_NOTATION_FROM_KTYPE
+from tsumemi.src.shogi.position_diff import PositionDiff
 from tsumemi.src.shogi.square import KanjiNumber, Square
 
 if TYPE_CHECKING:
-    from typing import Any, List
-    from tsumemi.src.shogi.basetypes import GameTermination
+    from typing import Any, Dict, List, Tuple
+    from tsumemi.src.shogi.basetypes import GameTermination, Side
 
 
 class Move:
@@ -52,6 +53,22 @@ class Move:
     def is_pass(self) -> bool:
         return self.start_sq == self.end_sq
 
+    def get_diff(self) -> PositionDiff:
+        """Return the squares and hand counts that making this move
+        changes.
+        """
+        if self.is_null() or self.is_pass():
+            return PositionDiff()
+        if self.is_drop:
+            return PositionDiff(
+                (self.end_sq,), {(self.side, KomaType.get(self.koma)): -1}
+            )
+        hand_deltas: Dict[Tuple[Side, KomaType], int] = {}
+        if self.captured != Koma.NONE:
+            captured_ktype = KomaType.get(self.captured).unpromote()
+            hand_deltas[(self.side, captured_ktype)] = 1
+        return PositionDiff((self.start_sq, self.end_sq), hand_deltas)
+
     def to_text(self) -> str:
         """Return easily-parseable string representation of a Move.
         Components are:
@@ -7,12 +7,14 @@ from tsumemi.src.shogi import rules
 from tsumemi.src.shogi.basetypes import Koma, KomaType
 from tsumemi.src.shogi.basetypes import KANJI_NOTATION_FROM_KTYPE, SFEN_FROM_KOMA
 from tsumemi.src.shogi.move import TerminationMove
+from tsumemi.src.shogi.position import Position
 
 if TYPE_CHECKING:
-    from typing import Callable, Iterable
+    from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
     from tsumemi.src.shogi.basetypes import Side
+    from tsumemi.src.shogi.game import Game
+    from tsumemi.src.shogi.gametree import MoveNode, MoveNodeId
     from tsumemi.src.shogi.move import Move
-    from tsumemi.src.shogi.position import Position
     from tsumemi.src.shogi.square import Square
     MoveFormat = Iterable["MoveNotationBuilder"]
     MoveNotationBuilder = Callable[[Move, Position, "AbstractMoveWriter"], str]
@@ -30,7 +32,7 @@ def _write_disambiguation(
     ) -> str:
     """MoveNotationBuilder function.
     """
-    ambiguous_moves = rules.get_ambiguous_moves(pos, move)
+    ambiguous_moves = move_writer.get_ambiguous_moves(move, pos)
     needs_disambiguation = move_writer.needs_disambiguation(
         move, ambiguous_moves
     )
@@ -104,6 +106,8 @@ class AbstractMoveWriter(ABC):
             for func in self.move_format
         )
         self.aggressive_disambiguation = False
+        # Ambiguous moves given to the move being written, if any
+        self._ambiguous_moves: Optional[List[Move]] = None
         return
 
     def get_new_instance(self) -> AbstractMoveWriter:
@@ -112,22 +116,36 @@ class AbstractMoveWriter(ABC):
         return self.__class__(self.move_format)
 
     def write_move(self,
-            move: Move, pos: Position, is_same: bool = False
+            move: Move,
+            pos: Position,
+            is_same: bool = False,
+            ambiguous_moves: Optional[List[Move]] = None,
         ) -> str:
         """Writes a shogi move as a string, given the move and the
         position it occurred in. `is_same` specifies if the move is
         to be written as though the prior move had the same
-        destination square.
+        destination square. `ambiguous_moves`, if given, must be
+        `rules.get_ambiguous_moves(pos, move)`, so that callers
+        writing a move several ways only work it out once.
         """
         if move.is_null():
             raise ValueError("Attempting to write notation for a NullMove")
         if isinstance(move, TerminationMove):
             return self.write_termination_move(move)
-        if is_same:
-            return "".join((
-                func(move, pos, self) for func in self.same_move_format
-            ))
-        return "".join((func(move, pos, self) for func in self.move_format))
+        move_format = self.same_move_format if is_same else self.move_format
+        self._ambiguous_moves = ambiguous_moves
+        try:
+            return "".join((func(move, pos, self) for func in move_format))
+        finally:
+            self._ambiguous_moves = None
+
+    def get_ambiguous_moves(self, move: Move, pos: Position) -> List[Move]:
+        """Return the legal moves to the same square by other pieces
+        of the same kind as the move being written.
+        """
+        if self._ambiguous_moves is not None:
+            return self._ambiguous_moves
+        return rules.get_ambiguous_moves(pos, move)
 
 
     def needs_disambiguation(self,
@@ -302,6 +320,46 @@ class IrohaMoveWriter(JapaneseMoveWriter):
         return IrohaMoveWriter.IROHA_SQUARES[sq-1]
 
 
+def write_game_notation(
+        game: Game, move_writers: Sequence[AbstractMoveWriter]
+    ) -> Dict[MoveNodeId, Tuple[str, ...]]:
+    """Write every move of the game's movetree, variations included,
+    with each of the move writers. Returns the notation of each node
+    by node id, in the order of `move_writers`; the root gets empty
+    strings. The tree is walked once on a single position, and the
+    moves each move could be confused with are worked out once and
+    shared by all the writers.
+    """
+    pos = Position()
+    pos.from_sfen(game.movetree.start_pos)
+    res: Dict[MoveNodeId, Tuple[str, ...]] = {
+        game.movetree.id: tuple("" for _ in move_writers)
+    }
+    # Depth-first, making each move on the way down and unmaking it
+    # on the way back up
+    stack: List[Tuple[MoveNode, bool]] = [
+        (node, True) for node in reversed(game.movetree.variations)
+    ]
+    while stack:
+        node, is_entering = stack.pop()
+        if not is_entering:
+            pos.unmake_move(node.move)
+            continue
+        move = node.move
+        ambiguous_moves = (
+            None if isinstance(move, TerminationMove)
+            else rules.get_ambiguous_moves(pos, move)
+        )
+        res[node.id] = tuple(
+            node.write_move(move_writer, pos, ambiguous_moves)
+            for move_writer in move_writers
+        )
+        pos.make_move(move)
+        stack.append((node, False))
+        stack.extend((child, True) for child in reversed(node.variations))
+    return res
+
+
 def _disambiguate_japanese_move(
         move: Move,
         ambiguous_moves: Iterable[Move],
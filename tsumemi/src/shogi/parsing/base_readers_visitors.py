@@ -40,6 +40,15 @@ class GameBuilderPVis(ParserVisitor):
         super().__init__()
         return
 
+    def visit_comment(self, reader: Reader, line: str) -> None:
+        # Comment lines belong to the move before them
+        node = reader.game.curr_node
+        comment = line[1:]
+        node.comment = (
+            comment if not node.comment else "\n".join((node.comment, comment))
+        )
+        return
+
     def visit_handicap(self, reader: Reader, handicap_sfen: str) -> None:
         pos = reader.game.position
         movetree = reader.game.movetree
@@ -1,25 +1,50 @@
 from __future__ import annotations
 
+import io
+
 from typing import TYPE_CHECKING
 
 from tsumemi.src.shogi.parsing.base_readers_visitors import GameBuilderPVis
 from tsumemi.src.shogi.game import Game
-from tsumemi.src.shogi.parsing.kif_reader import KifReader
+from tsumemi.src.shogi.parsing.kif_reader import KifDiagnostic, KifReader
+from tsumemi.src.shogi.parsing.kif_writer import KifWriter
 
 if TYPE_CHECKING:
     import os
-    from typing import Optional, Union
+    import typing
+    from typing import Generator, Iterable, List, Optional, Tuple, Union
     PathLike = Union[str, os.PathLike]
 
 
+class KifReadResult:
+    """Outcome of reading one KIF file in tolerant mode. `game` is None
+    if the file could not be read at all.
+    """
+    def __init__(self,
+            filepath: PathLike,
+            game: Optional[Game],
+            diagnostics: List[KifDiagnostic],
+        ) -> None:
+        self.filepath: PathLike = filepath
+        self.game: Optional[Game] = game
+        self.diagnostics: List[KifDiagnostic] = diagnostics
+        return
+
+    def is_ok(self) -> bool:
+        return self.game is not None and not self.diagnostics
+
+
+# KIF files in the wild are mostly Shift-JIS, sometimes UTF-8
+KIF_ENCODINGS = ("cp932", "utf-8")
+
+
 def read_kif(filepath: PathLike) -> Optional[Game]:
     """Read a KIF file and return the complete game.
     """
-    encodings = ["cp932", "utf-8"]
     visitor = GAME_BUILDER_PVIS
     reader = KIF_READER
     game = None
-    for enc in encodings:
+    for enc in KIF_ENCODINGS:
         try:
             with open(filepath, "r", encoding=enc) as _file:
                 game = reader.read(_file, visitor)
@@ -30,8 +55,92 @@ def read_kif(filepath: PathLike) -> Optional[Game]:
     return game
 
 
+def read_kif_string(text: str) -> Game:
+    """Read KIF data that is already in memory and return the complete
+    game.
+    """
+    return KIF_READER.read(io.StringIO(text), GAME_BUILDER_PVIS)
+
+
+def write_kif(game: Game, filepath: PathLike) -> None:
+    """Write the complete game to a KIF file. Following convention,
+    .kifu files are written as UTF-8 and anything else as Shift-JIS.
+    """
+    is_utf8 = str(filepath).endswith(".kifu")
+    encoding = "utf-8" if is_utf8 else "cp932"
+    with open(filepath, "w", encoding=encoding, errors="replace") as _file:
+        _file.write(
+            "#KIF version=2.0 encoding="
+            + ("UTF-8" if is_utf8 else "Shift_JIS") + "\n"
+        )
+        KIF_WRITER.write(game, _file)
+    return
+
+
+def decode_kif_bytes(data: bytes) -> Optional[str]:
+    """Decode raw KIF file contents, trying the same encodings as
+    read_kif(). Returns None if no encoding fits.
+    """
+    for enc in KIF_ENCODINGS:
+        try:
+            return data.decode(enc)
+        except UnicodeDecodeError:
+            pass
+    return None
+
+
+def read_kifs_tolerant(filepaths: Iterable[PathLike]
+    ) -> Generator[KifReadResult, None, None]:
+    """Read many KIF files one after another, yielding each game along
+    with diagnostics for any malformed lines instead of raising.
+    """
+    for filepath in filepaths:
+        try:
+            with open(filepath, "rb") as kif_file:
+                data = kif_file.read()
+        except OSError as exc:
+            yield KifReadResult(filepath, None,
+                [KifDiagnostic(0, "", f"Could not read file: {exc}")]
+            )
+            continue
+        text = decode_kif_bytes(data)
+        if text is None:
+            yield KifReadResult(filepath, None,
+                [KifDiagnostic(0, "", "Could not decode file")]
+            )
+            continue
+        # Each game is yielded to the caller, so it needs its own reader
+        reader = KifReader(tolerant=True)
+        game = reader.read(io.StringIO(text), GAME_BUILDER_PVIS)
+        yield KifReadResult(filepath, game, reader.diagnostics)
+    return
+
+
+def write_diagnostics_report(
+        results: Iterable[KifReadResult], handle: typing.TextIO
+    ) -> Tuple[int, int]:
+    """Write one line per diagnostic and a closing summary to the
+    handle as results come in. Returns the number of files read and the
+    number of files with problems.
+    """
+    num_files = 0
+    num_bad_files = 0
+    for result in results:
+        num_files += 1
+        if result.is_ok():
+            continue
+        num_bad_files += 1
+        for diagnostic in result.diagnostics:
+            handle.write(f"{result.filepath}: {diagnostic}\n")
+    handle.write(
+        f"{num_files} files read, {num_bad_files} with problems\n"
+    )
+    return num_files, num_bad_files
+
+
 # Since these are essentially just collections of methods a single
 # instance suffices for speed. (Actually, are classes even needed for
 # polymorphism?)
 KIF_READER = KifReader()
+KIF_WRITER = KifWriter()
 GAME_BUILDER_PVIS = GameBuilderPVis()
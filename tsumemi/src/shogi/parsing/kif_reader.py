@@ -13,7 +13,7 @@ from tsumemi.src.shogi.square import KanjiNumber, Square
 
 if TYPE_CHECKING:
     import typing
-    from typing import Dict, Generator, List, Sequence, Tuple
+    from typing import Dict, Generator, List, Optional, Sequence, Tuple
     from tsumemi.src.shogi.basetypes import KomaType
 
 
@@ -62,52 +62,137 @@ KIF_VARIATION_REGEX: re.Pattern[str] = re.compile(
 )
 
 
+# Lookup tables for the fast path of move line parsing. They only cover
+# the well-formed common case; anything else goes through the regexes.
+_FAST_COL_CHARS: Dict[str, int] = {
+    **{str(col): col for col in range(1, 10)},
+    **{chr(ord("０") + col): col for col in range(1, 10)},
+}
+_FAST_DEST_SQ: Dict[str, Square] = {
+    col_char + KanjiNumber(row).name: Square.from_cr(col, row)
+    for col_char, col in _FAST_COL_CHARS.items()
+    for row in range(1, 10)
+}
+_FAST_ORIGIN_SQ: Dict[str, Square] = {
+    f"({col}{row})": Square.from_cr(col, row)
+    for col in range(1, 10)
+    for row in range(1, 10)
+}
+# Same koma as KIF_MOVE_REGEX accepts; other 成 prefixes fall back
+_FAST_KTYPE: Dict[str, KomaType] = {
+    kanji: KTYPE_FROM_KANJI[kanji] for kanji in "歩香桂銀金角飛玉と龍竜馬全圭杏"
+}
+_FAST_PROMOTED_KTYPE: Dict[str, KomaType] = {
+    kanji: KTYPE_FROM_KANJI[kanji].promote() for kanji in "香桂銀"
+}
+_FAST_KOMA: Dict[Tuple[Side, KomaType], Koma] = {
+    (side, ktype): Koma.make(side, ktype)
+    for side in (Side.SENTE, Side.GOTE)
+    for ktype in (*_FAST_KTYPE.values(), *_FAST_PROMOTED_KTYPE.values())
+}
+_ASCII_DIGITS = frozenset("0123456789")
+
+
+class KifDiagnostic:
+    """A problem found while reading a KIF file in tolerant mode.
+    """
+    def __init__(self, line_num: int, line: str, reason: str) -> None:
+        self.line_num: int = line_num
+        self.line: str = line
+        self.reason: str = reason
+        return
+
+    def __str__(self) -> str:
+        return f"line {self.line_num}: {self.reason} ({self.line})"
+
+
 class KifReader(Reader):
-    def __init__(self) -> None:
+    """Reads KIF files into a Game.
+
+    By default the first malformed line raises. In tolerant mode,
+    malformed lines are recorded as KifDiagnostics in
+    `self.diagnostics` instead, and the rest of the branch they were in
+    is skipped until the next variation starts. Any error from a line
+    is recorded, so one bad file never stops a batch of files.
+    """
+    def __init__(self, tolerant: bool = False) -> None:
         super().__init__()
+        self.tolerant: bool = tolerant
+        self.diagnostics: List[KifDiagnostic] = []
+        self._line_num: int = 0
+        self._is_skipping_branch: bool = False
         return
 
     def read(self, handle: typing.TextIO, visitor: ParserVisitor) -> Game:
         self.game.reset()
-        line = handle.readline()
+        self.diagnostics = []
+        self._line_num = 0
+        self._is_skipping_branch = False
+        line = self._readline(handle)
         while line != "":
             line = line.lstrip().rstrip()
-            if line == "":
-                pass
-            elif line.startswith("手合割："):
-                handicap_sfen = self.read_handicap_line(line)
-                visitor.visit_handicap(self, handicap_sfen)
-            elif line.startswith("後手の持駒："):
-                # Signals start of BOD, read all of it
-                bod_lines = [line]
-                while (not line.startswith("先手の持駒：")) and line:
-                    line = handle.readline()
-                    bod_lines.append(line.lstrip().rstrip())
-                self.read_bod(bod_lines)
-                #visitor.visit_board(self, bod_lines)
-            elif line.startswith("手数--"):
-                # movesection delineation
-                pass
-            elif line[0].isdigit():
-                # Signals a move; thus, requires moves to be numbered.
-                move = self.read_move(line)
-                visitor.visit_move(self, move)
-            elif line.startswith("*"):
-                visitor.visit_comment(self, line)
-            elif line.startswith("#"):
-                visitor.visit_escape(self, line)
-            elif line.startswith("変化："):
-                # Variation
-                self.read_variation(line)
-                # visitor.visit_variation(self, line)
-            else:
-                # Unknown line; skip it
-                pass
-            # MUST fallthrough to here to complete one while iteration
-            line = handle.readline()
+            line_num = self._line_num
+            try:
+                self.read_line(line, handle, visitor)
+            except Exception as exc:
+                if not self.tolerant:
+                    raise
+                reason = str(exc.args[0]) if exc.args else type(exc).__name__
+                self.diagnostics.append(KifDiagnostic(line_num, line, reason))
+                if line[:1].isdigit() or line.startswith("変化："):
+                    self._is_skipping_branch = True
+            line = self._readline(handle)
         self.game.go_to_start()
         return self.game
 
+    def read_line(self,
+            line: str, handle: typing.TextIO, visitor: ParserVisitor
+        ) -> None:
+        """Read one stripped line. BOD sections are read to the end
+        from the handle.
+        """
+        if line == "":
+            pass
+        elif line.startswith("手合割："):
+            handicap_sfen = self.read_handicap_line(line)
+            visitor.visit_handicap(self, handicap_sfen)
+        elif line.startswith("後手の持駒："):
+            # Signals start of BOD, read all of it
+            bod_lines = [line]
+            while (not line.startswith("先手の持駒：")) and line:
+                line = self._readline(handle)
+                bod_lines.append(line.lstrip().rstrip())
+            self.read_bod(bod_lines)
+            #visitor.visit_board(self, bod_lines)
+        elif line.startswith("手数--"):
+            # movesection delineation
+            pass
+        elif line[0].isdigit():
+            # Signals a move; thus, requires moves to be numbered.
+            if self._is_skipping_branch:
+                return
+            move = self.read_move(line)
+            visitor.visit_move(self, move)
+        elif line.startswith("*"):
+            if self._is_skipping_branch:
+                return
+            visitor.visit_comment(self, line)
+        elif line.startswith("#"):
+            visitor.visit_escape(self, line)
+        elif line.startswith("変化："):
+            # Variation
+            self._is_skipping_branch = False
+            self.read_variation(line)
+            # visitor.visit_variation(self, line)
+        else:
+            # Unknown line; skip it
+            pass
+        return
+
+    def _readline(self, handle: typing.TextIO) -> str:
+        self._line_num += 1
+        return handle.readline()
+
     def read_handicap_line(self, line: str) -> str:
         """Reads the handicap field. Returns a SFEN string.
         """
@@ -145,6 +230,64 @@ class KifReader(Reader):
         return
 
     def read_move(self, line: str) -> Move:
+        move = self._read_move_fast(line)
+        return self._read_move_regex(line) if move is None else move
+
+    def _read_move_fast(self, line: str) -> Optional[Move]:
+        """Read a well-formed move line by checking characters at
+        known offsets against lookup tables. Returns None for anything
+        unusual (termination, 不成, malformed lines, etc.), which must
+        then be read with _read_move_regex().
+        """
+        # Indexing past the end raises IndexError; any such line is
+        # unusual and left to the regex path.
+        try:
+            # Move number, ASCII digits only, then at least one space
+            idx = 0
+            while line[idx] in _ASCII_DIGITS:
+                idx += 1
+            if idx == 0 or line[idx] not in " \t":
+                return None
+            movenum = int(line[:idx])
+            while line[idx] in " \t":
+                idx += 1
+            # Destination square
+            if line[idx] == "同" and line[idx+1] == "　":
+                if self.game.curr_node.move.is_null():
+                    return None
+                end_sq = self.game.curr_node.move.end_sq
+                if end_sq == Square.NONE:
+                    return None
+            else:
+                end_sq = _FAST_DEST_SQ[line[idx:idx+2]]
+            idx += 2
+            # Koma type
+            if line[idx] == "成":
+                ktype = _FAST_PROMOTED_KTYPE[line[idx+1]]
+                idx += 2
+            else:
+                ktype = _FAST_KTYPE[line[idx]]
+                idx += 1
+            # Drop, promotion and origin square
+            is_promotion = False
+            if line[idx] == "打":
+                if ktype not in HAND_TYPES:
+                    return None
+                start_sq = Square.HAND
+            else:
+                if line[idx] == "成":
+                    is_promotion = True
+                    idx += 1
+                start_sq = _FAST_ORIGIN_SQ[line[idx:idx+4]]
+        except (IndexError, KeyError):
+            return None
+        side = Side.SENTE if (movenum % 2 == 1) else Side.GOTE
+        captured = self.game.position.get_koma(end_sq)
+        return Move(start_sq, end_sq, is_promotion, _FAST_KOMA[side, ktype],
+            captured
+        )
+
+    def _read_move_regex(self, line: str) -> Move:
         game = self.game
         movenum, movestr, _, _ = _read_kif_move_line(line)
         # Identify move components
@@ -174,14 +317,17 @@ class KifReader(Reader):
         if line_match is None:
             raise ValueError("KIF variation regex failed to match: " + line)
         var_movenum = int(line_match.group("movenum"))
-        while (
-            (not game.curr_node.is_null())
-            and game.curr_node.movenum != var_movenum
-        ):
+        if var_movenum < 1:
+            raise ValueError(f"Invalid variation move number {var_movenum}")
+        # Go to the move before the variation. The root has movenum 0,
+        # so this stops there at the latest. A branch that ends right
+        # before the variation (e.g. after a skipped bad move) is fine.
+        while game.curr_node.movenum >= var_movenum:
             game.go_prev_move()
-        game.go_prev_move() # Once more to reach the prior move
-        if game.curr_node.is_null():
-            raise Exception("HALP desired movenum not found")
+        if game.curr_node.movenum != var_movenum - 1:
+            raise ValueError(
+                f"Move {var_movenum} not found, cannot start variation"
+            )
         return
 
 
@@ -202,6 +348,8 @@ def _read_bod_hand(bod_hand_line: str) -> List[Tuple[KomaType, int]]:
         elif len(entry) == 3:
             # e.g. 十八 = 18; max for a shogi position should be 18 (pawns)
             count = int(KanjiNumber[entry[1]]) + int(KanjiNumber[entry[2]])
+        else:
+            raise ValueError(f"Invalid piece count in hand: {entry}")
         res.append((ktype, count))
     return res
 
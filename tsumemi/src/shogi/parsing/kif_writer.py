@@ -0,0 +1,145 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+from tsumemi.src.shogi.basetypes import Koma, KomaType, Side
+from tsumemi.src.shogi.basetypes import HAND_TYPES, KANJI_FROM_KTYPE
+from tsumemi.src.shogi.basetypes import KANJI_NOTATION_FROM_KTYPE
+from tsumemi.src.shogi.move import TerminationMove
+from tsumemi.src.shogi.parsing.kif_reader import SFEN_FROM_HANDICAP
+from tsumemi.src.shogi.position import Position
+from tsumemi.src.shogi.square import FULL_WIDTH_NUMBER, KanjiNumber, Square
+
+if TYPE_CHECKING:
+    import typing
+    from typing import Dict, List, Tuple
+    from tsumemi.src.shogi.game import Game
+    from tsumemi.src.shogi.gametree import GameNode, MoveNode
+
+
+HANDICAP_FROM_SFEN: Dict[str, str] = {
+    sfen: handicap for handicap, sfen in SFEN_FROM_HANDICAP.items()
+}
+
+
+class KifWriter:
+    """Writes a game, including variations and comments, to a text
+    handle in KIF format. Output is written line by line as the game
+    tree is traversed, never built up as one string.
+    """
+    def __init__(self) -> None:
+        return
+
+    def write(self, game: Game, handle: typing.TextIO) -> None:
+        movetree = game.movetree
+        self.write_header(movetree, handle)
+        handle.write("手数----指手---------消費時間--\n")
+        self.write_comment(movetree.comment, handle)
+        # Depth-first, main continuation first. Siblings are pushed in
+        # reverse so that they come out in order. When a variation is
+        # popped, the move before it is always an ancestor of the last
+        # written move, which is what a KIF reader needs.
+        stack: List[Tuple[MoveNode, bool]] = []
+        self._push_children(movetree, stack)
+        while stack:
+            node, is_variation = stack.pop()
+            if is_variation:
+                handle.write(f"\n変化：{node.movenum}手\n")
+            handle.write(f"{node.movenum:>4} {self.write_move(node)}\n")
+            self.write_comment(node.comment, handle)
+            self._push_children(node, stack)
+        return
+
+    def write_header(self, movetree: GameNode, handle: typing.TextIO) -> None:
+        """Write the starting position as a handicap line if it is a
+        known handicap, otherwise as a BOD diagram. Player names are
+        written if known.
+        """
+        start_sfen = (movetree.start_pos if movetree.start_pos
+            else SFEN_FROM_HANDICAP["平手"]
+        )
+        if start_sfen in HANDICAP_FROM_SFEN:
+            handle.write(f"手合割：{HANDICAP_FROM_SFEN[start_sfen]}\n")
+        else:
+            self.write_bod(start_sfen, handle)
+        handle.write(f"先手：{movetree.sente}\n")
+        handle.write(f"後手：{movetree.gote}\n")
+        return
+
+    def write_bod(self, sfen: str, handle: typing.TextIO) -> None:
+        pos = Position()
+        pos.from_sfen(sfen)
+        handle.write(f"後手の持駒：{_write_bod_hand(pos, Side.GOTE)}\n")
+        handle.write("  ９ ８ ７ ６ ５ ４ ３ ２ １\n")
+        handle.write("+---------------------------+\n")
+        for row in range(1, 10):
+            handle.write(f"|{_write_bod_row(pos, row)}|{KanjiNumber(row).name}\n")
+        handle.write("+---------------------------+\n")
+        handle.write(f"先手の持駒：{_write_bod_hand(pos, Side.SENTE)}\n")
+        if pos.turn == Side.GOTE:
+            handle.write("後手番\n")
+        return
+
+    def write_comment(self, comment: str, handle: typing.TextIO) -> None:
+        if not comment:
+            return
+        for line in comment.split("\n"):
+            handle.write(f"*{line}\n")
+        return
+
+    def write_move(self, node: MoveNode) -> str:
+        """Return the move leading to the node in KIF notation, e.g.
+        ７六歩(77), 同　銀(31) or ４五角打.
+        """
+        move = node.move
+        if isinstance(move, TerminationMove):
+            return move.to_ja_kif()
+        res: List[str] = []
+        if (not node.parent.move.is_null()
+                and node.parent.move.end_sq == move.end_sq):
+            res.append("同　")
+        else:
+            col, row = move.end_sq.get_cr()
+            res.extend((FULL_WIDTH_NUMBER[col], KanjiNumber(row).name))
+        res.append(KANJI_NOTATION_FROM_KTYPE[KomaType.get(move.koma)])
+        if move.is_promotion:
+            res.append("成")
+        res.append("打" if move.is_drop else f"({move.start_sq})")
+        return "".join(res)
+
+    def _push_children(self,
+            node: MoveNode, stack: List[Tuple[MoveNode, bool]]
+        ) -> None:
+        for idx in range(len(node.variations)-1, -1, -1):
+            stack.append((node.variations[idx], idx > 0))
+        return
+
+
+def _write_bod_hand(pos: Position, side: Side) -> str:
+    # Hand in BOD format, e.g. 飛二　角　歩十八, or なし if empty.
+    entries = []
+    for ktype in HAND_TYPES:
+        count = pos.get_hand_koma_count(side, ktype)
+        if count == 0:
+            continue
+        entry = KANJI_FROM_KTYPE[ktype]
+        if count >= 10:
+            entry += KanjiNumber.十.name
+            count -= 10
+        if count > 1 or (count == 1 and len(entry) > 1):
+            entry += KanjiNumber(count).name
+        entries.append(entry)
+    return "　".join(entries) if entries else "なし"
+
+
+def _write_bod_row(pos: Position, row: int) -> str:
+    # One board row in BOD format, from column 9 to column 1.
+    cells = []
+    for col in range(9, 0, -1):
+        koma = pos.get_koma(Square.from_cr(col, row))
+        if koma == Koma.NONE:
+            cells.append(" ・")
+        else:
+            prefix = "v" if koma.side() == Side.GOTE else " "
+            cells.append(prefix + KANJI_FROM_KTYPE[KomaType.get(koma)])
+    return "".join(cells)
@@ -5,8 +5,9 @@ import re
 from typing import TYPE_CHECKING
 
 from tsumemi.src.shogi.basetypes import Koma, KomaType, Side
-from tsumemi.src.shogi.basetypes import KOMA_FROM_SFEN
+from tsumemi.src.shogi.basetypes import HAND_TYPES, KOMA_FROM_SFEN
 from tsumemi.src.shogi.move import Move
+from tsumemi.src.shogi.position_diff import PositionDiff
 from tsumemi.src.shogi.square import Square
 from tsumemi.src.shogi.position_internals import HandRepresentation, MailboxBoard
 
@@ -43,6 +44,36 @@ class Position:
         self.movenum = 1
         return
 
+    def copy(self) -> Position:
+        pos = Position()
+        pos.board = self.board.copy()
+        pos.hand_sente = self.hand_sente.copy()
+        pos.hand_gote = self.hand_gote.copy()
+        pos.turn = self.turn
+        pos.movenum = self.movenum
+        return pos
+
+    def get_diff(self, other: Position) -> PositionDiff:
+        """Return the squares and hand counts that differ between self
+        and the other position, as changes going from self to other.
+        """
+        squares = [
+            MailboxBoard.idx_to_sq(idx)
+            for idx, (koma, other_koma) in enumerate(
+                zip(self.board.mailbox, other.board.mailbox)
+            )
+            if koma != other_koma
+        ]
+        hand_deltas = {
+            (side, ktype): (
+                other.get_hand_koma_count(side, ktype)
+                - self.get_hand_koma_count(side, ktype)
+            )
+            for side in (Side.SENTE, Side.GOTE)
+            for ktype in HAND_TYPES
+        }
+        return PositionDiff(squares, hand_deltas)
+
     def get_hand_of_side(self, side: Side) -> HandRepresentation:
         return self.hand_sente if side is Side.SENTE else self.hand_gote
 
@@ -0,0 +1,66 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from typing import Dict, Iterable, Optional, Set, Tuple
+    from tsumemi.src.shogi.basetypes import KomaType, Side
+    from tsumemi.src.shogi.square import Square
+
+
+class PositionDiff:
+    """What changed between two positions: the board squares whose
+    contents differ, and the change in count of each piece type in
+    each side's hand. Says nothing about what the squares now contain;
+    that is read off the new position.
+    """
+    def __init__(self,
+            squares: Optional[Iterable[Square]] = None,
+            hand_deltas: Optional[Dict[Tuple[Side, KomaType], int]] = None,
+        ) -> None:
+        self.squares: Set[Square] = (
+            set() if squares is None else set(squares)
+        )
+        self.hand_deltas: Dict[Tuple[Side, KomaType], int] = (
+            {} if hand_deltas is None else {
+                key: delta for key, delta in hand_deltas.items() if delta
+            }
+        )
+        return
+
+    def __eq__(self, obj: object) -> bool:
+        return (
+            isinstance(obj, PositionDiff)
+            and self.squares == obj.squares
+            and self.hand_deltas == obj.hand_deltas
+        )
+
+    def __repr__(self) -> str:
+        return f"PositionDiff({self.squares!r}, {self.hand_deltas!r})"
+
+    def is_empty(self) -> bool:
+        return not self.squares and not self.hand_deltas
+
+    def get_hand_sides(self) -> Set[Side]:
+        """Return the sides whose hands changed.
+        """
+        return {side for side, _ in self.hand_deltas}
+
+    def reverse(self) -> PositionDiff:
+        """Return the diff going from the new position back to the
+        old one.
+        """
+        return PositionDiff(
+            self.squares,
+            {key: -delta for key, delta in self.hand_deltas.items()},
+        )
+
+    def merge(self, later: PositionDiff) -> PositionDiff:
+        """Return the diff of applying self and then `later`. Squares
+        touched by either are kept even if they end up unchanged,
+        since a diff only promises to cover every changed square.
+        """
+        hand_deltas = dict(self.hand_deltas)
+        for key, delta in later.hand_deltas.items():
+            hand_deltas[key] = hand_deltas.get(key, 0) + delta
+        return PositionDiff(self.squares | later.squares, hand_deltas)
@@ -48,6 +48,15 @@ class MailboxBoard:
         board_str = "\n".join(rows)
         return board_str
 
+    def copy(self) -> MailboxBoard:
+        board = MailboxBoard()
+        board.mailbox = list(self.mailbox)
+        board.empty_idxs = set(self.empty_idxs)
+        board.koma_sets = {
+            koma: set(idxset) for koma, idxset in self.koma_sets.items()
+        }
+        return board
+
     @staticmethod
     def sq_to_idx(sq: Square) -> int:
         return MailboxBoard.cr_to_idx(*(sq.get_cr()))
@@ -178,6 +187,11 @@ class HandRepresentation:
         }
         return
 
+    def copy(self) -> HandRepresentation:
+        hand = HandRepresentation()
+        hand.mochigoma_dict = dict(self.mochigoma_dict)
+        return hand
+
     def set_komatype_count(self, ktype: KomaType, count: int) -> None:
         self.mochigoma_dict[ktype] = count
         return
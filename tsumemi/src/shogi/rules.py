@@ -31,16 +31,38 @@ def can_be_promotion(move: Move) -> bool:
     )
 
 def get_ambiguous_moves(pos: Position, move: Move) -> List[Move]:
+    """Return the legal moves to the same square as the given move by
+    other koma of the same type and side.
+    """
     start_sq = move.start_sq
     if not _is_move_from_square_available(pos, start_sq):
         return []
     koma = pos.get_koma(start_sq)
     side = koma.side()
     ktype = KomaType.get(koma)
+    end_sq = move.end_sq
+    _, promotion_constrainer = MOVEGEN_FUNCTIONS[ktype]
+    res = []
+    for sq in get_attacker_squares(pos, end_sq, side, ktype):
+        if sq == start_sq:
+            continue
+        for can_promote in promotion_constrainer(side, sq, end_sq):
+            mv = pos.create_move(sq, end_sq, can_promote)
+            if is_legal(mv, pos):
+                res.append(mv)
+    return res
+
+def get_attacker_squares(
+        pos: Position, sq: Square, side: Side, ktype: KomaType
+    ) -> List[Square]:
+    """Return the squares of the koma of the given type and side that
+    attack the square.
+    """
     return [
-        mv for mv in generate_valid_moves(pos, side, ktype)
-        if (mv.end_sq == move.end_sq) and (mv.start_sq != move.start_sq)
-        and is_legal(mv, pos)
+        MailboxBoard.idx_to_sq(idx)
+        for idx in destgen.generate_attacker_idxs(
+            pos.board, MailboxBoard.sq_to_idx(sq), side, ktype
+        )
     ]
 
 def is_legal(mv: Move, pos: Position) -> bool:
@@ -53,18 +75,14 @@ def is_legal(mv: Move, pos: Position) -> bool:
 def is_in_check(pos: Position, side: Side) -> bool:
     # assumes royal king(s)
     king = Koma.make(side, KomaType.OU)
-    king_pos = [
-        MailboxBoard.idx_to_sq(idx)
-        for idx in pos.board.koma_sets[king]
-    ]
-    if not list(king_pos):
-        return False
-    for ktype in KOMA_TYPES:
-        mvlist = generate_valid_moves(pos, side.switch(), ktype)
-        for mv in mvlist:
-            if mv.end_sq in king_pos:
-                return True
-    return False
+    attacking_side = side.switch()
+    return any(
+        destgen.generate_attacker_idxs(
+            pos.board, king_idx, attacking_side, ktype
+        )
+        for king_idx in pos.board.koma_sets[king]
+        for ktype in KOMA_TYPES
+    )
 
 def create_legal_moves_given_squares(
         pos: Position, start_sq: Square, end_sq: Square
@@ -0,0 +1,445 @@
+from __future__ import annotations
+
+import argparse
+import csv
+import os
+import sys
+
+from typing import TYPE_CHECKING
+
+import numpy as np
+
+from PIL import Image, ImageDraw, ImageFont
+
+from tsumemi.src.shogi.move import TerminationMove
+from tsumemi.src.shogi.parsing import kif
+from tsumemi.src.tsumemi import files
+from tsumemi.src.tsumemi.problem_list.problem_list_model import ProblemStatus
+from tsumemi.src.tsumemi.timer import Time
+
+if TYPE_CHECKING:
+    from typing import Dict, Iterable, Optional, Sequence, Tuple, Union
+    from tsumemi.src.shogi.game import Game
+    from tsumemi.src.tsumemi.problem_list.problem_list_model import ProblemList
+    PathLike = Union[str, os.PathLike]
+
+
+PERCENTILES = (10, 25, 50, 75, 90)
+DEFAULT_WINDOW = 10
+# Times further than this many interquartile ranges beyond the
+# quartiles are outliers
+OUTLIER_IQR_FACTOR = 1.5
+UNKNOWN_MATE_LENGTH = -1
+CORRECT = ProblemStatus.CORRECT.value
+NONE = ProblemStatus.NONE.value
+
+
+class SessionData:
+    """Times and statuses of a list of problems as NumPy arrays, in
+    problem list order. Problems without a time have a time of NaN;
+    problems whose solution length is unknown have a mate length of
+    UNKNOWN_MATE_LENGTH.
+    """
+    def __init__(self,
+            names: Sequence[str],
+            times: Sequence[float],
+            statuses: Sequence[int],
+            folders: Optional[Sequence[str]] = None,
+            mate_lengths: Optional[Sequence[int]] = None,
+        ) -> None:
+        num = len(names)
+        self.names: np.ndarray = np.array(names, dtype=object)
+        self.times: np.ndarray = np.array(times, dtype=np.float64)
+        self.statuses: np.ndarray = np.array(statuses, dtype=np.int8)
+        self.folders: np.ndarray = np.array(
+            [""] * num if folders is None else folders, dtype=object
+        )
+        self.mate_lengths: np.ndarray = np.array(
+            [UNKNOWN_MATE_LENGTH] * num if mate_lengths is None
+            else mate_lengths,
+            dtype=np.int32,
+        )
+        return
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    @classmethod
+    def from_problem_list(cls,
+            problem_list: ProblemList,
+            base_dir: PathLike = "",
+            mate_lengths: Optional[Sequence[int]] = None,
+        ) -> SessionData:
+        """Take the results of a problem list. Folders are taken
+        relative to `base_dir`.
+        """
+        names = []
+        folders = []
+        for prob in problem_list:
+            relpath = (os.path.relpath(prob.filepath, base_dir) if base_dir
+                else os.fspath(prob.filepath)
+            )
+            names.append(os.path.basename(relpath))
+            folders.append(os.path.dirname(relpath))
+        return cls(
+            names,
+            [np.nan if prob.time is None else float(prob.time)
+                for prob in problem_list],
+            [prob.status.value for prob in problem_list],
+            folders,
+            mate_lengths,
+        )
+
+    @classmethod
+    def from_csv(cls, filepath: PathLike) -> SessionData:
+        """Read the results exported by "Export results as CSV". The
+        export writes a time of 0 for problems never timed.
+        """
+        names = []
+        times = []
+        statuses = []
+        with open(filepath, newline="", encoding="utf-8-sig") as fin:
+            reader = csv.reader(fin)
+            next(reader, None)  # header
+            for row in reader:
+                if not row:
+                    continue
+                name, status_str, time_str = row[:3]
+                # Written as e.g. "ProblemStatus.CORRECT"
+                status = ProblemStatus[status_str.rsplit(".", 1)[-1]]
+                seconds = float(time_str)
+                names.append(name)
+                statuses.append(status.value)
+                times.append(
+                    np.nan if seconds == 0 and status == ProblemStatus.NONE
+                    else seconds
+                )
+        return cls(names, times, statuses)
+
+    def set_problem_info(self,
+            kif_paths: Iterable[PathLike], directory: PathLike
+        ) -> int:
+        """Fill in the folders and mate lengths of the problems from
+        the KIF files of the same names. Returns the number of problems
+        matched.
+        """
+        paths_by_name: Dict[str, PathLike] = {}
+        for kif_path in kif_paths:
+            paths_by_name.setdefault(os.path.basename(kif_path), kif_path)
+        matched = [
+            (idx, paths_by_name[name]) for idx, name in enumerate(self.names)
+            if name in paths_by_name
+        ]
+        mate_lengths = read_mate_lengths(path for _, path in matched)
+        for (idx, kif_path), mate_length in zip(matched, mate_lengths):
+            self.folders[idx] = os.path.dirname(
+                os.path.relpath(kif_path, directory)
+            )
+            self.mate_lengths[idx] = mate_length
+        return len(matched)
+
+
+def get_mate_length(game: Game) -> int:
+    """Return the number of moves in the mainline of the game, not
+    counting a final termination such as 詰み.
+    """
+    nodes = game.movetree.traverse_mainline()
+    next(nodes)  # exclude the root node
+    return sum(
+        1 for node in nodes if not isinstance(node.move, TerminationMove)
+    )
+
+
+def read_mate_lengths(kif_paths: Iterable[PathLike]) -> np.ndarray:
+    """Return the mate length of each KIF file, UNKNOWN_MATE_LENGTH
+    for those that cannot be read.
+    """
+    mate_lengths: np.ndarray = np.array([
+        UNKNOWN_MATE_LENGTH if result.game is None
+        else get_mate_length(result.game)
+        for result in kif.read_kifs_tolerant(kif_paths)
+    ], dtype=np.int32)
+    return mate_lengths
+
+
+def get_percentiles(
+        times: np.ndarray, pcts: Sequence[float] = PERCENTILES
+    ) -> Dict[float, float]:
+    """Return the given percentiles of the times, ignoring NaN, or an
+    empty dict if there are no times.
+    """
+    valid = times[~np.isnan(times)]
+    if valid.size == 0:
+        return {}
+    return dict(zip(pcts, np.percentile(valid, pcts).tolist()))
+
+
+def get_rolling_average(times: np.ndarray, window: int) -> np.ndarray:
+    """Return the average of each run of `window` consecutive times,
+    skipping problems without a time. Empty if there are fewer times
+    than the window.
+    """
+    valid = times[~np.isnan(times)]
+    if valid.size < window:
+        return np.empty(0)
+    cumsum = np.concatenate(([0.0], np.cumsum(valid)))
+    rolling: np.ndarray = (cumsum[window:] - cumsum[:-window]) / window
+    return rolling
+
+
+def find_outliers(
+        times: np.ndarray, factor: float = OUTLIER_IQR_FACTOR
+    ) -> np.ndarray:
+    """Return the indices of the times more than `factor` times the
+    interquartile range below the first or above the third quartile.
+    """
+    valid = ~np.isnan(times)
+    if not valid.any():
+        return np.empty(0, dtype=np.intp)
+    q1, q3 = np.percentile(times[valid], (25, 75))
+    spread = factor * (q3 - q1)
+    # NaN compares false, so problems without a time are never outliers
+    with np.errstate(invalid="ignore"):
+        is_outlier = (times < q1 - spread) | (times > q3 + spread)
+    return np.flatnonzero(is_outlier)
+
+
+class Breakdown:
+    """Statistics of groups of problems, one entry per group in each
+    array, groups sorted by key.
+    """
+    def __init__(self,
+            keys: np.ndarray,
+            counts: np.ndarray,
+            num_seen: np.ndarray,
+            num_correct: np.ndarray,
+            mean_times: np.ndarray,
+            median_times: np.ndarray,
+        ) -> None:
+        self.keys: np.ndarray = keys
+        self.counts: np.ndarray = counts
+        self.num_seen: np.ndarray = num_seen
+        self.num_correct: np.ndarray = num_correct
+        self.mean_times: np.ndarray = mean_times
+        self.median_times: np.ndarray = median_times
+        return
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    def rows(self) -> Iterable[Tuple[object, int, int, int, float, float]]:
+        return zip(
+            self.keys.tolist(), self.counts.tolist(), self.num_seen.tolist(),
+            self.num_correct.tolist(), self.mean_times.tolist(),
+            self.median_times.tolist(),
+        )
+
+
+def get_breakdown(data: SessionData, keys: np.ndarray) -> Breakdown:
+    """Group the problems by key (e.g. data.folders) and return the
+    number of problems, seen and correct, and the mean and median time
+    of each group. Groups without times have NaN times.
+    """
+    group_keys, groups = np.unique(keys, return_inverse=True)
+    num_groups = len(group_keys)
+    counts = np.bincount(groups, minlength=num_groups)
+    num_seen = np.bincount(
+        groups, weights=data.statuses != NONE, minlength=num_groups
+    ).astype(np.int64)
+    num_correct = np.bincount(
+        groups, weights=data.statuses == CORRECT, minlength=num_groups
+    ).astype(np.int64)
+    timed = ~np.isnan(data.times)
+    timed_groups = groups[timed]
+    timed_times = data.times[timed]
+    num_timed = np.bincount(timed_groups, minlength=num_groups)
+    sums = np.bincount(timed_groups, weights=timed_times, minlength=num_groups)
+    # Sort the times by group, then by time, so that each group's
+    # times are a sorted run whose middle is the median
+    order = np.lexsort((timed_times, timed_groups))
+    sorted_times = timed_times[order]
+    starts = np.concatenate(([0], np.cumsum(num_timed)[:-1]))
+    has_times = num_timed > 0
+    lo = starts + np.maximum(num_timed - 1, 0) // 2
+    hi = starts + num_timed // 2
+    median_times = np.full(num_groups, np.nan)
+    if sorted_times.size:
+        median_times[has_times] = (
+            sorted_times[lo[has_times]] + sorted_times[hi[has_times]]
+        ) / 2
+    mean_times = np.full(num_groups, np.nan)
+    mean_times[has_times] = sums[has_times] / num_timed[has_times]
+    return Breakdown(
+        group_keys, counts, num_seen, num_correct, mean_times, median_times
+    )
+
+
+def _format_time(seconds: float) -> str:
+    return "-" if np.isnan(seconds) else Time(seconds).to_hms_str(places=1)
+
+
+def format_report(data: SessionData, window: int = DEFAULT_WINDOW) -> str:
+    """Return a plain text report of the results.
+    """
+    times = data.times
+    num_timed = int(np.count_nonzero(~np.isnan(times)))
+    lines = [
+        f"Problems: {len(data)}",
+        f"Problems seen: {int(np.count_nonzero(data.statuses != NONE))}",
+        f"Problems correct: {int(np.count_nonzero(data.statuses == CORRECT))}",
+        f"Problems timed: {num_timed}",
+    ]
+    if num_timed:
+        lines.append(f"Total time: {_format_time(float(np.nansum(times)))}")
+        lines.append(f"Mean time: {_format_time(float(np.nanmean(times)))}")
+    percentiles = get_percentiles(times)
+    if percentiles:
+        lines.append("Percentiles: " + ", ".join(
+            f"p{pct}={_format_time(value)}"
+            for pct, value in percentiles.items()
+        ))
+    rolling = get_rolling_average(times, window)
+    if rolling.size:
+        lines.append(
+            f"Rolling average over {window}: best"
+            f" {_format_time(float(rolling.min()))}, worst"
+            f" {_format_time(float(rolling.max()))}, last"
+            f" {_format_time(float(rolling[-1]))}"
+        )
+    for title, keys, label in (
+            ("By folder", data.folders, lambda key: key or "."),
+            ("By mate length", data.mate_lengths,
+                lambda key: "?" if key == UNKNOWN_MATE_LENGTH else str(key)),
+        ):
+        breakdown = get_breakdown(data, keys)
+        if len(breakdown) < 2:
+            continue
+        lines.extend(["", f"{title}:"])
+        for key, count, seen, correct, mean, median in breakdown.rows():
+            lines.append(
+                f"  {label(key)}: {correct}/{seen} correct of {count},"
+                f" mean {_format_time(mean)}, median {_format_time(median)}"
+            )
+    outliers = find_outliers(times)
+    if outliers.size:
+        lines.extend(["", "Outliers:"])
+        for idx in outliers[np.argsort(-times[outliers])].tolist():
+            lines.append(f"  {data.names[idx]}: {_format_time(times[idx])}")
+    return "\n".join(lines)
+
+
+def render_report_image(
+        data: SessionData,
+        window: int = DEFAULT_WINDOW,
+        width: int = 800,
+        height: int = 600,
+        num_bins: int = 20,
+    ) -> Image.Image:
+    """Draw a histogram of the times above the times in solving order
+    with their rolling average.
+    """
+    img = Image.new("RGB", (width, height), "white")
+    draw = ImageDraw.Draw(img)
+    font = ImageFont.load_default()
+    times = data.times[~np.isnan(data.times)]
+    pad = 40
+    panel_h = (height - 3*pad) // 2
+    panels = (
+        (pad, pad, width - pad, pad + panel_h),
+        (pad, 2*pad + panel_h, width - pad, 2*pad + 2*panel_h),
+    )
+    for left, top, right, bottom in panels:
+        draw.line((left, top, left, bottom, right, bottom), fill="black")
+    draw.text((pad, pad // 2), "Time distribution (s)", font=font,
+        fill="black"
+    )
+    draw.text((pad, pad + panel_h + pad // 2),
+        f"Times in order (s), rolling average over {window}",
+        font=font, fill="black",
+    )
+    if times.size == 0:
+        return img
+    # Histogram
+    left, top, right, bottom = panels[0]
+    counts, edges = np.histogram(times, bins=num_bins)
+    bar_w = (right - left) / num_bins
+    scale = (bottom - top) / max(int(counts.max()), 1)
+    for idx, count in enumerate(counts.tolist()):
+        x0 = left + idx*bar_w
+        draw.rectangle(
+            (x0 + 1, bottom - count*scale, x0 + bar_w - 1, bottom),
+            fill="steelblue",
+        )
+    draw.text((left, bottom + 2), f"{edges[0]:.1f}", font=font, fill="black")
+    draw.text((right, bottom + 2), f"{edges[-1]:.1f}", font=font,
+        fill="black", anchor="ra",
+    )
+    # Times in order and rolling average
+    left, top, right, bottom = panels[1]
+    max_time = float(times.max()) or 1.0
+    xs = left + np.arange(times.size) * (right - left) / max(times.size-1, 1)
+    ys = bottom - times / max_time * (bottom - top)
+    for x, y in zip(xs.tolist(), ys.tolist()):
+        draw.ellipse((x - 1.5, y - 1.5, x + 1.5, y + 1.5), fill="grey")
+    rolling = get_rolling_average(times, window)
+    if rolling.size > 1:
+        rolling_ys = bottom - rolling / max_time * (bottom - top)
+        points = list(zip(xs[window-1:].tolist(), rolling_ys.tolist()))
+        draw.line(points, fill="firebrick", width=2)
+    draw.text((left - 2, top), f"{max_time:.0f}", font=font, fill="black",
+        anchor="ra",
+    )
+    return img
+
+
+def write_report(
+        data: SessionData, filepath: PathLike, window: int = DEFAULT_WINDOW
+    ) -> None:
+    """Write the report as a PNG image if the file name ends in .png,
+    and as plain text otherwise.
+    """
+    if os.fspath(filepath).lower().endswith(".png"):
+        render_report_image(data, window).save(filepath)
+        return
+    with open(filepath, "w", encoding="utf-8") as fout:
+        fout.write(format_report(data, window) + "\n")
+    return
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Analyse the results exported by tsumemi as CSV."
+    )
+    parser.add_argument("csv_file", help="results exported as CSV")
+    parser.add_argument("-o", "--output", default=None,
+        help="write the report to this file (PNG if it ends in .png, "
+        "text otherwise) instead of printing it"
+    )
+    parser.add_argument("-p", "--problems", default=None,
+        help="folder of the KIF problems, searched recursively, for "
+        "per-folder and per-mate-length breakdowns"
+    )
+    parser.add_argument("-w", "--window", type=int, default=DEFAULT_WINDOW,
+        help="number of problems in the rolling average"
+    )
+    args = parser.parse_args(argv)
+    try:
+        data = SessionData.from_csv(args.csv_file)
+    except (OSError, ValueError, KeyError) as exc:
+        print(f"{args.csv_file}: could not read results: {exc}",
+            file=sys.stderr
+        )
+        return 1
+    if args.problems is not None:
+        data.set_problem_info(
+            files.get_kif_files(args.problems, recursive=True), args.problems
+        )
+    if args.output is None:
+        print(format_report(data, args.window))
+    else:
+        write_report(data, args.output, args.window)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -6,6 +6,7 @@ from typing import TYPE_CHECKING
 from tsumemi.src.shogi.basetypes import KomaType
 from tsumemi.src.shogi.square import KanjiNumber
 from tsumemi.src.tsumemi.board_gui.board_meas import BoardMeasurements
+from tsumemi.src.tsumemi.board_gui.board_render import NUM_COLS, NUM_ROWS
 from tsumemi.src.tsumemi.board_gui.img_handlers import BoardImgManager
 
 if TYPE_CHECKING:
@@ -15,10 +16,6 @@ if TYPE_CHECKING:
     from tsumemi.src.tsumemi.skins import BoardSkin
 
 
-# Shogi board dimensions in squares
-NUM_COLS = 9
-NUM_ROWS = 9
-
 
 class BoardLayer(ABC):
     def __init__(self, is_centered: bool = False) -> None:
@@ -89,8 +86,7 @@ class BoardKomaTextLayer(BoardLayer):
 class BoardArtist:
     def __init__(self, measurements: BoardMeasurements, skin: BoardSkin
         ) -> None:
-        self.board_rect = -1
-        self.board_tile_layer = BoardImageLayer()
+        self.board_background = -1
         self.highlight_layer = BoardImageLayer()
         self.koma_image_layer = BoardImageLayer(is_centered=True)
         self.koma_text_layer = BoardKomaTextLayer(is_centered=True)
@@ -99,23 +95,16 @@ class BoardArtist:
         return
 
     def draw_board(self, canvas: BoardCanvas) -> None:
-        self._draw_board_base_layer(canvas)
-        self._draw_board_tile_layer(canvas)
+        self._draw_board_background(canvas)
         self._draw_board_focus_layer(canvas)
         self._draw_koma_text_layer(canvas)
         self._draw_koma_image_layer(canvas)
-        self._draw_board_grid_lines(canvas)
         self._draw_board_coordinates(canvas)
         self._draw_click_layer(canvas)
-        self._update_board_base_colour(canvas)
-        if not self.board_img_cache.has_images():
-            return
-        board_img = self.board_img_cache.get_dict()["board"]
-        self._update_board_tile_images(canvas, board_img)
         return
 
     def apply_skin(self, canvas: BoardCanvas, skin: BoardSkin) -> None:
-        canvas.itemconfig(self.board_rect, fill=skin.colour)
+        # The board background is rendered for the skin on next draw
         self.board_img_cache.load(skin)
         return
 
@@ -146,6 +135,13 @@ class BoardArtist:
         )
         return
 
+    def clear_koma(self,
+            canvas: BoardCanvas, row_idx: int, col_idx: int
+        ) -> None:
+        canvas.itemconfig(self.koma_text_layer.tiles[row_idx][col_idx], text="")
+        canvas.itemconfig(self.koma_image_layer.tiles[row_idx][col_idx], image="")
+        return
+
     def lift_click_layer(self, canvas: BoardCanvas) -> None:
         canvas.lift("click_tile")
         return
@@ -203,19 +199,17 @@ class BoardArtist:
         self.highlight_layer.update_tile(canvas, img, row_idx, col_idx)
         return
 
-    def _draw_board_base_layer(self, canvas: BoardCanvas) -> int:
-        id_: int = canvas.create_rectangle(
+    def _draw_board_background(self, canvas: BoardCanvas) -> int:
+        """Draw the board texture and grid lines as a single image.
+        """
+        id_: int = canvas.create_image(
             *canvas.idxs_to_xy(0, 0),
-            *canvas.idxs_to_xy(NUM_COLS, NUM_ROWS),
-            fill="#ffffff",
+            image=self.board_img_cache.get_background(),
+            anchor="nw",
         )
-        self.board_rect = id_
+        self.board_background = id_
         return id_
 
-    def _draw_board_tile_layer(self, canvas: BoardCanvas) -> None:
-        self.board_tile_layer.draw_layer(canvas, tag="board_tile")
-        return
-
     def _draw_board_focus_layer(self, canvas: BoardCanvas) -> None:
         self.highlight_layer.draw_layer(canvas, tag="highlight_tile")
         transparent_img = self.board_img_cache.get_dict()["transparent"]
@@ -230,21 +224,6 @@ class BoardArtist:
         self.koma_image_layer.draw_layer(canvas)
         return
 
-    def _draw_board_grid_lines(self, canvas: BoardCanvas) -> None:
-        for i in range(NUM_COLS+1):
-            canvas.create_line(
-                *canvas.idxs_to_xy(i, 0),
-                *canvas.idxs_to_xy(i, NUM_ROWS),
-                fill="black", width=1,
-            )
-        for j in range(NUM_ROWS+1):
-            canvas.create_line(
-                *canvas.idxs_to_xy(0, j),
-                *canvas.idxs_to_xy(NUM_COLS, j),
-                fill="black", width=1,
-            )
-        return
-
     def _draw_board_coordinates(self, canvas: BoardCanvas) -> None:
         coords_text_size = canvas.measurements.coords_text_size
         for row_idx in range(NUM_ROWS):
@@ -271,15 +250,3 @@ class BoardArtist:
         transparent_img = self.board_img_cache.get_dict()["transparent"]
         self.click_layer.update_all_tiles(canvas, transparent_img)
         return
-
-    def _update_board_base_colour(self, canvas: BoardCanvas) -> None:
-        canvas.itemconfig(
-            self.board_rect, fill=self.board_img_cache.skin.colour
-        )
-        return
-
-    def _update_board_tile_images(self,
-            canvas: BoardCanvas, img: ImageTk.PhotoImage
-        ) -> None:
-        self.board_tile_layer.update_all_tiles(canvas, img)
-        return
@@ -1,34 +1,52 @@
 from __future__ import annotations
 
 import functools
+import logging
 import tkinter as tk
 
+from concurrent.futures import ThreadPoolExecutor
 from typing import TYPE_CHECKING
 
 import tsumemi.src.tsumemi.event as evt
 
-from tsumemi.src.shogi.basetypes import HAND_TYPES, KANJI_FROM_KTYPE, KomaType, Side
+from tsumemi.src.shogi.basetypes import HAND_TYPES, KANJI_FROM_KTYPE, Koma, KomaType, Side
 from tsumemi.src.shogi.square import Square
 from tsumemi.src.tsumemi.skins import BoardSkin, PieceSkin, SkinSettings
 from tsumemi.src.tsumemi.board_gui.board_artist import BoardArtist, NUM_COLS, NUM_ROWS
 from tsumemi.src.tsumemi.board_gui.board_meas import BoardMeasurements
 from tsumemi.src.tsumemi.board_gui.img_handlers import KomaImgManager, KomadaiImgManager
 from tsumemi.src.tsumemi.board_gui.koma_artist import ImageKomaArtist, TextKomaArtist
-from tsumemi.src.tsumemi.board_gui.komadai_artist import KomadaiArtist
+from tsumemi.src.tsumemi.board_gui.komadai_artist import KomadaiArtist, get_komadai_tag
+from tsumemi.src.tsumemi.instrumentation import PROFILER
 
 if TYPE_CHECKING:
+    from concurrent.futures import Future
     from PIL import ImageTk
-    from typing import Any, Optional, Tuple, Union
+    from typing import Any, Dict, Iterable, List, Optional, Tuple, Union
     from tsumemi.src.shogi.position import Position
+    from tsumemi.src.shogi.position_diff import PositionDiff
     from tsumemi.src.shogi.position_internals import HandRepresentation
+    from tsumemi.src.tsumemi.board_gui.img_handlers import ImgManager, ResampledImages
     from tsumemi.src.tsumemi.board_gui.koma_artist import AbstractKomaArtist
     from tsumemi.src.tsumemi.game.game_model import GameStepEvent, GameUpdateEvent
     from tsumemi.src.tsumemi.move_input_handler import MoveInputHandler
 
 
+logger = logging.getLogger(__name__)
+
 # Default/current canvas size for board
 DEFAULT_CANVAS_WIDTH = 600
 DEFAULT_CANVAS_HEIGHT = 500
+# Quiet time after the last Configure event before images are rescaled,
+# and how often to check whether the rescaling has finished
+RESIZE_DELAY_MS = 100
+RESIZE_POLL_MS = 15
+
+# PIL resampling happens here, off the Tk thread; PhotoImages are only
+# ever created on the Tk thread.
+_RESAMPLE_EXECUTOR = ThreadPoolExecutor(
+    max_workers=1, thread_name_prefix="board-resample"
+)
 
 
 # IDX = zero-based, top left to bottom right, row-column (like FEN)
@@ -75,25 +93,78 @@ class BoardCanvas(tk.Canvas, evt.IObserver):
         # Last move highlighted tiles
         self.last_move_start_sq = Square.NONE
         self.last_move_end_sq = Square.NONE
+        # What is currently on the canvas, so that position changes
+        # only touch the items that differ. Empty until first drawn.
+        self.is_drawn: bool = False
+        self.drawn_koma: Dict[Square, Koma] = {}
+        self.drawn_hands: Dict[Side, Tuple[int, ...]] = {}
+        # Pending debounced resize, and a counter so that the results
+        # of a resize overtaken by a later one are thrown away
+        self._resize_after_id: Optional[str] = None
+        self._resize_generation: int = 0
         return
 
     def set_and_draw_callback(self,
             event: Union[GameStepEvent, GameUpdateEvent]
         ) -> None:
         last_move = event.game.get_last_move()
+        self._unhighlight_last_move()
         self.last_move_start_sq = last_move.start_sq
         self.last_move_end_sq = last_move.end_sq
-        self.set_position(event.game.get_position())
+        self.set_position(event.game.get_position(), event.diff)
         return
 
-    def set_position(self, pos: Position) -> None:
+    def set_position(self,
+            pos: Position, diff: Optional[PositionDiff] = None
+        ) -> None:
         """Set the internal position (and of any associated input
-        handler) to the given Position object.
+        handler) to the given Position object. If given, `diff` must
+        cover every change from the position last displayed.
         """
         self.position = pos
         if self.move_input_handler is not None:
             self.move_input_handler.position = pos
-        self.draw()
+        if self.is_drawn:
+            self.refresh_position(diff)
+        else:
+            self.draw()
+        return
+
+    @PROFILER.timed("board.refresh")
+    def refresh_position(self, diff: Optional[PositionDiff] = None) -> None:
+        """Bring the canvas up to date with the current position by
+        updating only the koma tiles and komadai that changed since
+        they were last drawn, and the last move highlights. The board
+        itself, the click tiles and their callbacks are left alone.
+        Only the squares and hands in `diff` are checked if given,
+        otherwise all of them are.
+        """
+        if not self.is_drawn:
+            self.draw()
+            return
+        self.clear_promotion_prompts()
+        if diff is None:
+            squares: Iterable[Square] = (
+                self.drawn_koma.keys() | self._get_board_koma().keys()
+            )
+            sides: Iterable[Side] = (Side.SENTE, Side.GOTE)
+        else:
+            squares = diff.squares
+            sides = diff.get_hand_sides()
+        for sq in squares:
+            koma = self.position.get_koma(sq)
+            if self.drawn_koma.get(sq, Koma.NONE) == koma:
+                continue
+            self._draw_board_koma(sq, koma)
+            if koma == Koma.NONE:
+                del self.drawn_koma[sq]
+            else:
+                self.drawn_koma[sq] = koma
+        for side in sides:
+            if self.drawn_hands.get(side) != self._get_hand_counts(side):
+                self.delete(get_komadai_tag(side.is_sente()))
+                self._draw_komadai_of_side(side)
+        self._highlight_last_move()
         return
 
     def apply_piece_skin(self, skin: PieceSkin) -> None:
@@ -110,18 +181,82 @@ class BoardCanvas(tk.Canvas, evt.IObserver):
         self.komadai_img_cache.load(skin)
         return
 
+    @PROFILER.timed("board.on_resize")
     def on_resize(self, event: tk.Event) -> None:
-        # Callback for when the canvas itself is resized
+        """Callback for when the canvas itself is resized. Bursts of
+        resize events are coalesced; until they stop, what is already
+        drawn is just stretched to fit.
+        """
+        if self.is_drawn and self.width > 0 and self.height > 0:
+            self.scale(
+                "all", 0, 0, event.width/self.width, event.height/self.height
+            )
         self.width = event.width
         self.height = event.height
-        self.measurements.recalculate_sizes(event.width, event.height)
-        self.koma_img_cache.resize_images()
-        self.board_artist.update_measurements()
-        self.komadai_img_cache.resize_images()
-        # Redraw board after setting new dimensions
+        if self._resize_after_id is not None:
+            self.after_cancel(self._resize_after_id)
+        self._resize_after_id = self.after(
+            RESIZE_DELAY_MS, self._start_resize
+        )
+        return
+
+    def _start_resize(self) -> None:
+        """Recalculate measurements for the current size and hand the
+        image resampling to the worker thread.
+        """
+        self._resize_after_id = None
+        self._resize_generation += 1
+        self.measurements.recalculate_sizes(self.width, self.height)
+        managers = self._get_img_managers()
+        skins = [manager.skin for manager in managers]
+        jobs = [manager.make_resample_job() for manager in managers]
+        future = _RESAMPLE_EXECUTOR.submit(
+            lambda: [job() for job in jobs]
+        )
+        self._finish_resize(
+            future, managers, skins, self._resize_generation
+        )
+        return
+
+    def _finish_resize(self,
+            future: Future[List[Dict[str, ResampledImages]]],
+            managers: List[ImgManager],
+            skins: List[Union[BoardSkin, PieceSkin]],
+            generation: int,
+        ) -> None:
+        """Once resampling is done, create the PhotoImages and redraw.
+        Reschedules itself until then.
+        """
+        if generation != self._resize_generation:
+            # A later resize has started; it will redraw
+            future.cancel()
+            return
+        if not future.done():
+            self.after(
+                RESIZE_POLL_MS, self._finish_resize,
+                future, managers, skins, generation
+            )
+            return
+        try:
+            results = future.result()
+        except Exception:
+            logger.exception("Resampling board images failed")
+            for manager in managers:
+                manager.resize_images()
+        else:
+            with PROFILER.measure("board.apply_resampled"):
+                for manager, skin, resampled in zip(managers, skins, results):
+                    manager.apply_resampled(skin, resampled)
         self.draw()
         return
 
+    def _get_img_managers(self) -> List[ImgManager]:
+        return [
+            self.koma_img_cache,
+            self.board_artist.board_img_cache,
+            self.komadai_img_cache,
+        ]
+
     def flip_board(self, want_upside_down: bool) -> None:
         # For upside-down mode
         if self.is_upside_down != want_upside_down:
@@ -139,65 +274,83 @@ class BoardCanvas(tk.Canvas, evt.IObserver):
         self._highlight_last_move() 
         return
 
+    @PROFILER.timed("board.draw")
     def draw(self) -> None:
         """Draw complete board with komadai and pieces.
         """
-        # Clear board display - could also keep board and just redraw pieces
         self.delete("all")
-        position = self.position
-        komadai_w = self.measurements.komadai_w
-        coords_text_size = self.measurements.coords_text_size
-        w_pad = self.measurements.w_pad
-        x_sq = self.measurements.x_sq
-        y_sq = self.measurements.y_sq
-
-        north_side = (
-            Side.SENTE if self._is_inverted(Side.SENTE) else Side.GOTE
-        )
-        south_side = north_side.switch()
-        north_hand = position.get_hand_of_side(north_side)
-        south_hand = position.get_hand_of_side(south_side)
-
         self._draw_canvas_base_layer()
         # Draw board
         self.board_artist.draw_board(self)
         self._add_board_onclick_callbacks()
         # Draw board pieces
-        for koma, sqset in position.get_koma_sets().items():
-            for sq in sqset:
-                col_idx, row_idx = self._sq_to_idxs(sq)
-                ktype = KomaType.get(koma)
-                invert=self._is_inverted(koma.side())
-                if self.is_text():
-                    text = str(KANJI_FROM_KTYPE[ktype])
-                    self.board_artist.draw_text_koma(
-                        self, text, invert, row_idx, col_idx
-                    )
-                else:
-                    img = self.get_koma_image(ktype, invert)
-                    self.board_artist.draw_koma(self, img, row_idx, col_idx)
-
+        self.drawn_koma = self._get_board_koma()
+        for sq, koma in self.drawn_koma.items():
+            self._draw_board_koma(sq, koma)
         # Draw komadai
-        self.draw_komadai(
-            w_pad + komadai_w/2,
-            y_sq(0),
-            north_hand,
-            sente=north_side.is_sente(),
-            align="top"
-        )
-        self.draw_komadai(
-            x_sq(9) + 2*coords_text_size + komadai_w/2,
-            y_sq(9),
-            south_hand,
-            sente=south_side.is_sente(),
-            align="bottom"
-        )
+        self._draw_komadai_of_side(Side.SENTE)
+        self._draw_komadai_of_side(Side.GOTE)
+        self.is_drawn = True
         # set focus and highlights
         self.set_focus(self.highlighted_sq)
         self.board_artist.lift_click_layer(self)
         self._highlight_last_move()
         return
 
+    def _draw_board_koma(self, sq: Square, koma: Koma) -> None:
+        col_idx, row_idx = self._sq_to_idxs(sq)
+        if koma == Koma.NONE:
+            self.board_artist.clear_koma(self, row_idx, col_idx)
+            return
+        ktype = KomaType.get(koma)
+        invert = self._is_inverted(koma.side())
+        if self.is_text():
+            text = str(KANJI_FROM_KTYPE[ktype])
+            self.board_artist.draw_text_koma(
+                self, text, invert, row_idx, col_idx
+            )
+        else:
+            img = self.get_koma_image(ktype, invert)
+            self.board_artist.draw_koma(self, img, row_idx, col_idx)
+        return
+
+    def _draw_komadai_of_side(self, side: Side) -> None:
+        """Draw the komadai of the given side, north or south
+        depending on board orientation.
+        """
+        hand = self.position.get_hand_of_side(side)
+        self.drawn_hands[side] = self._get_hand_counts(side)
+        if self._is_inverted(side):
+            self.draw_komadai(
+                self.measurements.w_pad + self.measurements.komadai_w/2,
+                self.measurements.y_sq(0),
+                hand,
+                sente=side.is_sente(),
+                align="top",
+            )
+        else:
+            self.draw_komadai(
+                self.measurements.x_sq(9)
+                + 2*self.measurements.coords_text_size
+                + self.measurements.komadai_w/2,
+                self.measurements.y_sq(9),
+                hand,
+                sente=side.is_sente(),
+                align="bottom",
+            )
+        return
+
+    def _get_board_koma(self) -> Dict[Square, Koma]:
+        return {
+            sq: koma
+            for koma, sqset in self.position.get_koma_sets().items()
+            for sq in sqset
+        }
+
+    def _get_hand_counts(self, side: Side) -> Tuple[int, ...]:
+        hand = self.position.get_hand_of_side(side)
+        return tuple(hand.get_komatype_count(ktype) for ktype in HAND_TYPES)
+
     def _draw_canvas_base_layer(self) -> int:
         id_: int = self.create_rectangle(
             0, 0, self.width, self.height, fill="#ffffff"
@@ -408,3 +561,19 @@ class BoardCanvas(tk.Canvas, evt.IObserver):
         self._highlight_last_move_square(self.last_move_start_sq)
         self._highlight_last_move_square(self.last_move_end_sq)
         return
+
+    def _unhighlight_last_move(self) -> None:
+        """Clear the last move highlights, restoring the focus
+        highlight if it was underneath one of them.
+        """
+        if not self.is_drawn:
+            return
+        for sq in (self.last_move_start_sq, self.last_move_end_sq):
+            if sq in (Square.NONE, Square.HAND):
+                continue
+            col_idx, row_idx = self._sq_to_idxs(sq)
+            if sq == self.highlighted_sq:
+                self.board_artist.highlight_square(self, row_idx, col_idx)
+            else:
+                self.board_artist.unhighlight_square(self, row_idx, col_idx)
+        return
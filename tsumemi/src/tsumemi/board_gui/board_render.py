@@ -0,0 +1,310 @@
+from __future__ import annotations
+
+import functools
+import math
+import os
+
+from typing import TYPE_CHECKING
+
+from PIL import Image, ImageDraw, ImageFont
+
+from tsumemi.src.shogi.basetypes import HAND_TYPES, KANJI_FROM_KTYPE, KomaType, Side
+from tsumemi.src.shogi.square import KanjiNumber
+from tsumemi.src.tsumemi.board_gui.board_meas import BoardMeasurements
+from tsumemi.src.tsumemi.board_gui.sprite_sheet import SpriteSheet, get_koma_image_filename
+
+if TYPE_CHECKING:
+    from typing import Optional, Tuple, Union
+    from tsumemi.src.shogi.position import Position
+    from tsumemi.src.shogi.position_internals import HandRepresentation
+    from tsumemi.src.tsumemi.skins import SkinSettings
+
+
+# Shogi board dimensions in squares
+NUM_COLS = 9
+NUM_ROWS = 9
+GRID_LINE_COLOUR = "black"
+
+
+def get_board_background_size(sq_w: float, sq_h: float) -> Tuple[int, int]:
+    # +1 pixel so that the last grid line fits
+    return int(NUM_COLS*sq_w) + 1, int(NUM_ROWS*sq_h) + 1
+
+
+def render_board_background(
+        tile: Optional[Image.Image], colour: str, sq_w: float, sq_h: float
+    ) -> Image.Image:
+    """Return the 9x9 board with its grid lines as one image. Each
+    square shows `tile` scaled to the square if given, otherwise the
+    board is filled with `colour`. Square edges are at multiples of
+    the (possibly fractional) square size, rounded down.
+    """
+    img = Image.new("RGBA", get_board_background_size(sq_w, sq_h), colour)
+    if tile is not None:
+        # One pixel bigger than the square, to avoid gaps when tiling
+        tile_img = tile.convert("RGBA").resize(
+            (math.ceil(sq_w)+1, math.ceil(sq_h)+1)
+        )
+        for row_idx in range(NUM_ROWS):
+            for col_idx in range(NUM_COLS):
+                img.paste(
+                    tile_img, (int(col_idx*sq_w), int(row_idx*sq_h)), tile_img
+                )
+    draw = ImageDraw.Draw(img)
+    for col_idx in range(NUM_COLS+1):
+        x = int(col_idx*sq_w)
+        draw.line((x, 0, x, int(NUM_ROWS*sq_h)), fill=GRID_LINE_COLOUR)
+    for row_idx in range(NUM_ROWS+1):
+        y = int(row_idx*sq_h)
+        draw.line((0, y, int(NUM_COLS*sq_w), y), fill=GRID_LINE_COLOUR)
+    return img
+
+
+# Fonts with Japanese glyphs, tried in order when no font is given
+CJK_FONT_CANDIDATES = (
+    r"C:\Windows\Fonts\msgothic.ttc",
+    r"C:\Windows\Fonts\YuGothM.ttc",
+    "/System/Library/Fonts/ヒラギノ角ゴシック W3.ttc",
+    "/usr/share/fonts/opentype/noto/NotoSansCJK-Regular.ttc",
+    "/usr/share/fonts/noto-cjk/NotoSansCJK-Regular.ttc",
+    "/usr/share/fonts/truetype/fonts-japanese-gothic.ttf",
+)
+
+
+def find_cjk_font() -> Optional[str]:
+    """Return the path of an installed font able to draw kanji, or
+    None if none of the usual ones is installed.
+    """
+    for font_path in CJK_FONT_CANDIDATES:
+        if os.path.isfile(font_path):
+            return font_path
+    return None
+
+
+@functools.lru_cache(maxsize=None)
+def _get_koma_source(skin_dir: str) -> Union[SpriteSheet, str]:
+    sprite_sheet = SpriteSheet.find(skin_dir)
+    return skin_dir if sprite_sheet is None else sprite_sheet
+
+
+@functools.lru_cache(maxsize=512)
+def _get_koma_image(
+        skin_dir: str, ktype: KomaType, invert: bool, size: int
+    ) -> Image.Image:
+    source = _get_koma_source(skin_dir)
+    if isinstance(source, SpriteSheet):
+        img = source.get_image(ktype, invert)
+    else:
+        img = Image.open(os.path.join(
+            skin_dir, get_koma_image_filename(ktype, invert)
+        ))
+    return img.convert("RGBA").resize((size, size))
+
+
+class PositionRenderer:
+    """Draws a position with PIL alone, in the same layout as the
+    BoardCanvas: the board between the two komadai, sized by
+    BoardMeasurements. Kanji (text pieces, row coordinates, komadai
+    headings) need a CJK font; without one, rows are numbered in
+    digits, headings are reduced to the ▲/△ marks and text pieces
+    cannot be drawn.
+    """
+    def __init__(self,
+            skin_settings: SkinSettings,
+            width: int = 600,
+            height: int = 500,
+            font_path: Optional[str] = None,
+        ) -> None:
+        self.piece_skin, self.board_skin, self.komadai_skin = (
+            skin_settings.get()
+        )
+        self.width: int = width
+        self.height: int = height
+        self.measurements = BoardMeasurements(width, height)
+        self.font_path: Optional[str] = (
+            find_cjk_font() if font_path is None else font_path
+        )
+        if not self.piece_skin.path and self.font_path is None:
+            raise ValueError("Text piece skins need a CJK font to be drawn")
+        tile = (Image.open(self.board_skin.path) if self.board_skin.path
+            else None
+        )
+        self.background = render_board_background(
+            tile, self.board_skin.colour,
+            self.measurements.sq_w, self.measurements.sq_h,
+        )
+        return
+
+    def render(self, position: Position, upside_down: bool = False
+        ) -> Image.Image:
+        img = Image.new("RGB", (self.width, self.height), "white")
+        draw = ImageDraw.Draw(img)
+        meas = self.measurements
+        img.paste(
+            self.background, (int(meas.x_sq(0)), int(meas.y_sq(0))),
+            self.background,
+        )
+        for koma, sqset in position.get_koma_sets().items():
+            invert = not (koma.side().is_sente() ^ upside_down)
+            for sq in sqset:
+                col_num, row_num = sq.get_cr()
+                col_idx = col_num-1 if upside_down else NUM_COLS-col_num
+                row_idx = NUM_ROWS-row_num if upside_down else row_num-1
+                self._draw_koma(
+                    img, KomaType.get(koma), invert, int(meas.sq_w),
+                    meas.x_sq(col_idx+0.5), meas.y_sq(row_idx+0.5),
+                    meas.sq_text_size,
+                )
+        self._draw_coordinates(draw, upside_down)
+        for side in (Side.SENTE, Side.GOTE):
+            is_north = not (side.is_sente() ^ upside_down)
+            if is_north:
+                x = meas.w_pad + meas.komadai_w/2
+                y = meas.y_sq(0)
+            else:
+                x = meas.x_sq(9) + 2*meas.coords_text_size + meas.komadai_w/2
+                y = meas.y_sq(9)
+            self._draw_komadai(
+                img, draw, x, y, position.get_hand_of_side(side),
+                side.is_sente(), align="top" if is_north else "bottom",
+            )
+        return img
+
+    def _get_font(self, size: int, cjk: bool
+        ) -> Union[ImageFont.FreeTypeFont, ImageFont.ImageFont]:
+        if self.font_path is not None:
+            return ImageFont.truetype(self.font_path, max(size, 1))
+        if cjk:
+            raise ValueError("A CJK font is needed to draw kanji")
+        try:
+            return ImageFont.load_default(size=max(size, 1))
+        except TypeError:
+            # Pillow before 10.1 only has a fixed size bitmap font
+            return ImageFont.load_default()
+
+    def _draw_koma(self,
+            img: Image.Image,
+            ktype: KomaType,
+            invert: bool,
+            size: int,
+            x: float,
+            y: float,
+            text_size: int,
+        ) -> None:
+        if self.piece_skin.path:
+            koma_img = _get_koma_image(
+                str(self.piece_skin.path), ktype, invert, size
+            )
+        else:
+            koma_img = Image.new("RGBA", (size, size), "#00000000")
+            ImageDraw.Draw(koma_img).text(
+                (size/2, size/2), KANJI_FROM_KTYPE[ktype],
+                font=self._get_font(text_size, cjk=True),
+                fill="black", anchor="mm",
+            )
+            if invert:
+                koma_img = koma_img.rotate(180)
+        img.paste(
+            koma_img, (int(x - size/2), int(y - size/2)), koma_img
+        )
+        return
+
+    def _draw_coordinates(self,
+            draw: ImageDraw.ImageDraw, upside_down: bool
+        ) -> None:
+        meas = self.measurements
+        font = self._get_font(meas.coords_text_size, cjk=False)
+        for row_idx in range(NUM_ROWS):
+            row_num = NUM_ROWS-row_idx if upside_down else row_idx+1
+            label = (KanjiNumber(row_num).name if self.font_path is not None
+                else str(row_num)
+            )
+            draw.text(
+                (meas.x_sq(NUM_COLS) + meas.coords_text_size,
+                    meas.y_sq(row_idx+0.5)),
+                label, font=font, fill="black", anchor="lm",
+            )
+        for col_idx in range(NUM_COLS):
+            col_num = col_idx+1 if upside_down else NUM_COLS-col_idx
+            draw.text(
+                (meas.x_sq(col_idx+0.5), meas.y_sq(0)),
+                str(col_num), font=font, fill="black", anchor="ms",
+            )
+        return
+
+    def _draw_komadai(self,
+            img: Image.Image,
+            draw: ImageDraw.ImageDraw,
+            x: float,
+            y: float,
+            hand: HandRepresentation,
+            is_sente: bool,
+            align: str,
+        ) -> None:
+        # Same geometry as KomadaiArtist
+        meas = self.measurements
+        is_text = not self.piece_skin.path
+        text_size = meas.komadai_text_size
+        char_height = 1.5 * text_size
+        piece_size = meas.komadai_piece_size
+        symbol_size = text_size * 3/2 if is_text else piece_size
+        pad = text_size / 8 if is_text else piece_size / 8
+        heading_size = 4 * char_height
+        hand_counts = [
+            (ktype, hand.get_komatype_count(ktype)) for ktype in HAND_TYPES
+            if hand.get_komatype_count(ktype) > 0
+        ]
+        width = 2 * piece_size
+        height = heading_size + (
+            2 * char_height if not hand_counts
+            else len(hand_counts)*(symbol_size + pad) - pad
+        )
+        top = y - height if align == "bottom" else y
+        draw.rectangle(
+            (x - width/2, top, x + width/2, top + height),
+            fill=self.komadai_skin.colour,
+        )
+        font = self._get_font(text_size, cjk=False)
+        if self.font_path is not None:
+            draw.multiline_text(
+                (x, top), "▲\n持\n駒" if is_sente else "△\n持\n駒",
+                font=font, fill="black", anchor="ma", align="center",
+            )
+            if not hand_counts:
+                draw.multiline_text(
+                    (x, top + heading_size), "な\nし",
+                    font=font, fill="black", anchor="ma", align="center",
+                )
+        else:
+            half = text_size / 2
+            draw.polygon(
+                ((x, top + 2), (x - half, top + 2 + 2*half),
+                    (x + half, top + 2 + 2*half)),
+                fill="black" if is_sente else None, outline="black",
+            )
+        for n, (ktype, count) in enumerate(hand_counts):
+            y_offset = top + heading_size + n*(symbol_size+pad) + symbol_size/2
+            self._draw_koma(
+                img, ktype, False, piece_size,
+                x - width/5, y_offset, text_size,
+            )
+            draw.text(
+                (x + 0.5*piece_size, y_offset), str(count),
+                font=font, fill="black", anchor="mm",
+            )
+        return
+
+
+def render_position(
+        position: Position,
+        skin_settings: SkinSettings,
+        width: int = 600,
+        height: int = 500,
+        upside_down: bool = False,
+    ) -> Image.Image:
+    """Return an image of the position drawn with the given skins,
+    without needing Tk. Use a PositionRenderer directly to draw many
+    positions with the same settings.
+    """
+    renderer = PositionRenderer(skin_settings, width, height)
+    return renderer.render(position, upside_down)
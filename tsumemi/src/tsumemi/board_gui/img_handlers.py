@@ -1,19 +1,26 @@
 from __future__ import annotations
 
 import logging
+import math
 import os
 
 from abc import ABC
+from collections import OrderedDict
 from typing import TYPE_CHECKING
 from PIL import Image, ImageTk
 
 from tsumemi.src.shogi.basetypes import KomaType
+from tsumemi.src.tsumemi.board_gui.board_render import render_board_background
+from tsumemi.src.tsumemi.board_gui.sprite_sheet import LazyImage, SpriteSheet
+from tsumemi.src.tsumemi.board_gui.sprite_sheet import SPRITE_KTYPES, get_koma_image_filename
 
 if TYPE_CHECKING:
-    from typing import Any, Callable, Dict, Tuple, Union
+    from typing import Any, Callable, Dict, Hashable, Optional, Tuple, Union
     from tsumemi.src.tsumemi.skins import BoardSkin, PieceSkin
     from tsumemi.src.tsumemi.board_gui.board_meas import BoardMeasurements
     PathLike = Union[str, os.PathLike]
+    # Resampled PIL images of one ImgSizingDict, None where it failed
+    ResampledImages = Dict[Any, Optional[Image.Image]]
 
 logger = logging.getLogger(__name__)
 
@@ -23,65 +30,211 @@ IMG_HIGHLIGHT = Image.new("RGBA", (1, 1), "#99ff0044")
 IMG_HIGHLIGHT_2 = Image.new("RGBA", (1, 1), "#3399ff66")
 IMG_SEMI_TRANSPARENT = Image.new("RGBA", (1, 1), "#FFFFFF99")
 
+# Image sizes are rounded up to a multiple of this many pixels, so that
+# nearby window sizes share scaled images
+SIZE_QUANTUM = 2
+# Memory budget of the scaled image cache, counting 4 bytes per pixel
+SCALED_IMAGE_CACHE_BYTES = 64 * 1024 * 1024
+
+
+def quantise_size(size: float) -> int:
+    return max(SIZE_QUANTUM, SIZE_QUANTUM * math.ceil(size / SIZE_QUANTUM))
+
+
+class ScaledImageCache:
+    """Least recently used cache of scaled images, evicting the oldest
+    entries once their total size exceeds `max_bytes`.
+    """
+    def __init__(self, max_bytes: int) -> None:
+        self.max_bytes: int = max_bytes
+        self.nbytes: int = 0
+        self._entries: OrderedDict[Hashable, Tuple[Any, int]] = OrderedDict()
+        return
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._entries
+
+    def get(self, key: Hashable) -> Any:
+        """Return the cached image, or None if there is none.
+        """
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        self._entries.move_to_end(key)
+        return entry[0]
+
+    def put(self, key: Hashable, img: Any, nbytes: int) -> None:
+        old_entry = self._entries.pop(key, None)
+        if old_entry is not None:
+            self.nbytes -= old_entry[1]
+        self._entries[key] = (img, nbytes)
+        self.nbytes += nbytes
+        # Never evict the entry just added, even if it alone is too big
+        while self.nbytes > self.max_bytes and len(self._entries) > 1:
+            _, (_, evicted_nbytes) = self._entries.popitem(last=False)
+            self.nbytes -= evicted_nbytes
+        return
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self.nbytes = 0
+        return
+
+
+SCALED_IMAGE_CACHE = ScaledImageCache(SCALED_IMAGE_CACHE_BYTES)
+
 
 class ImgSizingDict:
     """Stores PIL images and their resized versions. This keeps
     references to the images so they will not be garbage-collected,
-    and also allows resizing on the fly.
+    and also allows resizing on the fly. Resized versions are shared
+    through SCALED_IMAGE_CACHE, under the `source` of the images (e.g.
+    the skin path), the `name` of the dict, the key and the size.
+
+    Nothing is decoded or resized up front: originals added with
+    add_lazy_image() are decoded when first needed, and a resized
+    version is only made when the key is first looked up.
     """
-    def __init__(self, update_func: Callable[[], Tuple[float, float]]) -> None:
+    def __init__(self,
+            update_func: Callable[[], Tuple[float, float]],
+            name: str = "",
+        ) -> None:
         """Create ImgSizingDict. `update_func` is a Callable
         returning a tuple of the `(width, height)` that the resized
         images should be.
         """
         self.update_func = update_func
-        self.width, self.height = map(int, update_func())
-        self.raws: Dict[Union[str, KomaType], Image.Image] = {}
+        self.name: str = name
+        self.source: str = ""
+        self.width, self.height = map(quantise_size, update_func())
+        self.raws: Dict[Any, Image.Image] = {}
+        self.loaders: Dict[Any, Callable[[], Image.Image]] = {}
         self.images: Dict[Any, ImageTk.PhotoImage] = {}
         return
 
     def __getitem__(self, key: Any) -> ImageTk.PhotoImage:
-        return self.images[key]
+        if key in self.images:
+            return self.images[key]
+        cached = SCALED_IMAGE_CACHE.get(self.get_cache_key(key))
+        if cached is not None:
+            self.images[key] = cached
+            return cached
+        return self._install_image(key, _resample_image(
+            self.get_raw(key), self.width, self.height
+        ))
 
-    @staticmethod
-    def _resize_image(img: Image.Image, width: int, height: int
-        ) -> ImageTk.PhotoImage:
-        """Takes a PIL Image `img` and returns a resized
-        ImageTk.PhotoImage.
-        """
-        try:
-            resized_img = img.resize((int(width), int(height)))
-        except ValueError:
-            logger.info(
-                "Image resizing in ImgDict failed, passed parameters width %i, height %i",
-                int(width),
-                int(height)
-            )
-            return ImageTk.PhotoImage(Image.new("RGB", (1, 1), "#000000"))
-        return ImageTk.PhotoImage(resized_img)
+    def get_cache_key(self, key: Any) -> Hashable:
+        return (self.source, self.name, key, self.width, self.height)
 
     def add_image(self, key: Union[str, KomaType], image: Image.Image) -> None:
-        """Stores the PIL Image as well as a resized copy.
+        """Stores the PIL Image; the resized copy is made on first use.
         """
         self.raws[key] = image
-        self.images[key] = self._resize_image(image, self.width, self.height)
+        self.loaders.pop(key, None)
+        self.images.pop(key, None)
         return
 
+    def add_lazy_image(self,
+            key: Union[str, KomaType], loader: Callable[[], Image.Image]
+        ) -> None:
+        """Stores a function returning the PIL Image, to be called the
+        first time the image is needed.
+        """
+        self.loaders[key] = loader
+        self.raws.pop(key, None)
+        self.images.pop(key, None)
+        return
+
+    def get_raw(self, key: Any) -> Image.Image:
+        """Return the original image, decoding it if necessary.
+        """
+        if key not in self.raws:
+            self.raws[key] = self.loaders.pop(key)()
+        return self.raws[key]
+
     def resize_images(self) -> None:
         """Updates all the resized images by resizing from the stored
         originals.
         """
-        for key, raw_img in self.raws.items():
-            self.images[key] = self._resize_image(
-                raw_img, self.width, self.height
-            )
+        self.apply_resampled(self.make_resample_job()())
         return
 
+    def make_resample_job(self) -> Callable[[], ResampledImages]:
+        """Return a function resampling the originals in use to the
+        current size, skipping those already in the cache. It only uses
+        PIL, so it may run off the Tk thread; originals not decoded yet
+        are decoded there too.
+        """
+        width, height = self.width, self.height
+        sources: Dict[Any, Union[Image.Image, Callable[[], Image.Image]]] = {
+            key: self.raws[key] if key in self.raws else self.loaders[key]
+            for key in self.images
+            if self.get_cache_key(key) not in SCALED_IMAGE_CACHE
+        }
+        def _resample() -> ResampledImages:
+            return {
+                key: _resample_image(
+                    src if isinstance(src, Image.Image) else src(),
+                    width, height
+                )
+                for key, src in sources.items()
+            }
+        return _resample
+
+    def apply_resampled(self, resampled: ResampledImages) -> None:
+        """Replace the images in use with resampled ones, or cached
+        ones where nothing needed resampling. Anything else is dropped
+        and resized again when next looked up. Must run on the Tk
+        thread.
+        """
+        for key in list(self.images):
+            if key in resampled:
+                self._install_image(key, resampled[key])
+                continue
+            cached = SCALED_IMAGE_CACHE.get(self.get_cache_key(key))
+            if cached is None:
+                del self.images[key]
+            else:
+                self.images[key] = cached
+        return
+
+    def _install_image(self, key: Any, img: Optional[Image.Image]
+        ) -> ImageTk.PhotoImage:
+        photo_img = _make_photo_image(img)
+        self.images[key] = photo_img
+        if img is not None:
+            SCALED_IMAGE_CACHE.put(
+                self.get_cache_key(key), photo_img, 4 * img.width * img.height
+            )
+        return photo_img
+
     def update_sizes(self) -> None:
-        self.width, self.height = map(int, self.update_func())
+        self.width, self.height = map(quantise_size, self.update_func())
         return
 
 
+def _resample_image(img: Image.Image, width: int, height: int
+    ) -> Optional[Image.Image]:
+    try:
+        return img.resize((int(width), int(height)))
+    except ValueError:
+        logger.info(
+            "Image resizing in ImgDict failed, passed parameters width %i, height %i",
+            int(width),
+            int(height)
+        )
+        return None
+
+
+def _make_photo_image(img: Optional[Image.Image]) -> ImageTk.PhotoImage:
+    if img is None:
+        return ImageTk.PhotoImage(Image.new("RGB", (1, 1), "#000000"))
+    return ImageTk.PhotoImage(img)
+
+
 class ImgManager(ABC):
     def __init__(self,
             measurements: BoardMeasurements,
@@ -95,12 +248,44 @@ class ImgManager(ABC):
     def has_images(self) -> bool:
         return bool(self.skin.path)
 
+    def set_source(self, source: PathLike) -> None:
+        """Set where the images come from, for the scaled image cache.
+        """
+        for imgdict in self.imgdicts.values():
+            imgdict.source = str(source)
+        return
+
     def resize_images(self) -> None:
-        if not self.skin.path:
+        self.apply_resampled(self.skin, self.make_resample_job()())
+        return
+
+    def make_resample_job(self
+        ) -> Callable[[], Dict[str, ResampledImages]]:
+        """Update the target sizes from the measurements and return a
+        function doing the resampling, which may run off the Tk thread.
+        Pass its result to apply_resampled() on the Tk thread.
+        """
+        jobs: Dict[str, Callable[[], ResampledImages]] = {}
+        if self.skin.path:
+            for name, imgdict in self.imgdicts.items():
+                imgdict.update_sizes()
+                jobs[name] = imgdict.make_resample_job()
+        def _resample() -> Dict[str, ResampledImages]:
+            return {name: job() for name, job in jobs.items()}
+        return _resample
+
+    def apply_resampled(self,
+            skin: Union[BoardSkin, PieceSkin],
+            resampled: Dict[str, ResampledImages],
+        ) -> None:
+        """Install images resampled for the given skin. If another skin
+        has been loaded since, they are stale; the new skin was loaded
+        at the updated sizes already, so they are dropped.
+        """
+        if skin is not self.skin:
             return
-        for imgdict in self.imgdicts.values():
-            imgdict.update_sizes()
-            imgdict.resize_images()
+        for name, images in resampled.items():
+            self.imgdicts[name].apply_resampled(images)
         return
 
 
@@ -118,41 +303,54 @@ class KomaImgManager(ImgManager):
             sq_w = measurements.sq_w
             return sq_w, sq_w
         self.imgdicts = {
-            "upright": ImgSizingDict(_board_piece_size),
-            "inverted": ImgSizingDict(_board_piece_size),
-            "komadai_upright": ImgSizingDict(_komadai_piece_size),
-            "komadai_inverted": ImgSizingDict(_komadai_piece_size),
+            "upright": ImgSizingDict(_board_piece_size, "upright"),
+            "inverted": ImgSizingDict(_board_piece_size, "inverted"),
+            "komadai_upright": ImgSizingDict(
+                _komadai_piece_size, "komadai_upright"
+            ),
+            "komadai_inverted": ImgSizingDict(
+                _komadai_piece_size, "komadai_inverted"
+            ),
         }
         self.skin: PieceSkin
         self.load(skin)
         return
 
     @staticmethod
-    def _open_ktype_images(ktype: KomaType, filepath: PathLike
-        ) -> Tuple[Image.Image, Image.Image]:
-        """Opens koma image files following the naming convention in
-        the code. Returns the PIL images of the koma right-side-up
-        and upside-down.
+    def _get_ktype_loader(ktype: KomaType, invert: bool,
+            filepath: PathLike, sprite_sheet: Optional[SpriteSheet]
+        ) -> Callable[[], Image.Image]:
+        """Return a function decoding the koma image, from the skin's
+        sprite sheet if it has one, else from the single image file
+        following the naming convention in the code.
         """
-        filename_upright = f"0{ktype.to_csa()}.png"
-        filename_inverted = f"1{ktype.to_csa()}.png"
-        img_upright = Image.open(os.path.join(filepath, filename_upright))
-        img_inverted = Image.open(os.path.join(filepath, filename_inverted))
-        return img_upright, img_inverted
+        if sprite_sheet is not None:
+            return sprite_sheet.get_loader(ktype, invert)
+        return LazyImage(
+            os.path.join(filepath, get_koma_image_filename(ktype, invert))
+        )
 
     def load(self, skin: PieceSkin) -> None:
+        """Register the skin's koma images. They are decoded and resized
+        only when first drawn.
+        """
         filepath = skin.path
         if not filepath:
             self.skin = skin
             return
-        for ktype in KomaType:
-            if ktype == KomaType.NONE:
-                continue
-            img_upright, img_inverted = self._open_ktype_images(ktype, filepath)
-            self.imgdicts["upright"].add_image(ktype, img_upright)
-            self.imgdicts["komadai_upright"].add_image(ktype, img_upright)
-            self.imgdicts["inverted"].add_image(ktype, img_inverted)
-            self.imgdicts["komadai_inverted"].add_image(ktype, img_inverted)
+        self.set_source(filepath)
+        sprite_sheet = SpriteSheet.find(filepath)
+        for ktype in SPRITE_KTYPES:
+            loader_upright = self._get_ktype_loader(
+                ktype, False, filepath, sprite_sheet
+            )
+            loader_inverted = self._get_ktype_loader(
+                ktype, True, filepath, sprite_sheet
+            )
+            self.imgdicts["upright"].add_lazy_image(ktype, loader_upright)
+            self.imgdicts["komadai_upright"].add_lazy_image(ktype, loader_upright)
+            self.imgdicts["inverted"].add_lazy_image(ktype, loader_inverted)
+            self.imgdicts["komadai_inverted"].add_lazy_image(ktype, loader_inverted)
         self.skin = skin
         return
 
@@ -187,8 +385,8 @@ class BoardImgManager(ImgManager):
             # +1 pixel to avoid gaps
             return 9*sq_w+1, 9*sq_h+1
         self.imgdicts = {
-            "tile_sized": ImgSizingDict(_board_sq_size),
-            "board_sized": ImgSizingDict(_board_size),
+            "tile_sized": ImgSizingDict(_board_sq_size, "tile_sized"),
+            "board_sized": ImgSizingDict(_board_size, "board_sized"),
         }
         self.imgdicts["tile_sized"].add_image("transparent", IMG_TRANSPARENT)
         self.imgdicts["tile_sized"].add_image("highlight", IMG_HIGHLIGHT)
@@ -196,6 +394,7 @@ class BoardImgManager(ImgManager):
         self.imgdicts["board_sized"].add_image(
             "semi-transparent", IMG_SEMI_TRANSPARENT
         )
+        self.board_tile: Optional[LazyImage] = None
         self.skin: BoardSkin
         self.load(skin)
         return
@@ -206,11 +405,32 @@ class BoardImgManager(ImgManager):
             # Skin without images
             self.skin = skin
             return
-        img = Image.open(filepath)
-        self.imgdicts["tile_sized"].add_image("board", img)
+        self.set_source(filepath)
+        self.board_tile = LazyImage(filepath)
         self.skin = skin # after loading, in case anything goes wrong
         return
 
+    def get_background(self) -> ImageTk.PhotoImage:
+        """Return the whole board, skin texture and grid lines, as one
+        image at the current square size.
+        """
+        sq_w = self.measurements.sq_w
+        sq_h = self.measurements.sq_h
+        key = (
+            str(self.skin.path), "background", self.skin.colour,
+            round(sq_w, 2), round(sq_h, 2),
+        )
+        cached = SCALED_IMAGE_CACHE.get(key)
+        if cached is not None:
+            return cached
+        tile = (self.board_tile()
+            if self.skin.path and self.board_tile is not None else None
+        )
+        img = render_board_background(tile, self.skin.colour, sq_w, sq_h)
+        photo_img = ImageTk.PhotoImage(img)
+        SCALED_IMAGE_CACHE.put(key, photo_img, 4 * img.width * img.height)
+        return photo_img
+
     def get_dict(self, board_sized: bool = False) -> ImgSizingDict:
         if board_sized:
             return self.imgdicts["board_sized"]
@@ -228,7 +448,9 @@ class KomadaiImgManager(ImgManager):
             kpc_w = measurements.komadai_piece_size
             return kpc_w, kpc_w
         self.imgdicts = {
-            "komadai_piece_sized": ImgSizingDict(_komadai_piece_size),
+            "komadai_piece_sized": ImgSizingDict(
+                _komadai_piece_size, "komadai_piece_sized"
+            ),
         }
         self.imgdicts["komadai_piece_sized"].add_image(
             "highlight", IMG_HIGHLIGHT
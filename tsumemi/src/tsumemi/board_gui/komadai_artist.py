@@ -11,6 +11,12 @@ if TYPE_CHECKING:
     from tsumemi.src.tsumemi.board_gui.board_canvas import BoardCanvas
 
 
+def get_komadai_tag(is_sente: bool) -> str:
+    """Return the canvas tag shared by all items of one komadai.
+    """
+    return "komadai-sente" if is_sente else "komadai-gote"
+
+
 class KomadaiArtist:
     def __init__(self,
             x_anchor: float,
@@ -21,6 +27,7 @@ class KomadaiArtist:
             align: str = "top",
         ) -> None:
         self.is_sente = is_sente
+        self.tag = get_komadai_tag(is_sente)
         is_text = canvas.is_text()
         self.text_size = canvas.measurements.komadai_text_size
         # Actual size of each character in px is about 1.5*text_size
@@ -72,7 +79,7 @@ class KomadaiArtist:
             self.x_anchor+(self.width/2), self.y_anchor+self.height,
             fill="#ffffff",
             outline="",
-            tags=("komadai-solid",)
+            tags=("komadai-solid", self.tag)
         )
         return id_
 
@@ -82,7 +89,8 @@ class KomadaiArtist:
             self.x_anchor, self.y_anchor,
             text=header_text,
             font=("", self.text_size),
-            anchor="n"
+            anchor="n",
+            tags=(self.tag,),
         )
         return id_
 
@@ -91,7 +99,8 @@ class KomadaiArtist:
             self.x_anchor, self.y_anchor+self.mochigoma_heading_size,
             text="な\nし",
             font=("", self.text_size),
-            anchor="n"
+            anchor="n",
+            tags=(self.tag,),
         )
         return id_
 
@@ -120,7 +129,8 @@ class KomadaiArtist:
             tags=(
                 "komadai_focus",
                 ktype.to_csa(),
-                "sente" if self.is_sente else "gote"
+                "sente" if self.is_sente else "gote",
+                self.tag,
             ),
         )
         return id_
@@ -140,7 +150,8 @@ class KomadaiArtist:
             tags=(
                 "komadai_koma",
                 ktype.to_csa(),
-                "sente" if self.is_sente else "gote"
+                "sente" if self.is_sente else "gote",
+                self.tag,
             ),
         )
         return id_
@@ -155,6 +166,7 @@ class KomadaiArtist:
             self.y_anchor+y_offset,
             text=str(count),
             font=("", self.text_size),
-            anchor="center"
+            anchor="center",
+            tags=(self.tag,),
         )
         return id_
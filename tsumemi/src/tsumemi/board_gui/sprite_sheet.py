@@ -0,0 +1,114 @@
+from __future__ import annotations
+
+import os
+import sys
+import threading
+
+from typing import TYPE_CHECKING
+
+from PIL import Image
+
+from tsumemi.src.shogi.basetypes import KOMA_TYPES
+
+if TYPE_CHECKING:
+    from typing import Callable, List, Optional, Union
+    from tsumemi.src.shogi.basetypes import KomaType
+    PathLike = Union[str, os.PathLike]
+
+
+# A piece sprite sheet is one PNG in the skin directory holding every
+# koma image of the skin: one column per koma type in SPRITE_KTYPES
+# order, the upright images in the top row and the inverted ones in the
+# bottom row. All cells have the same size.
+SPRITE_SHEET_FILENAME = "sprites.png"
+SPRITE_KTYPES: List[KomaType] = sorted(KOMA_TYPES)
+
+
+def get_koma_image_filename(ktype: KomaType, invert: bool) -> str:
+    """Return the file name of a single koma image in a piece skin
+    directory, e.g. 0FU.png for an upright pawn.
+    """
+    return f"{1 if invert else 0}{ktype.to_csa()}.png"
+
+
+class LazyImage:
+    """Opens and decodes an image file the first time it is called,
+    returning the same decoded image from then on. Safe to call from
+    several threads.
+    """
+    def __init__(self, filepath: PathLike) -> None:
+        self.filepath: PathLike = filepath
+        self._img: Optional[Image.Image] = None
+        self._lock = threading.Lock()
+        return
+
+    def __call__(self) -> Image.Image:
+        with self._lock:
+            if self._img is None:
+                img = Image.open(self.filepath)
+                img.load()
+                self._img = img
+            return self._img
+
+
+class SpriteSheet:
+    """Piece sprite sheet of a skin, read and decoded as a whole the
+    first time any koma image is asked for.
+    """
+    def __init__(self, filepath: PathLike) -> None:
+        self.sheet = LazyImage(filepath)
+        return
+
+    @staticmethod
+    def find(skin_dir: PathLike) -> Optional[SpriteSheet]:
+        """Return the sprite sheet of the piece skin in the directory,
+        or None if it has none.
+        """
+        filepath = os.path.join(skin_dir, SPRITE_SHEET_FILENAME)
+        return SpriteSheet(filepath) if os.path.isfile(filepath) else None
+
+    def get_image(self, ktype: KomaType, invert: bool) -> Image.Image:
+        sheet = self.sheet()
+        cell_w = sheet.width // len(SPRITE_KTYPES)
+        cell_h = sheet.height // 2
+        x = SPRITE_KTYPES.index(ktype) * cell_w
+        y = cell_h if invert else 0
+        return sheet.crop((x, y, x+cell_w, y+cell_h))
+
+    def get_loader(self, ktype: KomaType, invert: bool
+        ) -> Callable[[], Image.Image]:
+        return lambda: self.get_image(ktype, invert)
+
+
+def build_sprite_sheet(skin_dir: PathLike) -> str:
+    """Combine the individual koma images of the piece skin in the
+    directory into a sprite sheet there. Returns the sheet's path.
+    """
+    imgs = [
+        [
+            Image.open(os.path.join(
+                skin_dir, get_koma_image_filename(ktype, invert)
+            )).convert("RGBA")
+            for ktype in SPRITE_KTYPES
+        ]
+        for invert in (False, True)
+    ]
+    cell_w = max(img.width for row in imgs for img in row)
+    cell_h = max(img.height for row in imgs for img in row)
+    sheet = Image.new(
+        "RGBA", (cell_w*len(SPRITE_KTYPES), cell_h*2), "#00000000"
+    )
+    for row_idx, row in enumerate(imgs):
+        for col_idx, img in enumerate(row):
+            if img.size != (cell_w, cell_h):
+                img = img.resize((cell_w, cell_h))
+            sheet.paste(img, (col_idx*cell_w, row_idx*cell_h))
+    filepath = os.path.join(skin_dir, SPRITE_SHEET_FILENAME)
+    sheet.save(filepath, optimize=True)
+    return filepath
+
+
+if __name__ == "__main__":
+    # Usage: python -m tsumemi.src.tsumemi.board_gui.sprite_sheet DIR...
+    for skin_dir in sys.argv[1:]:
+        print(build_sprite_sheet(skin_dir))
@@ -0,0 +1,169 @@
+from __future__ import annotations
+
+import argparse
+import logging
+import os
+import sys
+
+from concurrent.futures import ProcessPoolExecutor
+from typing import TYPE_CHECKING
+
+from tsumemi.src.shogi.parsing import kif
+from tsumemi.src.shogi.position import Position
+from tsumemi.src.tsumemi import files, skins
+from tsumemi.src.tsumemi.board_gui.board_render import PositionRenderer
+
+if TYPE_CHECKING:
+    from typing import Iterator, List, Optional, Sequence, Tuple, Union
+    PathLike = Union[str, os.PathLike]
+
+
+logger = logging.getLogger(__name__)
+
+# One renderer per worker process, set up by _init_worker
+_RENDERER: Optional[PositionRenderer] = None
+_UPSIDE_DOWN: bool = False
+
+
+def get_diagram_path(
+        kif_path: PathLike, directory: PathLike, out_dir: PathLike
+    ) -> str:
+    """Return where the diagram of a KIF file goes: its path relative
+    to `directory`, under `out_dir`, with a .png extension.
+    """
+    relpath = os.path.relpath(kif_path, directory)
+    return os.path.join(out_dir, os.path.splitext(relpath)[0] + ".png")
+
+
+def read_start_position(kif_path: PathLike) -> Position:
+    """Return the starting position of the game in the KIF file.
+    Raises ValueError if the file cannot be read.
+    """
+    result = next(kif.read_kifs_tolerant([kif_path]))
+    if result.game is None or not result.game.movetree.start_pos:
+        raise ValueError(f"Could not read {kif_path}")
+    position = Position()
+    position.from_sfen(result.game.movetree.start_pos)
+    return position
+
+
+def _init_worker(
+        skin_settings: skins.SkinSettings,
+        width: int,
+        height: int,
+        upside_down: bool,
+        font_path: Optional[str],
+    ) -> None:
+    global _RENDERER, _UPSIDE_DOWN
+    _RENDERER = PositionRenderer(skin_settings, width, height, font_path)
+    _UPSIDE_DOWN = upside_down
+    return
+
+
+def _export_one(paths: Tuple[str, str]) -> Optional[str]:
+    # Returns an error message, or None on success
+    kif_path, out_path = paths
+    assert _RENDERER is not None
+    try:
+        position = read_start_position(kif_path)
+        img = _RENDERER.render(position, _UPSIDE_DOWN)
+        os.makedirs(os.path.dirname(out_path) or ".", exist_ok=True)
+        img.save(out_path)
+    except (OSError, TypeError, ValueError) as exc:
+        return f"{kif_path}: {exc}"
+    return None
+
+
+def export_diagrams(
+        directory: PathLike,
+        out_dir: PathLike,
+        skin_settings: skins.SkinSettings,
+        width: int = 600,
+        height: int = 500,
+        recursive: bool = False,
+        upside_down: bool = False,
+        font_path: Optional[str] = None,
+        max_workers: Optional[int] = None,
+    ) -> Iterator[Optional[str]]:
+    """Render the starting position of every KIF file in the directory
+    to a PNG under `out_dir`, in parallel worker processes. Yields
+    None for each diagram written and an error message for each file
+    that failed, in file order.
+    """
+    kif_paths = sorted(map(str, files.get_kif_files(directory, recursive)))
+    jobs = [
+        (kif_path, get_diagram_path(kif_path, directory, out_dir))
+        for kif_path in kif_paths
+    ]
+    if not jobs:
+        return
+    # Fail early on bad settings rather than in every worker
+    PositionRenderer(skin_settings, width, height, font_path)
+    with ProcessPoolExecutor(
+            max_workers=max_workers,
+            initializer=_init_worker,
+            initargs=(skin_settings, width, height, upside_down, font_path),
+        ) as executor:
+        yield from executor.map(
+            _export_one, jobs, chunksize=max(1, len(jobs) // 64)
+        )
+    return
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Render the starting positions of a folder of KIF "
+        "problems to PNG diagrams."
+    )
+    parser.add_argument("directory", help="folder of KIF files")
+    parser.add_argument("out_dir", help="folder to write the PNGs to")
+    parser.add_argument("-r", "--recursive", action="store_true",
+        help="include subfolders"
+    )
+    parser.add_argument("--width", type=int, default=600)
+    parser.add_argument("--height", type=int, default=500)
+    parser.add_argument("--pieces", default=skins.PieceSkin.LIGHT.name,
+        choices=[skin.name for skin in skins.PieceSkin]
+    )
+    parser.add_argument("--board", default=skins.BoardSkin.WOOD1.name,
+        choices=[skin.name for skin in skins.BoardSkin]
+    )
+    parser.add_argument("--komadai", default=skins.BoardSkin.BROWN.name,
+        choices=[skin.name for skin in skins.BoardSkin]
+    )
+    parser.add_argument("--upside-down", action="store_true",
+        help="draw the board from gote's side"
+    )
+    parser.add_argument("--font", default=None,
+        help="font file with Japanese glyphs, for kanji coordinates "
+        "and text pieces"
+    )
+    parser.add_argument("-j", "--jobs", type=int, default=None,
+        help="number of worker processes (default: one per CPU)"
+    )
+    args = parser.parse_args(argv)
+    skin_settings = skins.SkinSettings(
+        skins.PieceSkin[args.pieces],
+        skins.BoardSkin[args.board],
+        skins.BoardSkin[args.komadai],
+    )
+    num_written = 0
+    errors: List[str] = []
+    for error in export_diagrams(
+            args.directory, args.out_dir, skin_settings,
+            width=args.width, height=args.height,
+            recursive=args.recursive, upside_down=args.upside_down,
+            font_path=args.font, max_workers=args.jobs,
+        ):
+        if error is None:
+            num_written += 1
+        else:
+            errors.append(error)
+    for error in errors:
+        print(error, file=sys.stderr)
+    print(f"Wrote {num_written} diagrams, {len(errors)} failed")
+    return 1 if errors else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,13 +1,19 @@
 from __future__ import annotations
 
+import contextlib
 import weakref
 
 from abc import ABC
 from typing import TYPE_CHECKING
 
+from tsumemi.src.tsumemi.instrumentation import PROFILER, TRACER
+
 if TYPE_CHECKING:
-    from typing import Any, Callable, Dict, List, Type
+    from typing import (
+        Any, Callable, Dict, Hashable, Iterator, List, Optional, Type,
+    )
     from weakref import ReferenceType
+    Scheduler = Callable[[Callable[[], None]], Any]
 
 
 class Event:
@@ -16,6 +22,18 @@ class Event:
     def __init__(self) -> None:
         return
 
+    def get_coalesce_key(self) -> Hashable:
+        """Events with equal keys emitted during a batch are delivered
+        as one. By default, all events of the same type are.
+        """
+        return (type(self),)
+
+    def coalesce(self, earlier: Event) -> Event:
+        """Return the one event standing for `earlier` followed by
+        this one. By default the later event replaces the earlier.
+        """
+        return self
+
 
 class IObserver(ABC):
     """Base class for any class that needs to observe events.
@@ -42,11 +60,26 @@ class IObserver(ABC):
         return
 
 
+def get_handler_name(observer: IObserver, event: Event) -> str:
+    """Return the name of the function the observer handles the event
+    with, for tracing.
+    """
+    action = getattr(observer, "_notify_actions", {}).get(type(event))
+    if action is None:
+        return f"{type(observer).__name__}.on_notify"
+    return getattr(action, "__qualname__", type(observer).__name__)
+
+
 class Emitter():
     """Base class for any class that needs to emit events.
     """
     def __init__(self) -> None:
         self.observer_refs: List[ReferenceType[IObserver]] = []
+        # Batching state; see batch_events() and defer_events()
+        self._batch_depth: int = 0
+        self._pending_events: Dict[Hashable, Event] = {}
+        self._scheduler: Optional[Scheduler] = None
+        self._is_flush_scheduled: bool = False
         return
 
     def add_observer(self, observer: IObserver) -> None:
@@ -60,13 +93,91 @@ class Emitter():
         ]
         return
 
+    @contextlib.contextmanager
+    def batch_events(self) -> Iterator[None]:
+        """Hold back events emitted inside the block, coalescing those
+        with the same key, and deliver them when the outermost batch
+        ends, in the order each key was first emitted.
+        """
+        self._batch_depth += 1
+        try:
+            yield
+        finally:
+            self._batch_depth -= 1
+            if self._batch_depth == 0:
+                self.flush_events()
+
+    def defer_events(self, scheduler: Optional[Scheduler]) -> None:
+        """Hold back all events, coalescing them as in a batch, until
+        a flush run through `scheduler` (e.g. a Tk widget's
+        `after_idle`). Events emitted in quick succession, faster than
+        observers can handle them, then reach observers as one. Pass
+        None to deliver events immediately again.
+        """
+        self._scheduler = scheduler
+        if scheduler is None:
+            self.flush_events()
+        return
+
+    def flush_events(self) -> None:
+        """Deliver any events held back by a batch now.
+        """
+        self._is_flush_scheduled = False
+        pending_events = self._pending_events
+        self._pending_events = {}
+        for event in pending_events.values():
+            self._dispatch(event)
+        return
+
     def _notify_observers(self, event: Event) -> None:
-        self.observer_refs = [
-            ref for ref in self.observer_refs if ref() is not None
-        ]
-        for ref in self.observer_refs:
+        if self._batch_depth == 0 and self._scheduler is None:
+            self._dispatch(event)
+            return
+        if (self._batch_depth == 0 and self._scheduler is not None
+                and not self._is_flush_scheduled):
+            self._is_flush_scheduled = True
+            self._scheduler(self.flush_events)
+        key = event.get_coalesce_key()
+        earlier = self._pending_events.get(key)
+        self._pending_events[key] = (
+            event if earlier is None else event.coalesce(earlier)
+        )
+        return
+
+    def _dispatch(self, event: Event) -> None:
+        has_dead_refs = False
+        # Iterate over a copy, as observers may add or remove observers
+        observer_refs = tuple(self.observer_refs)
+        trace = (
+            TRACER.start_dispatch(
+                type(event).__name__, type(self).__name__, len(observer_refs)
+            )
+            if TRACER.enabled else None
+        )
+        is_profiling = PROFILER.enabled
+        profile_name = (
+            f"event.{type(event).__name__}" if is_profiling else ""
+        )
+        for ref in observer_refs:
             observer = ref()
-            # Still check, just in case the gc collected something
-            if observer is not None:
+            if observer is None:
+                has_dead_refs = True
+                continue
+            if trace is None and not is_profiling:
                 observer.on_notify(event)
+                continue
+            with PROFILER.measure(profile_name):
+                if trace is None:
+                    observer.on_notify(event)
+                else:
+                    with TRACER.handle(
+                            trace, get_handler_name(observer, event)
+                        ):
+                        observer.on_notify(event)
+        if trace is not None:
+            TRACER.end_dispatch(trace)
+        if has_dead_refs:
+            self.observer_refs = [
+                ref for ref in self.observer_refs if ref() is not None
+            ]
         return
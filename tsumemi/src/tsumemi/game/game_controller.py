@@ -83,6 +83,8 @@ class GameController(evt.Emitter, evt.IObserver):
 
     def set_game(self, game: Game) -> None:
         self.game.copy_from(game)
+        # Show a new game at once even if game events are deferred
+        self.game.flush_events()
         return
 
     def set_speedrun_mode(self) -> None:
@@ -6,26 +6,59 @@ import tsumemi.src.tsumemi.event as evt
 
 from tsumemi.src.shogi.game import Game
 
+from tsumemi.src.shogi.position_diff import PositionDiff
+
 if TYPE_CHECKING:
-    from typing import Iterator, List
+    from typing import Iterator, List, Optional
     from tsumemi.src.shogi.gametree import MoveNode
     from tsumemi.src.shogi.move import Move
     from tsumemi.src.shogi.position import Position
 
 
+def merge_diffs(
+        earlier: Optional[PositionDiff], later: Optional[PositionDiff]
+    ) -> Optional[PositionDiff]:
+    """Return the diff of two changes in a row, or None if either is
+    unknown.
+    """
+    if earlier is None or later is None:
+        return None
+    return earlier.merge(later)
+
+
 class GameUpdateEvent(evt.Event):
-    def __init__(self, game: GameModel) -> None:
+    """The game changed arbitrarily. `diff` is what changed in the
+    current position, or None if unknown.
+    """
+    def __init__(self,
+            game: GameModel, diff: Optional[PositionDiff] = None
+        ) -> None:
         evt.Event.__init__(self)
         self.game = game
+        self.diff = diff
         return
 
+    def coalesce(self, earlier: evt.Event) -> GameUpdateEvent:
+        assert isinstance(earlier, GameUpdateEvent)
+        return GameUpdateEvent(self.game, merge_diffs(earlier.diff, self.diff))
+
 
 class GameStepEvent(evt.Event):
-    def __init__(self, game: GameModel) -> None:
+    """The game moved one step along the movetree. `diff` is what
+    changed in the current position, or None if unknown.
+    """
+    def __init__(self,
+            game: GameModel, diff: Optional[PositionDiff] = None
+        ) -> None:
         evt.Event.__init__(self)
         self.game = game
+        self.diff = diff
         return
 
+    def coalesce(self, earlier: evt.Event) -> GameStepEvent:
+        assert isinstance(earlier, GameStepEvent)
+        return GameStepEvent(self.game, merge_diffs(earlier.diff, self.diff))
+
 
 class GameModel(evt.Emitter):
     """Wrapper for a Game.
@@ -36,51 +69,86 @@ class GameModel(evt.Emitter):
         return
 
     def copy_from(self, game: Game) -> None:
+        # No diff: the incoming game may share its Position with the
+        # current one, in which case the old position is already lost.
         self.game.copy_from(game)
         self._notify_observers(GameUpdateEvent(self))
         return
 
     def go_to_start(self) -> None:
+        prev_pos = self.game.position.copy()
         self.game.go_to_start()
-        self._notify_observers(GameUpdateEvent(self))
+        self._notify_observers(GameUpdateEvent(
+            self, prev_pos.get_diff(self.game.position)
+        ))
         return
 
     def go_to_end(self) -> None:
+        prev_pos = self.game.position.copy()
         self.game.go_to_end()
-        self._notify_observers(GameUpdateEvent(self))
+        self._notify_observers(GameUpdateEvent(
+            self, prev_pos.get_diff(self.game.position)
+        ))
         return
 
     def go_next_move(self) -> None:
+        prev_node = self.game.curr_node
         self.game.go_next_move()
-        self._notify_observers(GameStepEvent(self))
+        self._notify_observers(GameStepEvent(
+            self, self._get_step_diff(prev_node)
+        ))
         return
 
     def go_prev_move(self) -> None:
+        prev_node = self.game.curr_node
         self.game.go_prev_move()
+        diff = self._get_step_diff(prev_node)
         if self.game.has_variations():
-            self._notify_observers(GameUpdateEvent(self))
+            self._notify_observers(GameUpdateEvent(self, diff))
         else:
-            self._notify_observers(GameStepEvent(self))
+            self._notify_observers(GameStepEvent(self, diff))
         return
 
     def go_to_id(self, id_: int) -> None:
+        prev_pos = self.game.position.copy()
         self.game.go_to_id(id_)
-        self._notify_observers(GameUpdateEvent(self))
+        self._notify_observers(GameUpdateEvent(
+            self, prev_pos.get_diff(self.game.position)
+        ))
         return
 
     def get_last_move(self) -> Move:
         return self.game.get_last_move()
 
     def add_move(self, move: Move) -> None:
+        prev_node = self.game.curr_node
         self.game.add_move(move)
-        self._notify_observers(GameUpdateEvent(self))
+        self._notify_observers(GameUpdateEvent(
+            self, self._get_step_diff(prev_node)
+        ))
         return
 
     def make_move(self, move: Move) -> None:
+        prev_node = self.game.curr_node
         self.game.make_move(move)
-        self._notify_observers(GameUpdateEvent(self))
+        self._notify_observers(GameUpdateEvent(
+            self, self._get_step_diff(prev_node)
+        ))
         return
 
+    def _get_step_diff(self, prev_node: MoveNode) -> Optional[PositionDiff]:
+        """Return the position diff of stepping from `prev_node` to the
+        current node, if they are at most one move apart.
+        """
+        curr_node = self.game.curr_node
+        if curr_node is prev_node:
+            return PositionDiff()
+        if curr_node.parent is prev_node:
+            return curr_node.move.get_diff()
+        if prev_node.parent is curr_node:
+            return prev_node.move.get_diff().reverse()
+        return None
+
     def get_initial_sfen(self) -> str:
         return self.game.movetree.start_pos
 
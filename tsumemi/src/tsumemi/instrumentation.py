@@ -0,0 +1,294 @@
+from __future__ import annotations
+
+import collections
+import contextlib
+import csv
+import functools
+import json
+import math
+import os
+import time
+
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from typing import (
+        Any, Callable, ContextManager, Deque, Dict, Iterator, List,
+        TypeVar, Union,
+    )
+    PathLike = Union[str, os.PathLike]
+    F = TypeVar("F", bound=Callable[..., Any])
+
+
+# Set these environment variables to anything non-empty to turn on the
+# profiler or the event tracer at startup
+PROFILE_ENV_VAR = "TSUMEMI_PROFILE"
+TRACE_ENV_VAR = "TSUMEMI_TRACE"
+DEFAULT_WINDOW = 1000
+DEFAULT_MAX_TRACED = 100_000
+PERCENTILES = (50, 90, 99)
+SUMMARY_FIELDS = ("name", "count", "mean_ms", "p50_ms", "p90_ms", "p99_ms",
+    "max_ms"
+)
+
+_NULL_CONTEXT: ContextManager[None] = contextlib.nullcontext()
+
+
+def percentile(sorted_values: List[int], pct: float) -> int:
+    """Return the nearest-rank percentile of a non-empty sorted list.
+    """
+    rank = max(math.ceil(pct / 100 * len(sorted_values)), 1)
+    return sorted_values[rank-1]
+
+
+class TimingSeries:
+    """The most recent durations recorded under one name, in
+    nanoseconds, plus how many were recorded in total.
+    """
+    def __init__(self, window: int = DEFAULT_WINDOW) -> None:
+        self.durations: Deque[int] = collections.deque(maxlen=window)
+        self.count: int = 0
+        return
+
+    def add(self, duration_ns: int) -> None:
+        self.durations.append(duration_ns)
+        self.count += 1
+        return
+
+    def get_summary(self) -> Dict[str, float]:
+        """Return the count of all durations, and the mean, percentiles
+        and maximum of the recent ones in milliseconds.
+        """
+        values = sorted(self.durations)
+        if not values:
+            return {"count": self.count}
+        summary: Dict[str, float] = {
+            "count": self.count,
+            "mean_ms": sum(values) / len(values) / 1e6,
+        }
+        for pct in PERCENTILES:
+            summary[f"p{pct}_ms"] = percentile(values, pct) / 1e6
+        summary["max_ms"] = values[-1] / 1e6
+        return summary
+
+
+class Profiler:
+    """Records how long named sections of code take. While disabled,
+    measuring costs one attribute check.
+    """
+    def __init__(self,
+            enabled: bool = False,
+            window: int = DEFAULT_WINDOW,
+            clock: Callable[[], int] = time.perf_counter_ns,
+        ) -> None:
+        self.enabled: bool = enabled
+        self.window: int = window
+        self.clock: Callable[[], int] = clock
+        self.series: Dict[str, TimingSeries] = {}
+        return
+
+    def measure(self, name: str) -> ContextManager[None]:
+        """Context manager recording the duration of its body under
+        `name`.
+        """
+        if not self.enabled:
+            return _NULL_CONTEXT
+        return self._measure(name)
+
+    @contextlib.contextmanager
+    def _measure(self, name: str) -> Iterator[None]:
+        start = self.clock()
+        try:
+            yield
+        finally:
+            self.record(name, self.clock() - start)
+
+    def timed(self, name: str) -> Callable[[F], F]:
+        """Decorator recording the duration of every call of the
+        function under `name`.
+        """
+        def decorator(func: F) -> F:
+            @functools.wraps(func)
+            def wrapper(*args: Any, **kwargs: Any) -> Any:
+                if not self.enabled:
+                    return func(*args, **kwargs)
+                with self._measure(name):
+                    return func(*args, **kwargs)
+            return wrapper  # type: ignore[return-value]
+        return decorator
+
+    def record(self, name: str, duration_ns: int) -> None:
+        if name not in self.series:
+            self.series[name] = TimingSeries(self.window)
+        self.series[name].add(duration_ns)
+        return
+
+    def reset(self) -> None:
+        self.series = {}
+        return
+
+    def get_summary(self) -> Dict[str, Dict[str, float]]:
+        """Return the summary of each name recorded, sorted by name.
+        """
+        return {
+            name: self.series[name].get_summary()
+            for name in sorted(self.series)
+        }
+
+    def format_summary(self) -> str:
+        """Return the summary as a plain text table.
+        """
+        lines = [
+            f"{'name':<32}{'count':>8}{'mean':>9}{'p50':>9}"
+            f"{'p90':>9}{'p99':>9}{'max':>9}"
+        ]
+        for name, summary in self.get_summary().items():
+            lines.append(f"{name:<32}{int(summary['count']):>8}" + "".join(
+                f"{summary.get(field, math.nan):>9.2f}"
+                for field in SUMMARY_FIELDS[2:]
+            ))
+        return "\n".join(lines)
+
+    def write_csv(self, filepath: PathLike) -> None:
+        with open(filepath, "w", newline="", encoding="utf-8") as fout:
+            writer = csv.DictWriter(fout, fieldnames=SUMMARY_FIELDS)
+            writer.writeheader()
+            for name, summary in self.get_summary().items():
+                writer.writerow({"name": name, **summary})
+        return
+
+    def write_json(self, filepath: PathLike) -> None:
+        with open(filepath, "w", encoding="utf-8") as fout:
+            json.dump(self.get_summary(), fout, indent=2)
+        return
+
+    def dump(self, filepath: PathLike) -> None:
+        """Write the summary to a file, as JSON if the file name ends
+        in .json and as CSV otherwise.
+        """
+        if os.fspath(filepath).lower().endswith(".json"):
+            self.write_json(filepath)
+        else:
+            self.write_csv(filepath)
+        return
+
+
+class HandlerTrace:
+    """One observer handling one event.
+    """
+    def __init__(self, name: str, start_ns: int, duration_ns: int) -> None:
+        self.name: str = name
+        self.start_ns: int = start_ns
+        self.duration_ns: int = duration_ns
+        return
+
+
+class DispatchTrace:
+    """One event dispatched by an emitter to its observers.
+    """
+    def __init__(self,
+            event_type: str,
+            sender: str,
+            num_observers: int,
+            start_ns: int,
+        ) -> None:
+        self.event_type: str = event_type
+        self.sender: str = sender
+        self.num_observers: int = num_observers
+        self.start_ns: int = start_ns
+        self.duration_ns: int = 0
+        self.handlers: List[HandlerTrace] = []
+        return
+
+
+class EventTracer:
+    """Records every event dispatch and how long each observer took to
+    handle it, keeping the most recent `max_events` dispatches. While
+    disabled, dispatching costs one attribute check.
+    """
+    def __init__(self,
+            enabled: bool = False,
+            max_events: int = DEFAULT_MAX_TRACED,
+            clock: Callable[[], int] = time.perf_counter_ns,
+        ) -> None:
+        self.enabled: bool = enabled
+        self.clock: Callable[[], int] = clock
+        self.traces: Deque[DispatchTrace] = collections.deque(
+            maxlen=max_events
+        )
+        return
+
+    def start_dispatch(self,
+            event_type: str, sender: str, num_observers: int
+        ) -> DispatchTrace:
+        return DispatchTrace(event_type, sender, num_observers, self.clock())
+
+    @contextlib.contextmanager
+    def handle(self, trace: DispatchTrace, name: str) -> Iterator[None]:
+        """Context manager recording the duration of its body as the
+        handler `name` of the dispatch.
+        """
+        start = self.clock()
+        try:
+            yield
+        finally:
+            trace.handlers.append(
+                HandlerTrace(name, start, self.clock() - start)
+            )
+
+    def end_dispatch(self, trace: DispatchTrace) -> None:
+        trace.duration_ns = self.clock() - trace.start_ns
+        self.traces.append(trace)
+        return
+
+    def reset(self) -> None:
+        self.traces.clear()
+        return
+
+    def get_chrome_trace(self) -> Dict[str, Any]:
+        """Return the dispatches in the Chrome trace event format, to
+        be viewed in chrome://tracing or Perfetto. Each dispatch is a
+        slice with its handlers nested inside it.
+        """
+        trace_events: List[Dict[str, Any]] = []
+        pid = os.getpid()
+        for trace in self.traces:
+            trace_events.append({
+                "name": trace.event_type,
+                "cat": "event",
+                "ph": "X",
+                "ts": trace.start_ns / 1000,
+                "dur": trace.duration_ns / 1000,
+                "pid": pid,
+                "tid": 0,
+                "args": {
+                    "sender": trace.sender,
+                    "observers": trace.num_observers,
+                },
+            })
+            for handler in trace.handlers:
+                trace_events.append({
+                    "name": handler.name,
+                    "cat": "handler",
+                    "ph": "X",
+                    "ts": handler.start_ns / 1000,
+                    "dur": handler.duration_ns / 1000,
+                    "pid": pid,
+                    "tid": 0,
+                    "args": {"event": trace.event_type},
+                })
+        # Nested dispatches are recorded as they end; viewers want
+        # slices in start order, enclosing slices first
+        trace_events.sort(key=lambda trace_event: (
+            trace_event["ts"], -trace_event["dur"]
+        ))
+        return {"traceEvents": trace_events, "displayTimeUnit": "ms"}
+
+    def write_chrome_trace(self, filepath: PathLike) -> None:
+        with open(filepath, "w", encoding="utf-8") as fout:
+            json.dump(self.get_chrome_trace(), fout)
+        return
+
+
+PROFILER = Profiler(enabled=bool(os.environ.get(PROFILE_ENV_VAR)))
+TRACER = EventTracer(enabled=bool(os.environ.get(TRACE_ENV_VAR)))
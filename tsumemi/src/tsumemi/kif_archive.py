@@ -0,0 +1,235 @@
+from __future__ import annotations
+
+import logging
+import mmap
+import os
+import struct
+import zlib
+
+from typing import TYPE_CHECKING
+
+from tsumemi.src.shogi.parsing import kif
+from tsumemi.src.tsumemi import files
+
+if TYPE_CHECKING:
+    from types import TracebackType
+    from typing import BinaryIO, Iterable, List, Optional, Type, Union
+    from tsumemi.src.shogi.game import Game
+    PathLike = Union[str, os.PathLike]
+
+
+logger = logging.getLogger(__name__)
+
+# Archive layout (all integers little-endian):
+#   header: magic, format version, entry count, offset of the index
+#   data:   zlib-compressed UTF-8 KIF text of each game, back to back
+#   index:  per entry, data offset, compressed length, uncompressed
+#           length and name length, followed by the UTF-8 name
+# The index comes last so that games can be streamed into the archive
+# without knowing beforehand how many there are.
+ARCHIVE_MAGIC = b"TSMA"
+ARCHIVE_VERSION = 1
+ARCHIVE_EXTENSION = ".tsma"
+_HEADER = struct.Struct("<4sHxxIQ")
+_INDEX_ENTRY = struct.Struct("<QIIH")
+
+
+class ArchiveFormatError(ValueError):
+    """Raised when a file is not a readable KIF archive.
+    """
+    pass
+
+
+class ArchiveEntry:
+    """Index entry describing where one game lives in an archive.
+    """
+    def __init__(self,
+            name: str, offset: int, length: int, raw_length: int
+        ) -> None:
+        self.name: str = name
+        self.offset: int = offset
+        self.length: int = length
+        self.raw_length: int = raw_length
+        return
+
+
+class KifArchiveWriter:
+    """Writes KIF games one by one into a new archive file. Use as a
+    context manager, or call close() to write out the index.
+    """
+    def __init__(self, filepath: PathLike, level: int = 9) -> None:
+        self.filepath: PathLike = filepath
+        self.level: int = level
+        self.entries: List[ArchiveEntry] = []
+        self._file: BinaryIO = open(filepath, "wb")
+        self._file.write(_HEADER.pack(ARCHIVE_MAGIC, ARCHIVE_VERSION, 0, 0))
+        return
+
+    def __enter__(self) -> KifArchiveWriter:
+        return self
+
+    def __exit__(self,
+            exc_type: Optional[Type[BaseException]],
+            exc_value: Optional[BaseException],
+            traceback: Optional[TracebackType],
+        ) -> None:
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+        return
+
+    def add(self, name: str, kif_text: str) -> None:
+        """Append the KIF text of one game to the archive under the
+        given name.
+        """
+        raw = kif_text.encode("utf-8")
+        data = zlib.compress(raw, self.level)
+        self.entries.append(
+            ArchiveEntry(name, self._file.tell(), len(data), len(raw))
+        )
+        self._file.write(data)
+        return
+
+    def abort(self) -> None:
+        """Discard the partly written archive without writing an index,
+        so that it cannot be mistaken for a complete one.
+        """
+        if self._file.closed:
+            return
+        self._file.close()
+        os.remove(self.filepath)
+        return
+
+    def close(self) -> None:
+        if self._file.closed:
+            return
+        index_offset = self._file.tell()
+        for entry in self.entries:
+            name = entry.name.encode("utf-8")
+            self._file.write(_INDEX_ENTRY.pack(
+                entry.offset, entry.length, entry.raw_length, len(name)
+            ))
+            self._file.write(name)
+        self._file.seek(0)
+        self._file.write(_HEADER.pack(
+            ARCHIVE_MAGIC, ARCHIVE_VERSION, len(self.entries), index_offset
+        ))
+        self._file.close()
+        return
+
+
+class KifArchive:
+    """Read-only view of a KIF archive. The file is memory-mapped, so
+    fetching a game is a single slice of the mapping plus a decompress.
+    """
+    def __init__(self, filepath: PathLike) -> None:
+        self.filepath: PathLike = filepath
+        self.entries: List[ArchiveEntry] = []
+        with open(filepath, "rb") as archive_file:
+            try:
+                self._mmap = mmap.mmap(
+                    archive_file.fileno(), 0, access=mmap.ACCESS_READ
+                )
+            except ValueError as exc: # empty file
+                raise ArchiveFormatError(
+                    f"{filepath} is not a KIF archive"
+                ) from exc
+        try:
+            self._read_index()
+        except (ArchiveFormatError, struct.error, UnicodeDecodeError) as exc:
+            self._mmap.close()
+            raise ArchiveFormatError(
+                f"{filepath} is not a valid KIF archive"
+            ) from exc
+        return
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def __enter__(self) -> KifArchive:
+        return self
+
+    def __exit__(self,
+            exc_type: Optional[Type[BaseException]],
+            exc_value: Optional[BaseException],
+            traceback: Optional[TracebackType],
+        ) -> None:
+        self.close()
+        return
+
+    def close(self) -> None:
+        self._mmap.close()
+        return
+
+    def get_names(self) -> List[str]:
+        return [entry.name for entry in self.entries]
+
+    def read_text(self, idx: int) -> str:
+        """Return the KIF text of the game at the given index.
+        """
+        entry = self.entries[idx]
+        data = self._mmap[entry.offset:entry.offset+entry.length]
+        return zlib.decompress(data, bufsize=entry.raw_length).decode("utf-8")
+
+    def read_game(self, idx: int) -> Game:
+        """Return the game at the given index.
+        """
+        return kif.read_kif_string(self.read_text(idx))
+
+    def _read_index(self) -> None:
+        magic, version, count, index_offset = _HEADER.unpack_from(self._mmap, 0)
+        if magic != ARCHIVE_MAGIC:
+            raise ArchiveFormatError("Bad archive magic number")
+        if version != ARCHIVE_VERSION:
+            raise ArchiveFormatError(f"Unsupported archive version {version}")
+        pos = index_offset
+        for _ in range(count):
+            offset, length, raw_length, name_len = _INDEX_ENTRY.unpack_from(
+                self._mmap, pos
+            )
+            pos += _INDEX_ENTRY.size
+            name = self._mmap[pos:pos+name_len].decode("utf-8")
+            pos += name_len
+            if offset + length > index_offset:
+                raise ArchiveFormatError(f"Entry {name} is out of bounds")
+            self.entries.append(ArchiveEntry(name, offset, length, raw_length))
+        return
+
+
+def pack_files(
+        filepaths: Iterable[PathLike],
+        archive_path: PathLike,
+        root: Optional[PathLike] = None,
+    ) -> int:
+    """Pack the given KIF files into a new archive. Entries are named
+    by their path relative to `root` if given, else by their basename.
+    Files that cannot be read or decoded are skipped. Returns the
+    number of games written.
+    """
+    with KifArchiveWriter(archive_path) as writer:
+        for filepath in filepaths:
+            try:
+                with open(filepath, "rb") as kif_file:
+                    text = kif.decode_kif_bytes(kif_file.read())
+            except OSError:
+                logger.warning("Could not read %s, skipping", filepath)
+                continue
+            if text is None:
+                logger.warning("Could not decode %s, skipping", filepath)
+                continue
+            name = (os.path.basename(filepath) if root is None
+                else os.path.relpath(filepath, root)
+            )
+            writer.add(name, text)
+        return len(writer.entries)
+
+
+def pack_directory(
+        directory: PathLike, archive_path: PathLike, recursive: bool = True
+    ) -> int:
+    """Pack all KIF files in a directory into a new archive. Returns
+    the number of games written.
+    """
+    filepaths = sorted(files.get_kif_files(directory, recursive), key=str)
+    return pack_files(filepaths, archive_path, root=directory)
@@ -3,13 +3,15 @@ from __future__ import annotations
 import datetime
 import logging.config
 import os
+import sqlite3
 import tkinter as tk
 
-from tkinter import filedialog, ttk
+from tkinter import filedialog, messagebox, ttk
 from typing import TYPE_CHECKING
 
 import tsumemi.src.tsumemi.event as evt
 import tsumemi.src.tsumemi.game.game_controller as gamecon
+import tsumemi.src.tsumemi.problem_list.history as history
 import tsumemi.src.tsumemi.notation_writer as nwriter
 import tsumemi.src.tsumemi.problem_list.problem_list_model as plist
 import tsumemi.src.tsumemi.problem_list.problem_list_controller as plistcon
@@ -18,10 +20,12 @@ import tsumemi.src.tsumemi.speedrun_controller as speedcon
 import tsumemi.src.tsumemi.timer_controller as timecon
 
 from tsumemi.src.shogi.parsing import kif
-from tsumemi.src.tsumemi import files, skins, timer
+from tsumemi.src.tsumemi import analytics, files, kif_archive, skins, timer
+from tsumemi.src.tsumemi.instrumentation import PROFILER, TRACER
 from tsumemi.src.tsumemi.views import main_window_view_controller as mainviewcon
 from tsumemi.src.tsumemi.menubar import Menubar
 from tsumemi.src.tsumemi.statistics_window import StatisticsDialog
+from tsumemi.src.tsumemi.timings_window import TimingsWindow
 
 if TYPE_CHECKING:
     from typing import Any, Callable, List, Mapping, Optional
@@ -29,6 +33,9 @@ if TYPE_CHECKING:
     from tsumemi.src.shogi.game import Game
 
 
+logger = logging.getLogger(__name__)
+
+
 class RootController(evt.IObserver):
     """Root controller for the application. Manages top-level logic
     and GUI elements.
@@ -45,6 +52,10 @@ class RootController(evt.IObserver):
         self.main_game = gamecon.GameController(self.notation_writer)
         self.main_timer = timecon.TimerController()
         self.main_problem_list = plistcon.ProblemListController()
+        try:
+            self.main_problem_list.set_history(history.AttemptHistory())
+        except sqlite3.Error:
+            logger.warning("Could not open the attempt history", exc_info=True)
 
         self.speedrun_controller = speedcon.SpeedrunController(self)
 
@@ -68,6 +79,9 @@ class RootController(evt.IObserver):
         self.menubar: Menubar = Menubar(parent=self.root, controller=self)
 
         self.main_viewcon = mainviewcon.MainWindowViewController(root, self)
+        # Bursts of navigation (e.g. holding down a key) are redrawn
+        # once, when Tk is next idle
+        self.main_game.game.defer_events(root.after_idle)
 
         # Keyboard shortcuts
         self.bindings = Bindings(self)
@@ -94,11 +108,99 @@ class RootController(evt.IObserver):
         self.main_problem_list.set_directory(
             directory, kif_files
         )
+        self.open_session_log()
         return
 
     def open_folder_recursive(self, _event: Optional[tk.Event] = None) -> None:
         return self.open_folder(recursive=True)
 
+    def open_archive(self, _event: Optional[tk.Event] = None) -> None:
+        """Prompt user for a KIF archive, open into main_problem_list.
+        """
+        filepath = filedialog.askopenfilename(
+            filetypes=(
+                ("tsumemi KIF archive", kif_archive.ARCHIVE_EXTENSION),
+            ),
+        )
+        if not filepath:
+            return
+        filepath = os.path.normpath(filepath)
+        try:
+            archive = kif_archive.KifArchive(filepath)
+        except (OSError, kif_archive.ArchiveFormatError) as exc:
+            messagebox.showerror(title="Open archive", message=str(exc))
+            return
+        self.main_problem_list.set_archive(archive)
+        self.open_session_log()
+        return
+
+    def open_session_log(self) -> None:
+        """Start logging results of the problems just opened, offering
+        to restore those of an earlier session first.
+        """
+        log_path = self.main_problem_list.get_session_log_path()
+        if log_path is None:
+            return
+        restore = (
+            os.path.isfile(log_path) and os.path.getsize(log_path) > 0
+            and messagebox.askyesno(
+                title="Resume session",
+                message="Restore the results of your previous session "
+                "with these problems?",
+            )
+        )
+        try:
+            self.main_problem_list.open_session_log(restore)
+        except (OSError, ValueError) as exc:
+            messagebox.showerror(title="Session log", message=str(exc))
+        return
+
+    def pack_folder_into_archive(self) -> None:
+        """Prompt user for a folder and pack all KIF files in it and
+        its subfolders into a single KIF archive.
+        """
+        directory = filedialog.askdirectory()
+        if not directory:
+            return
+        directory = os.path.normpath(directory)
+        archive_path = filedialog.asksaveasfilename(
+            defaultextension=kif_archive.ARCHIVE_EXTENSION,
+            filetypes=(
+                ("tsumemi KIF archive", kif_archive.ARCHIVE_EXTENSION),
+            ),
+            initialfile=os.path.basename(directory),
+        )
+        if not archive_path:
+            return
+        try:
+            num_packed = kif_archive.pack_directory(directory, archive_path)
+        except OSError as exc:
+            messagebox.showerror(
+                title="Pack folder into archive", message=str(exc)
+            )
+            return
+        messagebox.showinfo(
+            title="Pack folder into archive",
+            message=f"Packed {num_packed} KIF files into {archive_path}",
+        )
+        return
+
+    def save_game_as_kif(self) -> None:
+        """Prompt user for a filename and save the current game,
+        including any moves added in free mode, as a KIF file.
+        """
+        filepath = filedialog.asksaveasfilename(
+            defaultextension=".kif",
+            filetypes=(("KIF file", ".kif"), ("KIF file (UTF-8)", ".kifu")),
+        )
+        if not filepath:
+            return
+        try:
+            kif.write_kif(self.main_game.game.game, filepath)
+        except OSError as exc:
+            messagebox.showerror(title="Save game as KIF", message=str(exc))
+        return
+
     def copy_sfen_to_clipboard(self) -> None:
         sfen = self.main_game.get_current_sfen()
         self.root.clipboard_clear()
@@ -106,32 +208,30 @@ class RootController(evt.IObserver):
         self.root.update()
         return
 
+    @PROFILER.timed("show_problem")
     def show_problem(self, prob: plist.Problem) -> None:
         """Display the given problem in the GUI and enable move input.
         """
-        self._read_problem(prob)
-        self.main_viewcon.refresh_main_board()
-        self.main_viewcon.refresh_move_list()
-        self.main_viewcon.enable_move_input()
-        self.main_viewcon.hide_solution()
+        with PROFILER.measure("show_problem.parse"):
+            game = self.game_from_problem(prob)
+        if game is not None:
+            with PROFILER.measure("show_problem.notation"):
+                solution = self.solution_str_from_game(game)
+            self.main_viewcon.set_solution(solution)
+        with PROFILER.measure("show_problem.draw"):
+            if game is not None:
+                self.main_game.set_game(game)
+            self.main_viewcon.refresh_main_board()
+            self.main_viewcon.refresh_move_list()
+            self.main_viewcon.enable_move_input()
+            self.main_viewcon.hide_solution()
         self.root.title("tsumemi - " + str(prob.filepath))
         return
 
-    def _read_problem(self, prob: plist.Problem) -> None:
-        """Read the problem data from file into the program.
-        """
-        game = self.game_from_problem(prob)
-        if game is None:
-            return
-        self.main_viewcon.set_solution(self.solution_str_from_game(game))
-        self.main_game.set_game(game)
-        return
-
     def game_from_problem(self, prob: plist.Problem) -> Optional[Game]:
-        filepath = prob.filepath
-        if filepath is None:
+        if prob.filepath is None:
             return None
-        return kif.read_kif(filepath)
+        return self.main_problem_list.read_problem(prob)
 
     def solution_str_from_game(self, game: Game) -> str:
         return "　".join(self.notation_writer.write_mainline(game))
@@ -166,8 +266,17 @@ class RootController(evt.IObserver):
         return
 
     def clear_results(self) -> None:
-        self.main_problem_list.clear_statuses()
-        self.main_problem_list.clear_times()
+        with self.main_problem_list.problem_list.batch_events():
+            self.main_problem_list.clear_statuses()
+            self.main_problem_list.clear_times()
+        return
+
+    def remove_duplicate_problems(self) -> None:
+        num_removed = self.main_problem_list.remove_duplicates()
+        messagebox.showinfo(
+            title="Remove duplicate problems",
+            message=f"Removed {num_removed} duplicate problems.",
+        )
         return
 
     def generate_statistics(self) -> None:
@@ -188,6 +297,59 @@ class RootController(evt.IObserver):
         self.main_problem_list.export_as_csv(directory)
         return
 
+    def save_analysis_report(self) -> None:
+        filepath = filedialog.asksaveasfilename(
+            defaultextension=".png",
+            filetypes=(("PNG image", ".png"), ("Text file", ".txt")),
+            initialfile="tsume-analysis",
+        )
+        if not filepath:
+            return
+        try:
+            analytics.write_report(
+                self.main_problem_list.get_session_data(), filepath
+            )
+        except (OSError, KeyError, ValueError) as exc:
+            messagebox.showerror(
+                title="Save analysis report", message=str(exc)
+            )
+        return
+
+    def show_timings(self) -> None:
+        TimingsWindow(PROFILER)
+        return
+
+    def save_timings(self) -> None:
+        filepath = filedialog.asksaveasfilename(
+            defaultextension=".csv",
+            filetypes=(
+                ("Comma-separated values", ".csv"),
+                ("JSON", ".json"),
+            ),
+            initialfile="tsumemi-timings",
+        )
+        if not filepath:
+            return
+        try:
+            PROFILER.dump(filepath)
+        except OSError as exc:
+            messagebox.showerror(title="Save timings", message=str(exc))
+        return
+
+    def save_event_trace(self) -> None:
+        filepath = filedialog.asksaveasfilename(
+            defaultextension=".json",
+            filetypes=(("Chrome trace", ".json"),),
+            initialfile="tsumemi-trace",
+        )
+        if not filepath:
+            return
+        try:
+            TRACER.write_chrome_trace(filepath)
+        except OSError as exc:
+            messagebox.showerror(title="Save event trace", message=str(exc))
+        return
+
     #=== Speedrun controller commands
     def start_speedrun(self) -> None:
         self.speedrun_controller.start_speedrun()
@@ -287,7 +449,10 @@ def run() -> None:
         return
 
     root = tk.Tk()
-    RootController(root)
+    controller = RootController(root)
     apply_theme_fix()
     root.minsize(width=400, height=200) # stopgap vs canvas overshrinking bug
     root.mainloop()
+    controller.main_problem_list.close_session_log()
+    if controller.main_problem_list.history is not None:
+        controller.main_problem_list.history.close()
@@ -6,6 +6,8 @@ import tkinter as tk
 from tkinter import messagebox
 from typing import TYPE_CHECKING
 
+from tsumemi.src.tsumemi.instrumentation import PROFILER, TRACER
+
 if TYPE_CHECKING:
     from typing import Any
     from tsumemi.src.tsumemi.kif_browser_gui import RootController
@@ -42,7 +44,19 @@ class Menubar(tk.Menu):
             command=self.controller.open_folder_recursive,
             accelerator="Ctrl+Shift+O",
         )
+        menu_file.add_command(
+            label="Open archive...",
+            command=self.controller.open_archive,
+        )
+        menu_file.add_command(
+            label="Pack folder into archive...",
+            command=self.controller.pack_folder_into_archive,
+        )
         menu_file.add_separator()
+        menu_file.add_command(
+            label="Save game as KIF...",
+            command=self.controller.save_game_as_kif,
+        )
         menu_file.add_command(
             label="Copy SFEN of current position",
             command=self.controller.copy_sfen_to_clipboard,
@@ -56,6 +70,15 @@ class Menubar(tk.Menu):
             label="Export results as CSV...",
             command=self.controller.export_prob_list_csv,
         )
+        menu_solving.add_command(
+            label="Save analysis report...",
+            command=self.controller.save_analysis_report,
+        )
+        menu_solving.add_separator()
+        menu_solving.add_command(
+            label="Remove duplicate problems",
+            command=self.controller.remove_duplicate_problems,
+        )
         menu_solving.add_separator()
         menu_solving.add_command(
             label="Clear solving statuses",
@@ -83,6 +106,32 @@ class Menubar(tk.Menu):
                 message="Written in Python 3 by Marken Foo. For the shogi community. KIF files sold separately."
             )
         )
+        # Debug, only while profiling or tracing
+        if PROFILER.enabled or TRACER.enabled:
+            menu_debug = tk.Menu(self)
+            self.add_cascade(menu=menu_debug, label="Debug")
+        if PROFILER.enabled:
+            menu_debug.add_command(
+                label="Show timings",
+                command=self.controller.show_timings,
+            )
+            menu_debug.add_command(
+                label="Save timings...",
+                command=self.controller.save_timings,
+            )
+            menu_debug.add_command(
+                label="Reset timings",
+                command=PROFILER.reset,
+            )
+        if TRACER.enabled:
+            menu_debug.add_command(
+                label="Save event trace...",
+                command=self.controller.save_event_trace,
+            )
+            menu_debug.add_command(
+                label="Clear event trace",
+                command=TRACER.reset,
+            )
         # Bind to main window
         parent["menu"] = self
         return
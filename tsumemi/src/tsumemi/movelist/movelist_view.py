@@ -8,11 +8,12 @@ import tsumemi.src.tsumemi.event as evt
 from tsumemi.src.tsumemi import utils
 from tsumemi.src.tsumemi.game.game_model import GameStepEvent, GameUpdateEvent
 from tsumemi.src.tsumemi.game.game_nav_btns_view import GameNavButtonsFrame
+from tsumemi.src.tsumemi.instrumentation import PROFILER
 
 if TYPE_CHECKING:
     import tkinter as tk
-    from typing import Optional
-    from tsumemi.src.tsumemi.movelist.movelist_viewmodel import MovelistViewModel
+    from typing import List, Optional
+    from tsumemi.src.tsumemi.movelist.movelist_viewmodel import MovelistRow, MovelistViewModel
 
 
 class MovelistFrame(ttk.Frame):
@@ -68,6 +69,8 @@ class MovelistTreeviewFrame(utils.ScrollableTreeviewFrame, evt.IObserver):
         )
         evt.IObserver.__init__(self)
         self.viewmodel = viewmodel
+        # What the treeview shows, as (iid, values) for each row
+        self.rows: List[MovelistRow] = []
 
         self.tvw["columns"] = ("movenum", "move", "alternative")
         self.tvw.heading("movenum", text="")
@@ -125,9 +128,24 @@ class MovelistTreeviewFrame(utils.ScrollableTreeviewFrame, evt.IObserver):
         self.tvw.see(iid)
         return
 
+    @PROFILER.timed("movelist.refresh_view")
     def refresh_view(self, _event: Optional[GameUpdateEvent] = None) -> None:
-        self.clear_treeview()
-        self.viewmodel.populate_treeview(self.tvw)
+        # Rows are kept up to the first one showing a different node;
+        # only the rows after it are replaced
+        rows = self.viewmodel.get_mainline_rows()
+        num_kept = 0
+        for (old_iid, old_values), (iid, values) in zip(self.rows, rows):
+            if old_iid != iid:
+                break
+            if old_values != values:
+                self.tvw.item(iid, values=values)
+            num_kept += 1
+        children = self.tvw.get_children()
+        if len(children) > num_kept:
+            self.tvw.delete(*children[num_kept:])
+        for iid, values in rows[num_kept:]:
+            self.tvw.insert("", "end", iid=iid, values=values)
+        self.rows = rows
         iid = str(self.viewmodel.game.game.curr_node.id)
         if self.tvw.exists(iid):
             self.set_focus(iid)
@@ -157,6 +175,11 @@ class MovelistTreeviewFrame(utils.ScrollableTreeviewFrame, evt.IObserver):
         self.tvw.insert("", "end", values=("", "Hidden", ""))
         return
 
+    def clear_treeview(self) -> None:
+        super().clear_treeview()
+        self.rows = []
+        return
+
 
 class VariationTreeviewFrame(utils.ScrollableTreeviewFrame, evt.IObserver):
     def __init__(self, parent: tk.Widget, viewmodel: MovelistViewModel) -> None:
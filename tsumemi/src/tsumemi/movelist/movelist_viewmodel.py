@@ -2,14 +2,15 @@ from __future__ import annotations
 
 from typing import TYPE_CHECKING
 
-from tsumemi.src.shogi.position import Position
-
 if TYPE_CHECKING:
     import tkinter as tk
     from tkinter import ttk
-    from typing import Optional
+    from typing import List, Optional, Tuple
+    from tsumemi.src.shogi.gametree import MoveNode
+    from tsumemi.src.shogi.position import Position
     from tsumemi.src.tsumemi.notation_writer import NotationWriter
     from tsumemi.src.tsumemi.game.game_model import GameModel
+    MovelistRow = Tuple[str, Tuple[str, str, str]]
 
 
 class MovelistViewModel:
@@ -19,24 +20,48 @@ class MovelistViewModel:
         self.notation_writer = notation_writer
         return
 
-    def populate_treeview(self, tvw: ttk.Treeview) -> None:
-        displayed_nodes = self.game.get_current_mainline()
-        sfen = self.game.get_initial_sfen()
-        if not sfen:
-            return
-        pos = Position()
-        pos.from_sfen(sfen)
-
-        for node in displayed_nodes:
-            move_num = node.movenum
-            move_str = self.notation_writer.write_node(node, pos)
-            pos.make_move(node.move)
+    def get_mainline_rows(self) -> List[MovelistRow]:
+        """Return the iid and column values of each row of the
+        movelist. Only moves not written before have their notation
+        worked out.
+        """
+        rows: List[MovelistRow] = []
+        if not self.game.get_initial_sfen():
+            return rows
+        # Only needed from the first move without cached notation
+        pos: Optional[Position] = None
+        for node in self.game.get_current_mainline():
+            move_str = self.notation_writer.get_cached_node(node)
+            if move_str is None:
+                if pos is None:
+                    pos = self._get_position_before(node)
+                move_str = self.notation_writer.write_node(node, pos)
+            if pos is not None:
+                pos.make_move(node.move)
             variation_indicator = "+" if len(node.parent.variations) > 1 else ""
-            tvw.insert(
-                "", "end", iid=str(node.id),
-                values=(str(move_num), move_str, variation_indicator)
-            )
-        return
+            rows.append((
+                str(node.id),
+                (str(node.movenum), move_str, variation_indicator),
+            ))
+        return rows
+
+    def _get_position_before(self, node: MoveNode) -> Position:
+        """Return a new position from just before the node's move,
+        reached from the current position of the game.
+        """
+        target = node if node.parent.is_null() else node.parent
+        path = list(target.get_path_from_root())
+        path_ids = {path_node.id: depth for depth, path_node in enumerate(path)}
+        pos = self.game.get_position().copy()
+        # Retract moves back to the closest common ancestor...
+        curr_node = self.game.game.curr_node
+        while curr_node.id not in path_ids:
+            pos.unmake_move(curr_node.move)
+            curr_node = curr_node.parent
+        # ...then play forward to the target
+        for path_node in path[path_ids[curr_node.id]+1:]:
+            pos.make_move(path_node.move)
+        return pos
 
     def populate_variation_treeview(self, tvw: ttk.Treeview) -> None:
         # Prints variations available for next move.
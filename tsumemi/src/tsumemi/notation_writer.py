@@ -2,29 +2,93 @@ from __future__ import annotations
 
 from typing import TYPE_CHECKING
 
+from tsumemi.src.shogi import rules
+from tsumemi.src.shogi.move import TerminationMove
+from tsumemi.src.shogi.position import Position
+
 if TYPE_CHECKING:
-    from typing import List
+    from typing import Dict, List, Optional, Tuple, Type
     from tsumemi.src.shogi.move import Move
     from tsumemi.src.shogi.game import Game
-    from tsumemi.src.shogi.gametree import MoveNode
+    from tsumemi.src.shogi.gametree import MoveNode, MoveNodeId
     from tsumemi.src.shogi.notation import AbstractMoveWriter
-    from tsumemi.src.shogi.position import Position
+    NotationKey = Tuple[MoveNodeId, Type[AbstractMoveWriter], bool]
+
+
+# Past this many entries, a cache is thrown away and rebuilt
+MAX_CACHED_NODES = 100_000
 
 
 class NotationWriter:
     """Provides a common interface for writing moves in shogi
     notation.
+
+    Notation is cached per node, move writer class and disambiguation
+    setting. A node's move and parent never change and node ids are
+    never reused, so entries cannot go stale as the movetree grows or
+    another game is loaded. The moves each move could be confused
+    with are also cached per node and shared by all move writers, so
+    switching writers does not redo the legality checks.
     """
     def __init__(self, move_writer: AbstractMoveWriter) -> None:
         self._move_writer: AbstractMoveWriter = move_writer
+        self._notation_cache: Dict[NotationKey, str] = {}
+        self._ambiguity_cache: Dict[MoveNodeId, List[Move]] = {}
         return
 
     def write_node(self, node: MoveNode, pos: Position) -> str:
-        return node.write_move(self._move_writer, pos)
+        """Return the notation of the node's move, made from `pos`.
+        """
+        key = self._get_key(node)
+        move_str = self._notation_cache.get(key)
+        if move_str is None:
+            move_str = node.write_move(
+                self._move_writer, pos, self._get_ambiguous_moves(node, pos)
+            )
+            if len(self._notation_cache) >= MAX_CACHED_NODES:
+                self._notation_cache = {}
+            self._notation_cache[key] = move_str
+        return move_str
+
+    def get_cached_node(self, node: MoveNode) -> Optional[str]:
+        """Return the notation of the node's move if already written,
+        so that callers can skip working out its position.
+        """
+        return self._notation_cache.get(self._get_key(node))
 
     def write_mainline(self, game: Game) -> List[str]:
-        return game.get_mainline_notation(self._move_writer)
+        """Return the notation of every move of the game's mainline.
+        """
+        pos = Position()
+        pos.from_sfen(game.movetree.start_pos)
+        res = []
+        nodes = game.movetree.traverse_mainline()
+        next(nodes) # exclude the root node
+        for node in nodes:
+            res.append(self.write_node(node, pos))
+            pos.make_move(node.move)
+        return res
 
     def change_move_writer(self, move_writer: AbstractMoveWriter) -> None:
         self._move_writer = move_writer
         return
+
+    def _get_key(self, node: MoveNode) -> NotationKey:
+        return (
+            node.id,
+            type(self._move_writer),
+            self._move_writer.aggressive_disambiguation,
+        )
+
+    def _get_ambiguous_moves(self, node: MoveNode, pos: Position
+        ) -> Optional[List[Move]]:
+        move = node.move
+        if move.is_null() or isinstance(move, TerminationMove):
+            return None
+        ambiguous_moves = self._ambiguity_cache.get(node.id)
+        if ambiguous_moves is None:
+            ambiguous_moves = rules.get_ambiguous_moves(pos, move)
+            if len(self._ambiguity_cache) >= MAX_CACHED_NODES:
+                self._ambiguity_cache = {}
+            self._ambiguity_cache[node.id] = ambiguous_moves
+        return ambiguous_moves
@@ -0,0 +1,270 @@
+from __future__ import annotations
+
+import os
+import sqlite3
+import time
+
+from typing import TYPE_CHECKING
+
+import tsumemi.src.tsumemi.event as evt
+import tsumemi.src.tsumemi.problem_list.problem_list_model as plist
+
+if TYPE_CHECKING:
+    from typing import Callable, Iterable, List, Optional, Tuple, Union
+    PathLike = Union[str, os.PathLike]
+    AttemptRow = Tuple[str, str, str, str, float, float]
+
+
+HISTORY_PATH = os.path.relpath(r"tsumemi/resources/history.sqlite3")
+SECONDS_PER_DAY = 86400
+
+# One row per attempt at a problem. Problems are identified by a hash
+# of their content (see ProblemIndex), so that the same problem in
+# different folders or files shares its history. `name` is only for
+# display; `source` is the folder or archive it was solved from.
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS attempts (
+    id INTEGER PRIMARY KEY,
+    problem_hash TEXT NOT NULL,
+    name TEXT NOT NULL,
+    source TEXT NOT NULL,
+    status TEXT NOT NULL,
+    seconds REAL NOT NULL,
+    attempted_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS attempts_problem_at
+    ON attempts (problem_hash, attempted_at);
+CREATE INDEX IF NOT EXISTS attempts_problem_seconds
+    ON attempts (problem_hash, seconds);
+CREATE INDEX IF NOT EXISTS attempts_source_at
+    ON attempts (source, attempted_at);
+CREATE INDEX IF NOT EXISTS attempts_source_seconds
+    ON attempts (source, seconds);
+CREATE INDEX IF NOT EXISTS attempts_at ON attempts (attempted_at);
+"""
+
+
+class ProblemHistory:
+    """Summary of all attempts at one problem.
+    """
+    def __init__(self,
+            num_attempts: int,
+            num_correct: int,
+            best_time: float,
+            median_time: float,
+            last_time: float,
+            last_status: plist.ProblemStatus,
+            last_attempted_at: float,
+        ) -> None:
+        self.num_attempts: int = num_attempts
+        self.num_correct: int = num_correct
+        self.best_time: float = best_time
+        self.median_time: float = median_time
+        self.last_time: float = last_time
+        self.last_status: plist.ProblemStatus = last_status
+        self.last_attempted_at: float = last_attempted_at
+        return
+
+    def get_accuracy(self) -> float:
+        return self.num_correct / self.num_attempts
+
+
+class AttemptHistory:
+    """Store of every attempt at every problem, kept in an SQLite
+    database. Per-problem queries and queries over a time range or for
+    the slowest attempts are answered from indexes, without scanning
+    the whole history.
+    """
+    def __init__(self, filepath: PathLike = HISTORY_PATH) -> None:
+        if filepath != ":memory:":
+            os.makedirs(os.path.dirname(filepath) or ".", exist_ok=True)
+        self.connection = sqlite3.connect(filepath)
+        # One attempt is written every few seconds at most; WAL mode
+        # keeps each write cheap and safe
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("PRAGMA synchronous=NORMAL")
+        self.connection.executescript(_SCHEMA)
+        return
+
+    def close(self) -> None:
+        self.connection.close()
+        return
+
+    def add_attempt(self,
+            problem_hash: str,
+            status: plist.ProblemStatus,
+            seconds: float,
+            name: str = "",
+            source: str = "",
+            attempted_at: Optional[float] = None,
+        ) -> None:
+        self.add_attempts([(
+            problem_hash, name, source, status.name, seconds,
+            time.time() if attempted_at is None else attempted_at,
+        )])
+        return
+
+    def add_attempts(self, rows: Iterable[AttemptRow]) -> None:
+        """Add many attempts in one transaction. Each row is (problem
+        hash, name, source, status name, seconds, Unix timestamp).
+        """
+        with self.connection:
+            self.connection.executemany(
+                "INSERT INTO attempts (problem_hash, name, source, status,"
+                " seconds, attempted_at) VALUES (?, ?, ?, ?, ?, ?)",
+                rows,
+            )
+        return
+
+    def get_num_attempts(self, source: Optional[str] = None) -> int:
+        if source is None:
+            query = "SELECT COUNT(*) FROM attempts"
+            params: Tuple[str, ...] = ()
+        else:
+            query = "SELECT COUNT(*) FROM attempts WHERE source = ?"
+            params = (source,)
+        num_attempts: int = self.connection.execute(query, params).fetchone()[0]
+        return num_attempts
+
+    def get_problem_history(self, problem_hash: str
+        ) -> Optional[ProblemHistory]:
+        """Return the summary of all attempts at the problem, or None
+        if it was never attempted.
+        """
+        num_attempts, num_correct, best_time = self.connection.execute(
+            "SELECT COUNT(*), TOTAL(status = 'CORRECT'), MIN(seconds)"
+            " FROM attempts WHERE problem_hash = ?",
+            (problem_hash,),
+        ).fetchone()
+        if num_attempts == 0:
+            return None
+        # The middle one or two times, read off the index
+        middle = self.connection.execute(
+            "SELECT seconds FROM attempts WHERE problem_hash = ?"
+            " ORDER BY seconds LIMIT ? OFFSET ?",
+            (problem_hash, 2 - num_attempts % 2, (num_attempts - 1) // 2),
+        ).fetchall()
+        last_time, last_status, last_attempted_at = self.connection.execute(
+            "SELECT seconds, status, attempted_at FROM attempts"
+            " WHERE problem_hash = ? ORDER BY attempted_at DESC, id DESC"
+            " LIMIT 1",
+            (problem_hash,),
+        ).fetchone()
+        return ProblemHistory(
+            num_attempts=num_attempts,
+            num_correct=int(num_correct),
+            best_time=best_time,
+            median_time=sum(row[0] for row in middle) / len(middle),
+            last_time=last_time,
+            last_status=plist.ProblemStatus[last_status],
+            last_attempted_at=last_attempted_at,
+        )
+
+    def get_accuracy_trend(self,
+            since: float,
+            period: float = SECONDS_PER_DAY,
+            source: Optional[str] = None,
+        ) -> List[Tuple[float, int, int]]:
+        """Return the number of attempts and of correct ones in each
+        period (of `period` seconds, counted from `since`) with any
+        attempts, as (period start, attempts, correct) in time order.
+        """
+        query = (
+            "SELECT CAST((attempted_at - ?) / ? AS INTEGER) AS bucket,"
+            " COUNT(*), TOTAL(status = 'CORRECT') FROM attempts"
+            " WHERE attempted_at >= ?"
+        )
+        params: Tuple[Union[str, float], ...] = (since, period, since)
+        if source is not None:
+            query += " AND source = ?"
+            params += (source,)
+        query += " GROUP BY bucket ORDER BY bucket"
+        return [
+            (since + bucket*period, num_attempts, int(num_correct))
+            for bucket, num_attempts, num_correct
+            in self.connection.execute(query, params)
+        ]
+
+    def get_slowest_attempts(self,
+            num: int, source: Optional[str] = None
+        ) -> List[Tuple[str, str, float, plist.ProblemStatus]]:
+        """Return the `num` slowest attempts, slowest first, as
+        (problem hash, name, seconds, status).
+        """
+        query = "SELECT problem_hash, name, seconds, status FROM attempts"
+        params: Tuple[Union[str, int], ...] = ()
+        if source is not None:
+            query += " WHERE source = ?"
+            params += (source,)
+        query += " ORDER BY seconds DESC LIMIT ?"
+        params += (num,)
+        return [
+            (problem_hash, name, seconds, plist.ProblemStatus[status])
+            for problem_hash, name, seconds, status
+            in self.connection.execute(query, params)
+        ]
+
+
+class AttemptRecorder(evt.IObserver):
+    """Adds an attempt to the history whenever the current problem of
+    a problem list gets both a status and a time. In speedruns the
+    status may come before or after the time of the same attempt.
+    """
+    def __init__(self,
+            history: AttemptHistory,
+            problem_list: plist.ProblemList,
+            get_problem_hash: Callable[[plist.Problem], Optional[str]],
+            source: PathLike,
+        ) -> None:
+        evt.IObserver.__init__(self)
+        self.history: AttemptHistory = history
+        self.problem_list: plist.ProblemList = problem_list
+        self.get_problem_hash: Callable[[plist.Problem], Optional[str]] = (
+            get_problem_hash
+        )
+        self.source: str = os.path.normpath(source)
+        self._pending_status: Optional[plist.ProblemStatus] = None
+        self._pending_time: Optional[float] = None
+        self.set_callbacks({
+            plist.ProbSelectedEvent: self._on_selected,
+            plist.ProbStatusEvent: self._on_status,
+            plist.ProbTimeEvent: self._on_time,
+        })
+        problem_list.add_observer(self)
+        return
+
+    def close(self) -> None:
+        self.problem_list.remove_observer(self)
+        return
+
+    def _on_selected(self, _event: plist.ProbSelectedEvent) -> None:
+        self._pending_status = None
+        self._pending_time = None
+        return
+
+    def _on_status(self, event: plist.ProbStatusEvent) -> None:
+        if event.status == plist.ProblemStatus.NONE:
+            return
+        self._pending_status = event.status
+        self._add_if_complete(event.idx)
+        return
+
+    def _on_time(self, event: plist.ProbTimeEvent) -> None:
+        self._pending_time = event.time.seconds
+        self._add_if_complete(event.idx)
+        return
+
+    def _add_if_complete(self, idx: int) -> None:
+        if self._pending_status is None or self._pending_time is None:
+            return
+        prob = self.problem_list.problems[idx]
+        problem_hash = self.get_problem_hash(prob)
+        if problem_hash is not None:
+            self.history.add_attempt(
+                problem_hash, self._pending_status, self._pending_time,
+                name=os.path.relpath(prob.filepath, self.source),
+                source=self.source,
+            )
+        self._pending_status = None
+        self._pending_time = None
+        return
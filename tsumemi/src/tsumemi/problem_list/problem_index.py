@@ -0,0 +1,148 @@
+from __future__ import annotations
+
+import hashlib
+import re
+
+from typing import TYPE_CHECKING
+
+from tsumemi.src.shogi.position import Position
+
+if TYPE_CHECKING:
+    from typing import Callable, Dict, Iterable, List, Optional, Tuple
+    from tsumemi.src.tsumemi.problem_list.problem_list_model import Problem
+
+
+_SFEN_ROW_TOKEN_REGEX: re.Pattern[str] = re.compile(r"\+?[a-zA-Z]|\d")
+
+
+def normalise_sfen(sfen: str) -> str:
+    """Return the board, side to move and hands of an SFEN in canonical
+    form, dropping the move number.
+    """
+    pos = Position()
+    pos.from_sfen(sfen)
+    board, turn, hands, _ = pos.to_sfen().split(" ")
+    return " ".join((board, turn, hands))
+
+
+def mirror_sfen_board(sfen_board: str) -> str:
+    """Mirror the board part of an SFEN left to right.
+    """
+    return "/".join(
+        _mirror_sfen_row(row) for row in sfen_board.split("/")
+    )
+
+
+def _mirror_sfen_row(sfen_row: str) -> str:
+    cells: List[str] = []
+    for token in _SFEN_ROW_TOKEN_REGEX.findall(sfen_row):
+        if token.isdigit():
+            cells.extend("1" * int(token))
+        else:
+            cells.append(token)
+    res: List[str] = []
+    num_empty = 0
+    for cell in reversed(cells):
+        if cell == "1":
+            num_empty += 1
+            continue
+        if num_empty:
+            res.append(str(num_empty))
+            num_empty = 0
+        res.append(cell)
+    if num_empty:
+        res.append(str(num_empty))
+    return "".join(res)
+
+
+def position_key(sfen: str, mirror: bool = False) -> str:
+    """Return a hash identifying a start position by its board, side to
+    move and hands. If `mirror`, a position and its left-right mirror
+    image get the same key.
+    """
+    normalised = normalise_sfen(sfen)
+    if mirror:
+        board, rest = normalised.split(" ", 1)
+        mirrored = " ".join((mirror_sfen_board(board), rest))
+        normalised = min(normalised, mirrored)
+    return hashlib.blake2b(
+        normalised.encode("utf-8"), digest_size=16
+    ).hexdigest()
+
+
+class ProblemIndex:
+    """Index of problems by their normalised start position. Problems
+    are not hashable, so they are tracked by identity.
+    """
+    def __init__(self, mirror: bool = False) -> None:
+        self.mirror: bool = mirror
+        self._problems_by_key: Dict[str, List[Problem]] = {}
+        self._keys_by_id: Dict[int, Tuple[Problem, str]] = {}
+        return
+
+    def __len__(self) -> int:
+        return len(self._keys_by_id)
+
+    def __contains__(self, prob: Problem) -> bool:
+        return id(prob) in self._keys_by_id
+
+    def clear(self) -> None:
+        self._problems_by_key = {}
+        self._keys_by_id = {}
+        return
+
+    def build(self,
+            problems: Iterable[Problem],
+            read_start_sfen: Callable[[Problem], Optional[str]],
+        ) -> None:
+        """Index all given problems that are not indexed yet, reading
+        their start positions with `read_start_sfen`. Problems for
+        which it returns None are left out.
+        """
+        for prob in problems:
+            if prob in self:
+                continue
+            sfen = read_start_sfen(prob)
+            if sfen is not None:
+                self.add(prob, sfen)
+        return
+
+    def add(self, prob: Problem, start_sfen: str) -> str:
+        """Index the problem under the given start position, replacing
+        any previous entry for it. Returns the key.
+        """
+        self.remove(prob)
+        key = position_key(start_sfen, self.mirror)
+        self._problems_by_key.setdefault(key, []).append(prob)
+        self._keys_by_id[id(prob)] = (prob, key)
+        return key
+
+    def remove(self, prob: Problem) -> None:
+        entry = self._keys_by_id.pop(id(prob), None)
+        if entry is None:
+            return
+        key = entry[1]
+        problems = self._problems_by_key[key]
+        problems[:] = [other for other in problems if other is not prob]
+        if not problems:
+            del self._problems_by_key[key]
+        return
+
+    def get_key(self, prob: Problem) -> Optional[str]:
+        entry = self._keys_by_id.get(id(prob))
+        return None if entry is None else entry[1]
+
+    def lookup_by_position(self, sfen: str) -> List[Problem]:
+        """Return all indexed problems starting from the position.
+        """
+        key = position_key(sfen, self.mirror)
+        return list(self._problems_by_key.get(key, []))
+
+    def find_duplicates(self) -> List[List[Problem]]:
+        """Return groups of problems sharing a start position, each in
+        the order the problems were indexed.
+        """
+        return [
+            list(problems) for problems in self._problems_by_key.values()
+            if len(problems) > 1
+        ]
@@ -1,19 +1,35 @@
 from __future__ import annotations
 
 import csv
+import datetime
+import io
 import os
 
 from typing import TYPE_CHECKING
 
 import tsumemi.src.tsumemi.problem_list.problem_list_model as plist
 
+from tsumemi.src.shogi.parsing import kif
+from tsumemi.src.shogi.parsing.kif_reader import KifReader
+from tsumemi.src.tsumemi import analytics
+from tsumemi.src.tsumemi.problem_list.history import (
+    SECONDS_PER_DAY, AttemptRecorder,
+)
+from tsumemi.src.tsumemi.problem_list.problem_index import ProblemIndex
 from tsumemi.src.tsumemi.problem_list.problem_list_view import ProblemListPane
 from tsumemi.src.tsumemi.problem_list.problem_list_viewmodel import ProblemListViewModel
+from tsumemi.src.tsumemi.problem_list.session_log import (
+    SESSION_LOG_DIR, SessionLog, get_session_log_path, read_session_log,
+    restore_session,
+)
 
 if TYPE_CHECKING:
     import tkinter as tk
-    from typing import Iterable, Optional, Union
+    from typing import Dict, Iterable, List, Optional, Tuple, Union
     import tsumemi.src.tsumemi.timer as timer
+    from tsumemi.src.shogi.game import Game
+    from tsumemi.src.tsumemi.kif_archive import KifArchive
+    from tsumemi.src.tsumemi.problem_list.history import AttemptHistory
     PathLike = Union[str, os.PathLike]
 
 
@@ -24,7 +40,15 @@ class ProblemListController:
     def __init__(self) -> None:
         self.problem_list: plist.ProblemList = plist.ProblemList()
         self.directory: Optional[PathLike] = None
+        self.archive: Optional[KifArchive] = None
+        self.problem_index: ProblemIndex = ProblemIndex()
         self.viewmodel = ProblemListViewModel(self.problem_list)
+        self.session_log: Optional[SessionLog] = None
+        self.history: Optional[AttemptHistory] = None
+        self.attempt_recorder: Optional[AttemptRecorder] = None
+        # Mate length of each problem read so far, by id(), so that
+        # analysis need not read every problem again
+        self._mate_lengths: Dict[int, int] = {}
         return
 
     def go_next_problem(self) -> Optional[plist.Problem]:
@@ -46,10 +70,14 @@ class ProblemListController:
 
     def clear_statuses(self) -> None:
         self.problem_list.clear_statuses()
+        if self.session_log is not None:
+            self.session_log.log_clear(statuses=True, times=False)
         return
 
     def clear_times(self) -> None:
         self.problem_list.clear_times()
+        if self.session_log is not None:
+            self.session_log.log_clear(statuses=False, times=True)
         return
 
     def make_problem_list_pane(self, parent: tk.Widget) -> ProblemListPane:
@@ -63,18 +91,178 @@ class ProblemListController:
         ) -> Optional[plist.Problem]:
         """Open directory and set own problem list to contents.
         """
-        self.problem_list.clear(suppress=True)
-        self.problem_list.add_problems(
-            (plist.Problem(filepath) for filepath in file_list),
-            suppress=True
+        return self._set_problems(
+            directory, (plist.Problem(filepath) for filepath in file_list)
+        )
+
+    def set_archive(self, archive: KifArchive) -> Optional[plist.Problem]:
+        """Set own problem list to the games inside a KIF archive. The
+        archive is kept open until another source is set.
+        """
+        problems = (
+            plist.ArchivedProblem(
+                os.path.join(archive.filepath, entry.name), archive, idx
+            )
+            for idx, entry in enumerate(archive.entries)
+        )
+        prob = self._set_problems(archive.filepath, problems)
+        self.archive = archive
+        return prob
+
+    def get_session_log_path(self,
+            log_dir: PathLike = SESSION_LOG_DIR
+        ) -> Optional[str]:
+        """Return the path of the session log of the current folder or
+        archive, or None if there is none open.
+        """
+        if self.directory is None:
+            return None
+        return get_session_log_path(self.directory, log_dir)
+
+    def open_session_log(self,
+            restore: bool, log_dir: PathLike = SESSION_LOG_DIR
+        ) -> int:
+        """Log results to the session log of the current folder or
+        archive from now on. If `restore`, first set the problems'
+        results to those in the log; otherwise start the log afresh.
+        Returns the number of log records restored.
+        """
+        self.close_session_log()
+        log_path = self.get_session_log_path(log_dir)
+        if log_path is None:
+            return 0
+        assert self.directory is not None # for mypy
+        num_restored = 0
+        if restore and os.path.isfile(log_path):
+            num_restored = restore_session(
+                self.problem_list, read_session_log(log_path), self.directory
+            )
+        self.session_log = SessionLog(
+            log_path, self.problem_list, self.directory
         )
+        if not restore:
+            self.session_log.log_clear(statuses=True, times=True)
+        return num_restored
+
+    def close_session_log(self) -> None:
+        if self.session_log is not None:
+            self.session_log.close()
+            self.session_log = None
+        return
+
+    def set_history(self, history: Optional[AttemptHistory]) -> None:
+        """Record every attempt at the problems in the given history
+        from now on, or stop recording if None.
+        """
+        if self.attempt_recorder is not None:
+            self.attempt_recorder.close()
+            self.attempt_recorder = None
+        self.history = history
+        if history is not None and self.directory is not None:
+            self.attempt_recorder = AttemptRecorder(
+                history, self.problem_list, self.problem_index.get_key,
+                self.directory,
+            )
+        return
+
+    def _set_problems(self,
+            directory: PathLike, problems: Iterable[plist.Problem]
+        ) -> Optional[plist.Problem]:
+        self.close_session_log()
+        self.problem_list.clear(suppress=True)
+        self.problem_index.clear()
+        self._mate_lengths.clear()
+        if self.archive is not None:
+            self.archive.close()
+            self.archive = None
+        self.problem_list.add_problems(problems, suppress=True)
         self.problem_list.sort_by_file()
         self.directory = directory
+        self.set_history(self.history)
         return self.go_to_problem(0)
 
+    def read_problem(self, prob: plist.Problem) -> Optional[Game]:
+        """Read the game of the given problem from wherever it is
+        stored, indexing its start position along the way.
+        """
+        game: Optional[Game]
+        if isinstance(prob, plist.ArchivedProblem):
+            game = prob.archive.read_game(prob.archive_idx)
+        else:
+            game = kif.read_kif(prob.filepath)
+        if game is not None:
+            self._mate_lengths[id(prob)] = analytics.get_mate_length(game)
+        if (game is not None and game.movetree.start_pos
+                and prob not in self.problem_index):
+            self.problem_index.add(prob, game.movetree.start_pos)
+        return game
+
+    def build_problem_index(self) -> ProblemIndex:
+        """Index the start positions of all problems in the list.
+        Problems that cannot be read are left out.
+        """
+        self.problem_index.build(self.problem_list, self._read_start_sfen)
+        return self.problem_index
+
+    def remove_duplicates(self) -> int:
+        """Remove all but the first of each group of problems with the
+        same start position. Returns the number of problems removed.
+        """
+        self.build_problem_index()
+        duplicates = [
+            prob for group in self.problem_index.find_duplicates()
+            for prob in group[1:]
+        ]
+        if not duplicates:
+            return 0
+        for prob in duplicates:
+            self.problem_index.remove(prob)
+            self._mate_lengths.pop(id(prob), None)
+        self.problem_list.remove_problems(duplicates)
+        return len(duplicates)
+
+    def _read_start_sfen(self, prob: plist.Problem) -> Optional[str]:
+        game = self._read_game_tolerant(prob)
+        if game is None or not game.movetree.start_pos:
+            return None
+        return game.movetree.start_pos
+
+    def _read_game_tolerant(self, prob: plist.Problem) -> Optional[Game]:
+        # Uses its own reader, as kif.read_kif() reuses the game that
+        # may currently be on display.
+        try:
+            if isinstance(prob, plist.ArchivedProblem):
+                text: Optional[str] = prob.archive.read_text(prob.archive_idx)
+            else:
+                with open(prob.filepath, "rb") as kif_file:
+                    text = kif.decode_kif_bytes(kif_file.read())
+        except (OSError, ValueError):
+            return None
+        if text is None:
+            return None
+        reader = KifReader(tolerant=True)
+        game = reader.read(io.StringIO(text), kif.GAME_BUILDER_PVIS)
+        self._mate_lengths[id(prob)] = analytics.get_mate_length(game)
+        return game
+
+    def get_session_data(self) -> analytics.SessionData:
+        """Return the results of the problems for analysis. Problems
+        not read before are read for their mate length.
+        """
+        mate_lengths = []
+        for prob in self.problem_list:
+            if (id(prob) not in self._mate_lengths
+                    and self._read_game_tolerant(prob) is None):
+                mate_lengths.append(analytics.UNKNOWN_MATE_LENGTH)
+            else:
+                mate_lengths.append(self._mate_lengths[id(prob)])
+        return analytics.SessionData.from_problem_list(self.problem_list,
+            self.directory if self.directory else "", mate_lengths
+        )
+
     def generate_statistics(self) -> ProblemListStats:
         return ProblemListStats(self.problem_list,
-            self.directory if self.directory else ""
+            self.directory if self.directory else "", self.history
         )
 
     def export_as_csv(self, filepath: PathLike) -> None:
@@ -97,39 +285,66 @@ class ProblemListStats:
     """
     def __init__(self,
             problem_list: plist.ProblemList,
-            directory: PathLike = ""
+            directory: PathLike = "",
+            history: Optional[AttemptHistory] = None,
         ) -> None:
         self.problem_list: plist.ProblemList = problem_list
         self.directory: str = str(os.path.basename(os.path.normpath(directory)))
+        # Attempts from earlier sessions, recorded under the folder's
+        # full path
+        self.history: Optional[AttemptHistory] = history
+        self.source: str = os.path.normpath(directory) if directory else ""
         return
 
     def get_num_total(self) -> int:
         return len(self.problem_list)
 
     def get_num_correct(self) -> int:
-        return len(
-            self.problem_list.filter_by_status(plist.ProblemStatus.CORRECT)
+        return self.problem_list.get_num_with_status(
+            plist.ProblemStatus.CORRECT
         )
 
     def get_num_wrong(self) -> int:
-        return len(
-            self.problem_list.filter_by_status(plist.ProblemStatus.WRONG)
-        )
+        return self.problem_list.get_num_with_status(plist.ProblemStatus.WRONG)
 
     def get_num_skip(self) -> int:
-        return len(
-            self.problem_list.filter_by_status(plist.ProblemStatus.SKIP)
-        )
+        return self.problem_list.get_num_with_status(plist.ProblemStatus.SKIP)
 
     def get_total_time(self) -> timer.Time:
-        seen_problems = self.problem_list.filter_by_status(
+        return self.problem_list.get_total_time(
             plist.ProblemStatus.CORRECT, plist.ProblemStatus.WRONG,
             plist.ProblemStatus.SKIP
         )
-        return seen_problems.get_total_time()
 
     def get_fastest_problem(self) -> Optional[plist.Problem]:
         return self.problem_list.get_fastest_problem()
 
     def get_slowest_problem(self) -> Optional[plist.Problem]:
         return self.problem_list.get_slowest_problem()
+
+    #=== Queries on the history of earlier sessions
+    def get_num_past_attempts(self) -> int:
+        if self.history is None or not self.source:
+            return 0
+        return self.history.get_num_attempts(self.source)
+
+    def get_accuracy_trend(self, num_days: int = 7
+        ) -> List[Tuple[float, int, int]]:
+        """Return (day start, attempts, correct) for each of the last
+        `num_days` days with attempts at problems in this folder.
+        """
+        if self.history is None or not self.source:
+            return []
+        today = datetime.datetime.combine(
+            datetime.date.today(), datetime.time()
+        )
+        since = today.timestamp() - (num_days-1)*SECONDS_PER_DAY
+        return self.history.get_accuracy_trend(
+            since, SECONDS_PER_DAY, self.source
+        )
+
+    def get_slowest_attempts(self, num: int = 5
+        ) -> List[Tuple[str, str, float, plist.ProblemStatus]]:
+        if self.history is None or not self.source:
+            return []
+        return self.history.get_slowest_attempts(num, self.source)
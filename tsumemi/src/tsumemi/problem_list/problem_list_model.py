@@ -1,6 +1,7 @@
 from __future__ import annotations
 
-import operator
+import heapq
+import itertools
 import random
 import re
 
@@ -13,8 +14,13 @@ from tsumemi.src.tsumemi import timer
 
 if TYPE_CHECKING:
     import os
-    from typing import Any, Callable, Iterable, Iterator, List, Optional, Union
+    from typing import (
+        Any, Callable, Dict, Hashable, Iterable, Iterator, List, Optional,
+        Tuple, Union,
+    )
+    from tsumemi.src.tsumemi.kif_archive import KifArchive
     PathLike = Union[str, os.PathLike]
+    HeapEntry = Tuple[int, int, "Problem"]
 
 
 class ProblemStatus(Enum):
@@ -49,6 +55,10 @@ class ProbStatusEvent(evt.Event):
         self.status = status
         return
 
+    def get_coalesce_key(self) -> Hashable:
+        # One per problem
+        return (type(self), self.idx)
+
 
 class ProbTimeEvent(evt.Event):
     def __init__(self, prob_idx: int, time: timer.Time) -> None:
@@ -57,6 +67,10 @@ class ProbTimeEvent(evt.Event):
         self.time = time
         return
 
+    def get_coalesce_key(self) -> Hashable:
+        # One per problem
+        return (type(self), self.idx)
+
 
 class Problem:
     """Data class representing one tsume problem.
@@ -72,6 +86,24 @@ class Problem:
         return isinstance(obj, Problem) and self.filepath == obj.filepath
 
 
+class ArchivedProblem(Problem):
+    """A tsume problem stored as an entry of a KIF archive instead of
+    in its own file. The filepath is only used for display and
+    sorting; the game is read through the archive index.
+    """
+    def __init__(self,
+            filepath: PathLike, archive: KifArchive, archive_idx: int
+        ) -> None:
+        Problem.__init__(self, filepath)
+        self.archive: KifArchive = archive
+        self.archive_idx: int = archive_idx
+        return
+
+
+def _to_ns(time: timer.Time) -> int:
+    return round(float(time) * 1e9)
+
+
 class ProblemList(evt.Emitter):
     """Represent a sortable list of problems with a "pointer" to the
     current active problem. Also stores metadata about problem like
@@ -93,6 +125,20 @@ class ProblemList(evt.Emitter):
         self.problems: List[Problem] = [] if problems is None else problems
         self.curr_prob: Optional[Problem] = None
         self.curr_prob_idx: Optional[int] = None
+        # Running aggregates, kept up to date by every method changing
+        # problems, statuses or times so that statistics need no scan
+        self._status_counts: Dict[ProblemStatus, int] = {}
+        # Total time per status, in integer nanoseconds so that adding
+        # and removing times never drifts
+        self._status_times_ns: Dict[ProblemStatus, int] = {}
+        # Min- and max-heaps of problem times with lazy deletion: an
+        # entry (time in ns, sequence number, problem) is only valid
+        # while it is the latest entry pushed for that problem
+        self._min_times: List[HeapEntry] = []
+        self._max_times: List[HeapEntry] = []
+        self._time_seqs: Dict[int, int] = {}
+        self._seq_counter: Iterator[int] = itertools.count()
+        self._rebuild_aggregates()
         return
 
     def __iter__(self) -> Iterator[Problem]:
@@ -101,10 +147,71 @@ class ProblemList(evt.Emitter):
     def __len__(self) -> int:
         return len(self.problems)
 
+    #=== Running aggregates
+    def _rebuild_aggregates(self) -> None:
+        self._status_counts = dict.fromkeys(ProblemStatus, 0)
+        self._status_times_ns = dict.fromkeys(ProblemStatus, 0)
+        self._time_seqs = {}
+        self._min_times = []
+        self._max_times = []
+        for prob in self.problems:
+            self._count_problem(prob, 1)
+            if prob.time is not None:
+                seq = next(self._seq_counter)
+                self._time_seqs[id(prob)] = seq
+                time_ns = _to_ns(prob.time)
+                self._min_times.append((time_ns, seq, prob))
+                self._max_times.append((-time_ns, seq, prob))
+        heapq.heapify(self._min_times)
+        heapq.heapify(self._max_times)
+        return
+
+    def _count_problem(self, prob: Problem, sign: int) -> None:
+        # Add (sign 1) or remove (sign -1) the problem's status and time
+        # to or from the per-status aggregates
+        self._status_counts[prob.status] += sign
+        if prob.time is not None:
+            self._status_times_ns[prob.status] += sign * _to_ns(prob.time)
+        return
+
+    def _track_time(self, prob: Problem) -> None:
+        if prob.time is None:
+            self._time_seqs.pop(id(prob), None)
+            return
+        seq = next(self._seq_counter)
+        self._time_seqs[id(prob)] = seq
+        time_ns = _to_ns(prob.time)
+        heapq.heappush(self._min_times, (time_ns, seq, prob))
+        heapq.heappush(self._max_times, (-time_ns, seq, prob))
+        # Keep stale entries from piling up when times are reset often
+        if len(self._min_times) > 2 * len(self._time_seqs) + 64:
+            self._compact_time_heaps()
+        return
+
+    def _compact_time_heaps(self) -> None:
+        self._min_times = [
+            entry for entry in self._min_times if self._is_valid(entry)
+        ]
+        self._max_times = [
+            entry for entry in self._max_times if self._is_valid(entry)
+        ]
+        heapq.heapify(self._min_times)
+        heapq.heapify(self._max_times)
+        return
+
+    def _is_valid(self, entry: HeapEntry) -> bool:
+        return self._time_seqs.get(id(entry[2])) == entry[1]
+
+    def _peek_time_heap(self, heap: List[HeapEntry]) -> Optional[Problem]:
+        while heap and not self._is_valid(heap[0]):
+            heapq.heappop(heap)
+        return heap[0][2] if heap else None
+
     def clear(self, suppress: bool = False) -> None:
         self.problems = []
         self.curr_prob = None
         self.curr_prob_idx = None
+        self._rebuild_aggregates()
         if not suppress:
             self._notify_observers(ProbListEvent(self))
         return
@@ -112,6 +219,11 @@ class ProblemList(evt.Emitter):
     def clear_statuses(self, suppress: bool = False) -> None:
         for prob in self.problems:
             prob.status = ProblemStatus.NONE
+        self._status_counts = dict.fromkeys(ProblemStatus, 0)
+        self._status_counts[ProblemStatus.NONE] = len(self.problems)
+        total_time_ns = sum(self._status_times_ns.values())
+        self._status_times_ns = dict.fromkeys(ProblemStatus, 0)
+        self._status_times_ns[ProblemStatus.NONE] = total_time_ns
         if not suppress:
             self._notify_observers(ProbListEvent(self))
         return
@@ -119,6 +231,10 @@ class ProblemList(evt.Emitter):
     def clear_times(self, suppress: bool = False) -> None:
         for prob in self.problems:
             prob.time = None
+        self._status_times_ns = dict.fromkeys(ProblemStatus, 0)
+        self._time_seqs = {}
+        self._min_times = []
+        self._max_times = []
         if not suppress:
             self._notify_observers(ProbListEvent(self))
         return
@@ -131,6 +247,8 @@ class ProblemList(evt.Emitter):
             suppress: bool = False
         ) -> None:
         self.problems.append(new_problem)
+        self._count_problem(new_problem, 1)
+        self._track_time(new_problem)
         if not suppress:
             self._notify_observers(ProbListEvent(self))
         return
@@ -139,7 +257,37 @@ class ProblemList(evt.Emitter):
             new_problems: Iterable[Problem],
             suppress: bool = False
         ) -> None:
+        num_old = len(self.problems)
         self.problems.extend(new_problems)
+        for prob in self.problems[num_old:]:
+            self._count_problem(prob, 1)
+            self._track_time(prob)
+        if not suppress:
+            self._notify_observers(ProbListEvent(self))
+        return
+
+    def remove_problems(self,
+            to_remove: Iterable[Problem],
+            suppress: bool = False
+        ) -> None:
+        """Remove the given problems (by identity), keeping focus on
+        the current problem if it is not removed.
+        """
+        remove_ids = {id(prob) for prob in to_remove}
+        old_prob = self.curr_prob
+        kept = []
+        for prob in self.problems:
+            if id(prob) in remove_ids:
+                self._count_problem(prob, -1)
+                self._time_seqs.pop(id(prob), None)
+            else:
+                kept.append(prob)
+        self.problems = kept
+        if old_prob is not None and id(old_prob) in remove_ids:
+            self.curr_prob = None
+            self.curr_prob_idx = None
+        else:
+            self._set_active_problem(old_prob)
         if not suppress:
             self._notify_observers(ProbListEvent(self))
         return
@@ -156,41 +304,63 @@ class ProblemList(evt.Emitter):
             prob for prob in self.problems if (prob.status in args)
         ])
 
-    def get_total_time(self) -> timer.Time:
-        return sum(
-            (prob.time for prob in self.problems if prob.time is not None),
-            start=timer.Time(0)
+    def get_num_with_status(self, *statuses: ProblemStatus) -> int:
+        return sum(self._status_counts[status] for status in statuses)
+
+    def get_total_time(self, *statuses: ProblemStatus) -> timer.Time:
+        """Return the total time of the problems with any of the given
+        statuses, or of all problems if none are given.
+        """
+        if not statuses:
+            statuses = tuple(ProblemStatus)
+        return timer.Time(
+            sum(self._status_times_ns[status] for status in statuses) / 1e9
         )
 
     def get_slowest_problem(self) -> Optional[Problem]:
-        return max(
-            (prob for prob in self.problems if prob.time is not None),
-            key=operator.attrgetter("time"),
-            default=None,
-        )
+        return self._peek_time_heap(self._max_times)
 
     def get_fastest_problem(self) -> Optional[Problem]:
-        return min(
-            (prob for prob in self.problems if prob.time is not None),
-            key=operator.attrgetter("time"),
-            default=None,
-        )
+        return self._peek_time_heap(self._min_times)
 
     #=== Setting methods
     def set_status(self, status: ProblemStatus) -> None:
         if self.curr_prob is not None:
             assert self.curr_prob_idx is not None # for mypy
+            self._count_problem(self.curr_prob, -1)
             self.curr_prob.status = status
+            self._count_problem(self.curr_prob, 1)
             self._notify_observers(ProbStatusEvent(self.curr_prob_idx, status))
         return
 
     def set_time(self, time: timer.Time) -> None:
         if self.curr_prob is not None:
             assert self.curr_prob_idx is not None # for mypy
+            self._count_problem(self.curr_prob, -1)
             self.curr_prob.time = time
+            self._count_problem(self.curr_prob, 1)
+            self._track_time(self.curr_prob)
             self._notify_observers(ProbTimeEvent(self.curr_prob_idx, time))
         return
 
+    def set_results(self,
+            results: Iterable[
+                Tuple[Problem, ProblemStatus, Optional[timer.Time]]
+            ],
+            suppress: bool = False,
+        ) -> None:
+        """Set the status and time of many problems at once.
+        """
+        for prob, status, time in results:
+            self._count_problem(prob, -1)
+            prob.status = status
+            prob.time = time
+            self._count_problem(prob, 1)
+            self._track_time(prob)
+        if not suppress:
+            self._notify_observers(ProbListEvent(self))
+        return
+
     #=== Navigation methods
     def go_to_idx(self, idx: int) -> Optional[Problem]:
         """Go to the problem at the given index and return it.
@@ -12,13 +12,20 @@ import tsumemi.src.tsumemi.problem_list.problem_list_model as plist
 from tsumemi.src.tsumemi import utils
 
 if TYPE_CHECKING:
-    from typing import Dict, Optional
+    from typing import Dict, List, Optional, Tuple
     from tsumemi.src.tsumemi.problem_list.problem_list_viewmodel import ProblemListViewModel
 
 
+# Row height to assume until a row has been drawn and can be measured
+DEFAULT_ROW_HEIGHT = 20
+
+
 class ProblemsTreeviewFrame(utils.ScrollableTreeviewFrame, evt.IObserver):
     """GUI class to display list of problems.
     Observes underlying problem list and updates its view as needed.
+    Only the rows on screen exist in the treeview; scrolling fills
+    them in from the problem list, so the cost of redrawing does not
+    grow with the length of the list.
     """
     def __init__(self,
             parent: tk.Widget,
@@ -35,6 +42,11 @@ class ProblemsTreeviewFrame(utils.ScrollableTreeviewFrame, evt.IObserver):
             plist.ProbTimeEvent: self.display_time,
             plist.ProbListEvent: self.refresh_view,
         })
+        self.window = utils.RowWindow()
+        # The treeview does not scroll itself; the scrollbar moves the
+        # window over the problem list instead
+        self.tvw["yscrollcommand"] = ""
+        self.vsb.configure(command=self._on_scrollbar)
 
         self.status_strings: Dict[plist.ProblemStatus, str] = {
             plist.ProblemStatus.NONE: "",
@@ -54,6 +66,8 @@ class ProblemsTreeviewFrame(utils.ScrollableTreeviewFrame, evt.IObserver):
         self.tvw.tag_configure("SKIP", background="snow2")
         self.tvw.tag_configure("CORRECT", background="PaleGreen1")
         self.tvw.tag_configure("WRONG", background="LightPink1")
+        self.tvw.bind("<Configure>", self._on_configure)
+        self._bind_mousewheel()
         self._bind_double_click()
         self._bind_heading_commands()
         self._bind_focus()
@@ -65,7 +79,9 @@ class ProblemsTreeviewFrame(utils.ScrollableTreeviewFrame, evt.IObserver):
             iid = self._get_iid_on_click(event)
             if iid:
                 self.set_focus(iid)
-                self.viewmodel.go_to_problem(self.tvw.index(iid))
+                self.viewmodel.go_to_problem(
+                    self.window.first + self.tvw.index(iid)
+                )
             return
         self.tvw.bind("<Double-1>", _click_to_prob)
         return
@@ -75,8 +91,8 @@ class ProblemsTreeviewFrame(utils.ScrollableTreeviewFrame, evt.IObserver):
         return
 
     def _bind_up_down(self, _event: Optional[tk.Event] = None) -> None:
-        self.tvw.bind("<Key-Up>", self.viewmodel.go_prev_problem)
-        self.tvw.bind("<Key-Down>", self.viewmodel.go_next_problem)
+        self.tvw.bind("<Key-Up>", self._on_key_up)
+        self.tvw.bind("<Key-Down>", self._on_key_down)
         return
 
     def _unbind_up_down(self, _event: Optional[tk.Event] = None) -> None:
@@ -84,6 +100,54 @@ class ProblemsTreeviewFrame(utils.ScrollableTreeviewFrame, evt.IObserver):
         self.tvw.unbind("<Key-Down>")
         return
 
+    def _on_key_up(self, _event: tk.Event) -> str:
+        self.viewmodel.go_prev_problem()
+        # The treeview must not move its own focus or scroll
+        return "break"
+
+    def _on_key_down(self, _event: tk.Event) -> str:
+        self.viewmodel.go_next_problem()
+        return "break"
+
+    def _bind_mousewheel(self) -> None:
+        self.tvw.bind("<MouseWheel>", self._on_mousewheel)
+        # X11 reports the wheel as buttons 4 and 5
+        self.tvw.bind("<Button-4>", self._on_mousewheel)
+        self.tvw.bind("<Button-5>", self._on_mousewheel)
+        return
+
+    def _on_mousewheel(self, event: tk.Event) -> str:
+        if event.num == 4 or event.delta > 0:
+            self.scroll_by(-3)
+        elif event.num == 5 or event.delta < 0:
+            self.scroll_by(3)
+        return "break"
+
+    def _on_scrollbar(self, *args: str) -> None:
+        if args[0] == "moveto":
+            self.window.moveto(float(args[1]))
+        elif args[0] == "scroll":
+            num = int(args[1])
+            if args[2] == "pages":
+                num *= self.window.num_visible
+            self.window.scroll_by(num)
+        self.draw_rows()
+        return
+
+    def _on_configure(self, event: tk.Event) -> None:
+        # Work out how many rows fit from the position of a drawn row
+        children = self.tvw.get_children()
+        bbox = self.tvw.bbox(children[0]) if children else ""
+        if bbox:
+            _x, heading_height, _w, row_height = bbox
+        else:
+            heading_height, row_height = DEFAULT_ROW_HEIGHT, DEFAULT_ROW_HEIGHT
+        num_visible = (event.height - heading_height) // row_height
+        if num_visible != self.window.num_visible:
+            self.window.set_num_visible(num_visible)
+            self.draw_rows()
+        return
+
     def _bind_heading_commands(self) -> None:
         self.tvw.heading("filename", command=self.viewmodel.sort_by_file)
         self.tvw.heading("time", command=self.viewmodel.sort_by_time)
@@ -109,7 +173,6 @@ class ProblemsTreeviewFrame(utils.ScrollableTreeviewFrame, evt.IObserver):
     def set_focus(self, iid: str) -> None:
         self.tvw.focus(iid)
         self.tvw.selection_set(iid)
-        self.tvw.see(iid)
         return
 
     def disable_input(self) -> None:
@@ -126,50 +189,95 @@ class ProblemsTreeviewFrame(utils.ScrollableTreeviewFrame, evt.IObserver):
         return
 
     def display_time(self, event: plist.ProbTimeEvent) -> None:
-        idx = event.idx
-        time = event.time
-        # Set time column for item at given index
-        id_ = self._idx_to_iid(idx)
-        self.tvw.set(id_, column="time", value=str(time))
+        self.draw_row(event.idx)
         return
 
     def display_status(self, event: plist.ProbStatusEvent) -> None:
-        idx = event.idx
-        status = event.status
-        id_ = self._idx_to_iid(idx)
-        self.tvw.set(id_, column="status", value=self.status_strings[status])
-        self.tvw.item(id_, tags=[status.name]) # overrides existing tags
+        self.draw_row(event.idx)
         return
 
     def go_to_problem(self, event: plist.ProbSelectedEvent) -> None:
         idx = event.sender.curr_prob_idx
         if idx is None:
             return
-        id_ = self._idx_to_iid(idx)
-        self.set_focus(id_)
+        self.window.see(idx)
+        self.draw_rows()
         return
 
     def refresh_view(self, event: plist.ProbListEvent) -> None:
-        # Refresh the entire view as the model changed, e.g. on opening folder
+        # The model changed, e.g. on opening folder or sorting
         problem_list = event.sender
-        self.clear_treeview()
-        for problem in problem_list:
-            filename = os.path.basename(problem.filepath)
-            time_str = ("-" if problem.time is None
-                else problem.time.to_hms_str(places=1)
-            )
-            status_str = self.status_strings[problem.status]
-            tag_list = [problem.status.name]
-            self.tvw.insert(
-                "", "end",
-                values=(filename, time_str, status_str),
-                tags=tag_list
-            )
-        self.refresh_vsb()
-        return
-
-    def _idx_to_iid(self, idx: int) -> str:
-        return self.tvw.get_children()[idx]
+        self.window.set_num_rows(len(problem_list))
+        if problem_list.curr_prob_idx is not None:
+            self.window.see(problem_list.curr_prob_idx)
+        self.draw_rows()
+        return
+
+    def scroll_by(self, num_rows: int) -> None:
+        self.window.scroll_by(num_rows)
+        self.draw_rows()
+        return
+
+    def draw_rows(self) -> None:
+        """Fill the treeview with the rows in the window, reusing the
+        rows already there.
+        """
+        problem_list = self.viewmodel.problem_list
+        rows = self.window.get_rows()
+        children = self.tvw.get_children()
+        for row_num, idx in enumerate(rows):
+            values, tags = self._get_row(problem_list.problems[idx])
+            if row_num < len(children):
+                self.tvw.item(children[row_num], values=values, tags=tags)
+            else:
+                self.tvw.insert("", "end", values=values, tags=tags)
+        if len(children) > len(rows):
+            self.tvw.delete(*children[len(rows):])
+        self.tvw.yview_moveto(0)
+        self._draw_selection()
+        self.vsb.set(*self.window.get_fractions())
+        return
+
+    def draw_row(self, idx: int) -> None:
+        """Redraw the row of the problem at the given index, if it is
+        on screen.
+        """
+        iid = self._idx_to_iid(idx)
+        if iid is None:
+            return
+        values, tags = self._get_row(self.viewmodel.problem_list.problems[idx])
+        self.tvw.item(iid, values=values, tags=tags) # overrides existing tags
+        return
+
+    def refresh_vsb(self) -> None:
+        self.vsb.set(*self.window.get_fractions())
+        return
+
+    def _draw_selection(self) -> None:
+        idx = self.viewmodel.problem_list.curr_prob_idx
+        iid = None if idx is None else self._idx_to_iid(idx)
+        if iid is None:
+            self.tvw.selection_set(())
+        else:
+            self.set_focus(iid)
+        return
+
+    def _get_row(self, problem: plist.Problem
+        ) -> Tuple[Tuple[str, str, str], List[str]]:
+        filename = os.path.basename(problem.filepath)
+        time_str = ("-" if problem.time is None
+            else problem.time.to_hms_str(places=1)
+        )
+        status_str = self.status_strings[problem.status]
+        return (filename, time_str, status_str), [problem.status.name]
+
+    def _idx_to_iid(self, idx: int) -> Optional[str]:
+        # Returns None if the problem's row is not on screen
+        if idx not in self.window.get_rows():
+            return None
+        children = self.tvw.get_children()
+        row_num = idx - self.window.first
+        return children[row_num] if row_num < len(children) else None
 
     def _get_iid_on_click(self, event: tk.Event) -> str:
         iid = self.tvw.identify("item", event.x, event.y)
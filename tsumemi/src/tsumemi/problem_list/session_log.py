@@ -0,0 +1,233 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import time
+
+from typing import TYPE_CHECKING
+
+import tsumemi.src.tsumemi.event as evt
+import tsumemi.src.tsumemi.problem_list.problem_list_model as plist
+
+from tsumemi.src.tsumemi import timer
+
+if TYPE_CHECKING:
+    from typing import (
+        Any, Callable, Dict, IO, Iterable, Iterator, Optional, Union,
+    )
+    PathLike = Union[str, os.PathLike]
+    Record = Dict[str, Any]
+
+
+# A session log is a JSON Lines file, one record per line, only ever
+# appended to. Records are:
+#   {"type": "status", "problem": ..., "status": "CORRECT", "at": ...}
+#   {"type": "time", "problem": ..., "seconds": 12.3, "at": ...}
+#   {"type": "clear", "statuses": true, "times": false, "at": ...}
+# where "problem" is the problem's path relative to the folder or
+# archive it was opened from, and "at" is a Unix timestamp.
+SESSION_LOG_DIR = os.path.relpath(r"tsumemi/resources/sessions")
+SESSION_LOG_EXTENSION = ".jsonl"
+# Records reach the OS as soon as they are written, so they survive the
+# program crashing; they are forced to disk at most this often (in
+# seconds), bounding what an OS crash or power loss can lose.
+FSYNC_INTERVAL = 5.0
+
+
+def get_session_log_path(
+        source: PathLike, log_dir: PathLike = SESSION_LOG_DIR
+    ) -> str:
+    """Return the path of the session log of a problem folder or
+    archive.
+    """
+    source_path = os.path.normcase(os.path.abspath(source))
+    digest = hashlib.sha1(source_path.encode("utf-8")).hexdigest()[:16]
+    name = os.path.basename(os.path.normpath(source))
+    return os.path.join(log_dir, f"{name}-{digest}{SESSION_LOG_EXTENSION}")
+
+
+def read_session_log(filepath: PathLike) -> Iterator[Record]:
+    """Yield the records of a session log in order. An incomplete or
+    unreadable last line, as left by a crash mid-write, is ignored.
+    Raises ValueError on any other unreadable line.
+    """
+    with open(filepath, "r", encoding="utf-8") as fin:
+        lines = fin.read().split("\n")
+    # The text after the last newline is empty unless a write was cut
+    # short
+    for line_num, line in enumerate(lines[:-1], start=1):
+        try:
+            record = json.loads(line)
+        except ValueError as exc:
+            raise ValueError(
+                f"{filepath}: line {line_num} is not a valid record"
+            ) from exc
+        yield record
+    return
+
+
+def restore_session(
+        problem_list: plist.ProblemList,
+        records: Iterable[Record],
+        base_dir: PathLike,
+    ) -> int:
+    """Replay session log records onto the problems of the list,
+    setting their statuses and times. Records of problems not in the
+    list, and records that cannot be understood (e.g. written by a
+    different version), are skipped. Returns the number of records
+    applied.
+    """
+    problems = {
+        os.path.relpath(prob.filepath, base_dir): prob
+        for prob in problem_list
+    }
+    statuses = {id(prob): prob.status for prob in problem_list}
+    times = {id(prob): prob.time for prob in problem_list}
+    num_applied = 0
+    for record in records:
+        if not isinstance(record, dict):
+            continue
+        record_type = record.get("type")
+        if record_type == "clear":
+            if record.get("statuses"):
+                statuses = dict.fromkeys(statuses, plist.ProblemStatus.NONE)
+            if record.get("times"):
+                times = dict.fromkeys(times, None)
+            num_applied += 1
+            continue
+        prob = problems.get(record.get("problem", ""))
+        if prob is None:
+            continue
+        try:
+            if record_type == "status":
+                statuses[id(prob)] = plist.ProblemStatus[record["status"]]
+            elif record_type == "time":
+                times[id(prob)] = timer.Time(float(record["seconds"]))
+            else:
+                continue
+        except (KeyError, TypeError, ValueError):
+            continue
+        num_applied += 1
+    problem_list.set_results(
+        (prob, statuses[id(prob)], times[id(prob)]) for prob in problem_list
+    )
+    return num_applied
+
+
+def _truncate_partial_line(filepath: PathLike) -> None:
+    # Cut off a record left incomplete by a crash, so that appended
+    # records start on a line of their own
+    with open(filepath, "rb+") as fio:
+        size = fio.seek(0, os.SEEK_END)
+        if size == 0:
+            return
+        fio.seek(-1, os.SEEK_END)
+        if fio.read(1) == b"\n":
+            return
+        # Records are short; search backwards a block at a time
+        pos = size
+        while pos > 0:
+            block_start = max(pos - 4096, 0)
+            fio.seek(block_start)
+            block = fio.read(pos - block_start)
+            newline_idx = block.rfind(b"\n")
+            if newline_idx != -1:
+                fio.truncate(block_start + newline_idx + 1)
+                return
+            pos = block_start
+        fio.truncate(0)
+    return
+
+
+class SessionLog(evt.IObserver):
+    """Appends the status and time of each problem of a problem list
+    to a session log as they are set, so that results survive the
+    program closing or crashing.
+    """
+    def __init__(self,
+            filepath: PathLike,
+            problem_list: plist.ProblemList,
+            base_dir: PathLike,
+            fsync_interval: float = FSYNC_INTERVAL,
+            clock: Callable[[], float] = time.monotonic,
+        ) -> None:
+        evt.IObserver.__init__(self)
+        self.filepath: PathLike = filepath
+        self.problem_list: plist.ProblemList = problem_list
+        self.base_dir: PathLike = base_dir
+        self.fsync_interval: float = fsync_interval
+        self.clock: Callable[[], float] = clock
+        os.makedirs(os.path.dirname(filepath) or ".", exist_ok=True)
+        if os.path.isfile(filepath):
+            _truncate_partial_line(filepath)
+        self._file: Optional[IO[str]] = open(
+            filepath, "a", encoding="utf-8", newline="\n"
+        )
+        self._last_sync: float = self.clock()
+        self.set_callbacks({
+            plist.ProbStatusEvent: self._on_status,
+            plist.ProbTimeEvent: self._on_time,
+        })
+        problem_list.add_observer(self)
+        return
+
+    def _get_problem_key(self, idx: int) -> str:
+        return os.path.relpath(self.problem_list.problems[idx].filepath,
+            self.base_dir
+        )
+
+    def _on_status(self, event: plist.ProbStatusEvent) -> None:
+        self.write({
+            "type": "status",
+            "problem": self._get_problem_key(event.idx),
+            "status": event.status.name,
+        })
+        return
+
+    def _on_time(self, event: plist.ProbTimeEvent) -> None:
+        self.write({
+            "type": "time",
+            "problem": self._get_problem_key(event.idx),
+            "seconds": event.time.seconds,
+        })
+        return
+
+    def log_clear(self, statuses: bool, times: bool) -> None:
+        """Record that the statuses and/or times of all problems were
+        cleared.
+        """
+        self.write({"type": "clear", "statuses": statuses, "times": times})
+        return
+
+    def write(self, record: Record) -> None:
+        if self._file is None:
+            return
+        record["at"] = round(time.time(), 3)
+        self._file.write(
+            json.dumps(record, ensure_ascii=False, separators=(",", ":"))
+            + "\n"
+        )
+        self._file.flush()
+        if self.clock() - self._last_sync >= self.fsync_interval:
+            self.sync()
+        return
+
+    def sync(self) -> None:
+        """Force everything written so far onto the disk.
+        """
+        if self._file is None:
+            return
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self._last_sync = self.clock()
+        return
+
+    def close(self) -> None:
+        if self._file is None:
+            return
+        self.sync()
+        self._file.close()
+        self._file = None
+        self.problem_list.remove_observer(self)
+        return
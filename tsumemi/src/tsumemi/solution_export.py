@@ -0,0 +1,149 @@
+from __future__ import annotations
+
+import argparse
+import csv
+import os
+import sys
+
+from typing import TYPE_CHECKING
+
+from tsumemi.src.shogi import notation
+from tsumemi.src.shogi.parsing import kif
+from tsumemi.src.tsumemi import files
+
+if TYPE_CHECKING:
+    import typing
+    from typing import Dict, Iterator, List, Optional, Sequence, Tuple, Union
+    from tsumemi.src.shogi.game import Game
+    from tsumemi.src.shogi.gametree import MoveNode
+    PathLike = Union[str, os.PathLike]
+
+
+# Names of the notations that can be exported, for column headers and
+# the command line
+MOVE_WRITERS: Dict[str, notation.AbstractMoveWriter] = {
+    "western": notation.WesternMoveWriter(notation.WESTERN_MOVE_FORMAT),
+    "kitao-kawasaki": notation.KitaoKawasakiMoveWriter(
+        notation.WESTERN_MOVE_FORMAT
+    ),
+    "japanese": notation.JapaneseMoveWriter(notation.JAPANESE_MOVE_FORMAT),
+    "iroha": notation.IrohaMoveWriter(notation.JAPANESE_MOVE_FORMAT),
+}
+
+
+def get_lines(game: Game, variations: bool = False
+    ) -> List[List[MoveNode]]:
+    """Return the lines of play of the game, each as its nodes after
+    the root. The mainline comes first; with `variations`, it is
+    followed by the line leading to every other leaf, in tree order.
+    """
+    leaves = (
+        [node for node in game.movetree.traverse_preorder() if node.is_leaf()]
+        if variations else [game.movetree.get_last_node()]
+    )
+    return [list(leaf.get_path_from_root())[1:] for leaf in leaves]
+
+
+def write_solution_rows(
+        game: Game,
+        writer_names: Sequence[str],
+        variations: bool = False,
+    ) -> List[Tuple[str, ...]]:
+    """Return one row per line of play of the game, holding the line
+    written in each of the named notations.
+    """
+    move_writers = [MOVE_WRITERS[name] for name in writer_names]
+    node_notation = notation.write_game_notation(game, move_writers)
+    rows = []
+    for line in get_lines(game, variations):
+        rows.append(tuple(
+            _get_separator(move_writer).join(
+                node_notation[node.id][i] for node in line
+            )
+            for i, move_writer in enumerate(move_writers)
+        ))
+    return rows
+
+
+def _get_separator(move_writer: notation.AbstractMoveWriter) -> str:
+    # Same as the solution text in the GUI for Japanese notation
+    return ("　" if isinstance(move_writer, notation.JapaneseMoveWriter)
+        else " "
+    )
+
+
+def export_solutions(
+        kif_paths: Sequence[PathLike],
+        handle: typing.TextIO,
+        writer_names: Sequence[str],
+        variations: bool = False,
+        directory: Optional[PathLike] = None,
+    ) -> Iterator[Optional[str]]:
+    """Write the solutions of the KIF files as CSV to the handle, one
+    row per line of play and one column per notation. File names are
+    written relative to `directory` if given. Yields None for each
+    file written and an error message for each file that could not be
+    read, in file order. Files with malformed lines are skipped, as
+    their solutions may be cut short.
+    """
+    csv_writer = csv.writer(handle)
+    csv_writer.writerow(("file", "line", *writer_names))
+    for result in kif.read_kifs_tolerant(kif_paths):
+        game = result.game
+        if game is None or not game.movetree.start_pos:
+            yield f"{result.filepath}: could not read file"
+            continue
+        if result.diagnostics:
+            yield f"{result.filepath}: {result.diagnostics[0]}"
+            continue
+        filename = (str(result.filepath) if directory is None
+            else os.path.relpath(result.filepath, directory)
+        )
+        rows = write_solution_rows(game, writer_names, variations)
+        for line_num, row in enumerate(rows, start=1):
+            csv_writer.writerow((filename, line_num, *row))
+        yield None
+    return
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Write the solutions of a folder of KIF problems to "
+        "a CSV file, in several notations at once."
+    )
+    parser.add_argument("directory", help="folder of KIF files")
+    parser.add_argument("out_file", help="CSV file to write")
+    parser.add_argument("-r", "--recursive", action="store_true",
+        help="include subfolders"
+    )
+    parser.add_argument("-n", "--notation", action="append",
+        choices=list(MOVE_WRITERS), dest="notations",
+        help="notation to write; repeat for several (default: all)"
+    )
+    parser.add_argument("--variations", action="store_true",
+        help="also write every variation as a line of its own"
+    )
+    args = parser.parse_args(argv)
+    writer_names = args.notations or list(MOVE_WRITERS)
+    kif_paths = sorted(map(str, files.get_kif_files(
+        args.directory, args.recursive
+    )))
+    num_written = 0
+    errors: List[str] = []
+    with open(args.out_file, "w", newline="", encoding="utf-8-sig") as fout:
+        for error in export_solutions(
+                kif_paths, fout, writer_names,
+                variations=args.variations, directory=args.directory,
+            ):
+            if error is None:
+                num_written += 1
+            else:
+                errors.append(error)
+    for error in errors:
+        print(error, file=sys.stderr)
+    print(f"Wrote {num_written} solutions, {len(errors)} failed")
+    return 1 if errors else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
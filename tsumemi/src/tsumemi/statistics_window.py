@@ -59,6 +59,25 @@ class StatisticsDialog(tk.Toplevel):
             message_strings.append(
                 f"Shortest time taken: {_fastest_time.to_hms_str(places=1)} ({_fastest_filename})"
             )
+        num_past_attempts = stats.get_num_past_attempts()
+        if num_past_attempts:
+            message_strings.extend(["", "All sessions in this folder:",
+                f"Attempts recorded: {num_past_attempts}",
+            ])
+            for day_start, num_attempts, num_day_correct in (
+                    stats.get_accuracy_trend()
+                ):
+                day = datetime.date.fromtimestamp(day_start)
+                message_strings.append(
+                    f"{day.isoformat()}: {num_day_correct}/{num_attempts}"
+                    f" correct ({100 * num_day_correct / num_attempts:.0f}%)"
+                )
+            message_strings.append("Slowest attempts:")
+            for _, name, seconds, status in stats.get_slowest_attempts():
+                message_strings.append(
+                    f"  {timer.Time(seconds).to_hms_str(places=1)}"
+                    f" {status.name.lower()} ({name})"
+                )
         report_text = "\n".join(message_strings)
 
         self.title("Solving statistics")
@@ -1,7 +1,6 @@
 from __future__ import annotations
 
 import itertools
-import math
 import time
 
 from typing import TYPE_CHECKING
@@ -9,7 +8,7 @@ from typing import TYPE_CHECKING
 import tsumemi.src.tsumemi.event as evt
 
 if TYPE_CHECKING:
-    from typing import Any, Iterator, List, Optional, Tuple
+    from typing import Any, Callable, Iterator, List, Optional, Tuple
 
 
 def _two_digits(num: float) -> str:
@@ -56,6 +55,9 @@ class Time:
     def __radd__(self, other: Any) -> Time:
         return self.__add__(other)
 
+    def __float__(self) -> float:
+        return float(self.seconds)
+
     def __str__(self) -> str:
         return self.to_hms_str()
 
@@ -102,67 +104,72 @@ class SplitTimer:
     (those four), and 4 lap times (each lap is 30 seconds).
     '''
 
-    def __init__(self) -> None:
+    def __init__(self,
+            clock: Callable[[], int] = time.perf_counter_ns
+        ) -> None:
+        # Monotonic clock in integer nanoseconds
+        self.clock: Callable[[], int] = clock
         self.is_running: bool = False
         self.lap_times: List[float] = []
-        # Elapsed (active) time since the start of this lap
-        self.curr_lap_time: float = 0
-        # Time at instant of last start() or split()
-        self.start_time: Optional[float] = None
+        # Running totals are kept in integer nanoseconds, so reading
+        # the timer neither sums the laps nor accumulates rounding error
+        # Sum of all lap times
+        self._total_ns: int = 0
+        # Elapsed (active) time since the start of this lap, up to the
+        # last start()
+        self._curr_lap_ns: int = 0
+        # Clock reading at instant of last start() or split()
+        self.start_time: Optional[int] = None
         return
 
+    @property
+    def curr_lap_time(self) -> float:
+        return self._curr_lap_ns / 1e9
+
     def start(self) -> None:
         if not self.is_running:
             self.is_running = True
-            self.start_time = time.perf_counter()
+            self.start_time = self.clock()
         return
 
     def stop(self) -> None:
         if self.is_running:
             self.is_running = False
             if self.start_time is not None:
-                self.curr_lap_time += time.perf_counter() - self.start_time
+                self._curr_lap_ns += self.clock() - self.start_time
         return
 
     def split(self) -> Optional[float]:
         if self.start_time is None:
             # ill-defined operation
             return None
+        now = self.clock()
+        lap_ns = self._curr_lap_ns
         if self.is_running:
-            lap_time = (self.curr_lap_time
-                + time.perf_counter() - self.start_time
-            )
-            self.lap_times.append(lap_time)
-            self.start_time = time.perf_counter()
-            self.curr_lap_time = 0
-            return lap_time
-        else:
-            # Splitting while the timer is paused "has no meaning".
-            lap_time = self.curr_lap_time
-            self.lap_times.append(lap_time)
-            self.start_time = self.read()
-            self.curr_lap_time = 0
-            return lap_time
+            lap_ns += now - self.start_time
+        # Splitting while the timer is paused "has no meaning"; the lap
+        # is just the active time so far.
+        self._total_ns += lap_ns
+        self.lap_times.append(lap_ns / 1e9)
+        self.start_time = now
+        self._curr_lap_ns = 0
+        return lap_ns / 1e9
 
     def reset(self) -> None:
         self.is_running = False
         self.lap_times = []
-        self.curr_lap_time = 0
+        self._total_ns = 0
+        self._curr_lap_ns = 0
         self.start_time = None
         return
 
     def read(self) -> float:
         if self.start_time is None:
             return 0
-        elif self.is_running:
-            res = (math.fsum(self.lap_times)
-                + self.curr_lap_time
-                + time.perf_counter()
-                - self.start_time
-            )
-        else:
-            res = math.fsum(self.lap_times) + self.curr_lap_time
-        return res
+        res = self._total_ns + self._curr_lap_ns
+        if self.is_running:
+            res += self.clock() - self.start_time
+        return res / 1e9
 
     def get_lap(self) -> Optional[float]:
         if self.lap_times:
@@ -0,0 +1,51 @@
+from __future__ import annotations
+
+import tkinter as tk
+
+from tkinter import ttk
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from typing import Any, Optional
+    from tsumemi.src.tsumemi.instrumentation import Profiler
+
+
+# How often the window reads the profiler again
+REFRESH_MS = 500
+
+
+class TimingsWindow(tk.Toplevel):
+    def __init__(self, profiler: Profiler, *args: Any, **kwargs: Any
+        ) -> None:
+        """Debug window showing the profiler's timings in milliseconds,
+        kept up to date while it is open.
+        """
+        super().__init__(*args, **kwargs)
+        self.profiler = profiler
+        self._after_id: Optional[str] = None
+        self.title("Timings (ms)")
+        self.txt_timings = tk.Text(
+            self, width=80, height=20, wrap="none", font="TkFixedFont"
+        )
+        btn_close = ttk.Button(self, text="Close", command=self.destroy)
+        self.grid_columnconfigure(0, weight=1)
+        self.grid_rowconfigure(0, weight=1)
+        self.txt_timings.grid(row=0, column=0, sticky="NSEW", padx=5, pady=5)
+        btn_close.grid(row=1, column=0, padx=5, pady=5)
+        self.refresh()
+        return
+
+    def refresh(self) -> None:
+        self.txt_timings.config(state="normal")
+        self.txt_timings.delete("1.0", tk.END)
+        self.txt_timings.insert(tk.INSERT, self.profiler.format_summary())
+        self.txt_timings.config(state="disabled")
+        self._after_id = self.after(REFRESH_MS, self.refresh)
+        return
+
+    def destroy(self) -> None:
+        if self._after_id is not None:
+            self.after_cancel(self._after_id)
+            self._after_id = None
+        super().destroy()
+        return
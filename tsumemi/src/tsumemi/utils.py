@@ -5,7 +5,7 @@ from typing import TYPE_CHECKING
 
 if TYPE_CHECKING:
     import tkinter as tk
-    from typing import Any
+    from typing import Any, Tuple
 
 
 class ScrollableTreeviewFrame(ttk.Frame):
@@ -46,3 +46,74 @@ class ScrollableTreeviewFrame(ttk.Frame):
         """
         self.tvw.delete(*self.tvw.get_children())
         return
+
+
+class RowWindow:
+    """Tracks which slice of a long list of rows is on screen, for
+    views that only create widgets for the visible rows. `first` is
+    the index of the top visible row.
+    """
+    def __init__(self,
+            num_rows: int = 0, num_visible: int = 1, margin: int = 1
+        ) -> None:
+        self.num_rows: int = num_rows
+        self.num_visible: int = max(num_visible, 1)
+        # Extra rows kept below the visible ones, e.g. for a partly
+        # visible last row
+        self.margin: int = margin
+        self.first: int = 0
+        return
+
+    def set_num_rows(self, num_rows: int) -> None:
+        self.num_rows = num_rows
+        self.scroll_to(self.first)
+        return
+
+    def set_num_visible(self, num_visible: int) -> None:
+        self.num_visible = max(num_visible, 1)
+        self.scroll_to(self.first)
+        return
+
+    def scroll_to(self, first: int) -> None:
+        """Put the given row at the top, as far as the rows allow.
+        """
+        last_first = max(self.num_rows - self.num_visible, 0)
+        self.first = min(max(first, 0), last_first)
+        return
+
+    def scroll_by(self, num_rows: int) -> None:
+        self.scroll_to(self.first + num_rows)
+        return
+
+    def moveto(self, fraction: float) -> None:
+        """Scroll so that the top row is the given fraction of the way
+        down the list, as a scrollbar does.
+        """
+        self.scroll_to(round(fraction * self.num_rows))
+        return
+
+    def see(self, idx: int) -> None:
+        """Scroll as little as possible to make the row visible.
+        """
+        if idx < self.first:
+            self.scroll_to(idx)
+        elif idx >= self.first + self.num_visible:
+            self.scroll_to(idx - self.num_visible + 1)
+        return
+
+    def get_rows(self) -> range:
+        """Return the indexes of the rows to show.
+        """
+        return range(
+            self.first,
+            min(self.first + self.num_visible + self.margin, self.num_rows)
+        )
+
+    def get_fractions(self) -> Tuple[float, float]:
+        """Return the start and end of the visible rows as fractions of
+        the list, as a scrollbar expects.
+        """
+        if self.num_rows == 0:
+            return 0.0, 1.0
+        end = min(self.first + self.num_visible, self.num_rows)
+        return self.first / self.num_rows, end / self.num_rows
@@ -0,0 +1,177 @@
+import os
+import statistics
+import tempfile
+import unittest
+
+from unittest import mock
+
+import numpy as np
+
+from PIL import Image
+
+import tsumemi.src.tsumemi.problem_list.problem_list_model as plist
+
+from tsumemi.src.tsumemi import analytics
+from tsumemi.src.tsumemi.problem_list.problem_list_controller import ProblemListController
+from tsumemi.src.tsumemi.timer import Time
+
+
+KIF_DIR = os.path.normpath(r"./tsumemi/test/test_kifus")
+CORRECT = plist.ProblemStatus.CORRECT
+WRONG = plist.ProblemStatus.WRONG
+SKIP = plist.ProblemStatus.SKIP
+NONE = plist.ProblemStatus.NONE
+
+
+def make_problem_list(rows):
+    problems = []
+    for filepath, status, seconds in rows:
+        prob = plist.Problem(filepath)
+        prob.status = status
+        prob.time = None if seconds is None else Time(seconds)
+        problems.append(prob)
+    return plist.ProblemList(problems)
+
+
+class TestAnalytics(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.default_rng(0)
+        self.num = 500
+        self.times = rng.gamma(2.0, 30.0, self.num)
+        # Some problems never timed
+        self.times[rng.random(self.num) < 0.1] = np.nan
+        self.statuses = rng.choice(
+            [NONE.value, CORRECT.value, WRONG.value, SKIP.value], self.num
+        )
+        self.folders = rng.choice(["a", "b", "c", ""], self.num)
+        self.data = analytics.SessionData(
+            [f"{num}.kif" for num in range(self.num)],
+            self.times, self.statuses, self.folders,
+            rng.integers(1, 8, self.num) * 2 - 1,
+        )
+
+    def test_percentiles(self):
+        valid = sorted(t for t in self.times.tolist() if t == t)
+        percentiles = analytics.get_percentiles(self.times, (50, 90))
+        self.assertAlmostEqual(percentiles[50], statistics.median(valid))
+        self.assertEqual(analytics.get_percentiles(np.array([np.nan])), {})
+
+    def test_rolling_average(self):
+        valid = [t for t in self.times.tolist() if t == t]
+        rolling = analytics.get_rolling_average(self.times, 7)
+        self.assertEqual(len(rolling), len(valid) - 6)
+        for idx in (0, 100, len(rolling) - 1):
+            self.assertAlmostEqual(
+                rolling[idx], sum(valid[idx:idx+7]) / 7
+            )
+        self.assertEqual(
+            analytics.get_rolling_average(self.times[:3], 7).size, 0
+        )
+
+    def test_breakdown(self):
+        for keys in (self.data.folders, self.data.mate_lengths):
+            breakdown = analytics.get_breakdown(self.data, keys)
+            for key, count, seen, correct, mean, median in breakdown.rows():
+                in_group = [
+                    idx for idx in range(self.num) if keys[idx] == key
+                ]
+                times = [
+                    self.times[idx] for idx in in_group
+                    if not np.isnan(self.times[idx])
+                ]
+                self.assertEqual(count, len(in_group))
+                self.assertEqual(seen, sum(
+                    self.statuses[idx] != NONE.value for idx in in_group
+                ))
+                self.assertEqual(correct, sum(
+                    self.statuses[idx] == CORRECT.value for idx in in_group
+                ))
+                self.assertAlmostEqual(mean, statistics.mean(times))
+                self.assertAlmostEqual(median, statistics.median(times))
+
+    def test_breakdown_without_times(self):
+        data = analytics.SessionData(
+            ["1.kif", "2.kif"], [np.nan, 5.0], [NONE.value, CORRECT.value],
+            ["x", "y"],
+        )
+        breakdown = analytics.get_breakdown(data, data.folders)
+        self.assertEqual(breakdown.keys.tolist(), ["x", "y"])
+        self.assertTrue(np.isnan(breakdown.median_times[0]))
+        self.assertEqual(breakdown.median_times[1], 5.0)
+
+    def test_outliers(self):
+        times = np.array([10, 11, 12, 13, np.nan, 14, 100, 0.5, 12])
+        self.assertEqual(analytics.find_outliers(times).tolist(), [6, 7])
+
+    def test_csv_round_trip(self):
+        controller = ProblemListController()
+        controller.problem_list.add_problems(make_problem_list([
+            ("x/1.kif", CORRECT, 12.5), ("x/2.kif", NONE, None),
+            ("x/3.kif", SKIP, 3.0),
+        ]))
+        with tempfile.TemporaryDirectory() as tmpdir:
+            filepath = os.path.join(tmpdir, "results.csv")
+            controller.export_as_csv(filepath)
+            data = analytics.SessionData.from_csv(filepath)
+        self.assertEqual(data.names.tolist(), ["1.kif", "2.kif", "3.kif"])
+        self.assertEqual(data.times[0], 12.5)
+        self.assertTrue(np.isnan(data.times[1]))
+        self.assertEqual(data.statuses.tolist(),
+            [CORRECT.value, NONE.value, SKIP.value]
+        )
+
+    def test_problem_info(self):
+        problem_list = make_problem_list([
+            (os.path.join(KIF_DIR, "1.kif"), CORRECT, 20.0),
+            (os.path.join(KIF_DIR, "testbranch.kif"), WRONG, 5.0),
+        ])
+        data = analytics.SessionData.from_problem_list(problem_list, KIF_DIR)
+        self.assertEqual(data.folders.tolist(), ["", ""])
+        num_matched = data.set_problem_info(
+            [os.path.join(KIF_DIR, "1.kif")], os.path.dirname(KIF_DIR)
+        )
+        self.assertEqual(num_matched, 1)
+        self.assertEqual(data.mate_lengths.tolist(),
+            [3, analytics.UNKNOWN_MATE_LENGTH]
+        )
+        self.assertEqual(data.folders[0], "test_kifus")
+
+    def test_controller_session_data(self):
+        controller = ProblemListController()
+        controller.set_directory(KIF_DIR, [
+            os.path.join(KIF_DIR, filename)
+            for filename in ("1.kif", "testbranch.kif", "missing.kif")
+        ])
+        data = controller.get_session_data()
+        self.assertEqual(data.mate_lengths.tolist(),
+            [3, analytics.UNKNOWN_MATE_LENGTH, 1]
+        )
+        # Mate lengths already known are not read again
+        with mock.patch.object(controller, "_read_game_tolerant",
+                wraps=controller._read_game_tolerant) as read_game:
+            data = controller.get_session_data()
+        self.assertEqual(read_game.call_count, 1)
+        self.assertEqual(data.mate_lengths.tolist(),
+            [3, analytics.UNKNOWN_MATE_LENGTH, 1]
+        )
+
+    def test_reports(self):
+        report = analytics.format_report(self.data)
+        self.assertIn(f"Problems: {self.num}", report)
+        self.assertIn("By folder:", report)
+        self.assertIn("By mate length:", report)
+        with tempfile.TemporaryDirectory() as tmpdir:
+            png_path = os.path.join(tmpdir, "report.png")
+            analytics.write_report(self.data, png_path)
+            with Image.open(png_path) as img:
+                self.assertEqual(img.size, (800, 600))
+            empty = analytics.SessionData([], [], [])
+            analytics.write_report(empty, png_path)
+            txt_path = os.path.join(tmpdir, "report.txt")
+            analytics.write_report(empty, txt_path)
+            with open(txt_path, encoding="utf-8") as fin:
+                self.assertIn("Problems: 0", fin.read())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,24 @@
+import unittest
+
+from PIL import Image
+
+from tsumemi.src.tsumemi.board_gui.board_render import render_board_background
+
+
+class TestBoardBackground(unittest.TestCase):
+    def test_solid_colour(self):
+        img = render_board_background(None, "#ffd39b", 40.5, 44)
+        self.assertEqual(img.size, (365, 397))
+        # grid line on the square edge, skin colour inside the square
+        self.assertEqual(img.getpixel((81, 20))[:3], (0, 0, 0))
+        self.assertEqual(img.getpixel((60, 20))[:3], (0xff, 0xd3, 0x9b))
+
+    def test_tile_texture(self):
+        tile = Image.new("RGB", (120, 120), "#336699")
+        img = render_board_background(tile, "white", 30, 33)
+        self.assertEqual(img.getpixel((15, 15))[:3], (0x33, 0x66, 0x99))
+        self.assertEqual(img.getpixel((270, 297))[:3], (0, 0, 0))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,77 @@
+import os
+import tempfile
+import unittest
+
+from unittest import mock
+
+from PIL import Image, ImageFont
+
+from tsumemi.src.shogi.position import Position
+from tsumemi.src.tsumemi import diagram_export, skins
+from tsumemi.src.tsumemi.board_gui.board_render import PositionRenderer, find_cjk_font
+
+
+KIF_DIR = os.path.normpath(r"./tsumemi/test/test_kifus")
+SKIN_SETTINGS = skins.SkinSettings(
+    skins.PieceSkin.LIGHT, skins.BoardSkin.WOOD1, skins.BoardSkin.BROWN
+)
+
+
+class TestPositionRenderer(unittest.TestCase):
+    def test_render_size(self):
+        renderer = PositionRenderer(SKIN_SETTINGS, 300, 250)
+        position = diagram_export.read_start_position(
+            os.path.join(KIF_DIR, "1.kif")
+        )
+        img = renderer.render(position)
+        self.assertEqual(img.size, (300, 250))
+        flipped = renderer.render(position, upside_down=True)
+        self.assertNotEqual(img.tobytes(), flipped.tobytes())
+
+    def test_pieces_drawn(self):
+        renderer = PositionRenderer(SKIN_SETTINGS)
+        empty = renderer.render(Position())
+        position = Position()
+        position.from_sfen("4k4/9/9/9/9/9/9/9/4K4 b - 1")
+        with_kings = renderer.render(position)
+        self.assertNotEqual(empty.tobytes(), with_kings.tobytes())
+
+    def test_old_pillow_default_font(self):
+        # Before Pillow 10.1 the default font takes no size
+        load_default = ImageFont.load_default
+        def old_load_default(*args, **kwargs):
+            if args or kwargs:
+                raise TypeError("load_default() takes no arguments")
+            return load_default()
+        renderer = PositionRenderer(SKIN_SETTINGS, 300, 250)
+        position = Position()
+        position.from_sfen("4k4/9/9/9/9/9/9/9/4K4 b 2P 1")
+        with mock.patch.object(ImageFont, "load_default", old_load_default):
+            img = renderer.render(position)
+        self.assertEqual(img.size, (300, 250))
+
+    @unittest.skipIf(find_cjk_font() is not None, "a CJK font is installed")
+    def test_text_pieces_need_font(self):
+        settings = skins.SkinSettings(
+            skins.PieceSkin.TEXT, skins.BoardSkin.WHITE, skins.BoardSkin.WHITE
+        )
+        with self.assertRaises(ValueError):
+            PositionRenderer(settings)
+
+
+class TestDiagramExport(unittest.TestCase):
+    def test_export_folder(self):
+        with tempfile.TemporaryDirectory() as out_dir:
+            results = list(diagram_export.export_diagrams(
+                KIF_DIR, out_dir, SKIN_SETTINGS, width=200, height=170,
+                max_workers=2,
+            ))
+            self.assertEqual(results, [None] * 13)
+            self.assertEqual(len(os.listdir(out_dir)), 13)
+            out_path = os.path.join(out_dir, "1.png")
+            with Image.open(out_path) as img:
+                self.assertEqual(img.size, (200, 170))
+
+
+if __name__ == '__main__':
+    unittest.main()
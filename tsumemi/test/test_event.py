@@ -0,0 +1,142 @@
+import gc
+import unittest
+
+import tsumemi.src.tsumemi.event as evt
+
+from tsumemi.src.shogi.position_diff import PositionDiff
+from tsumemi.src.shogi.square import Square
+from tsumemi.src.tsumemi.game.game_model import GameStepEvent, GameUpdateEvent
+from tsumemi.src.tsumemi.problem_list.problem_list_model import (
+    ProbStatusEvent, ProbTimeEvent, ProblemStatus,
+)
+from tsumemi.src.tsumemi.timer import Time
+
+
+class EventA(evt.Event):
+    def __init__(self, value):
+        self.value = value
+
+
+class EventB(evt.Event):
+    pass
+
+
+class Recorder(evt.IObserver):
+    def __init__(self):
+        super().__init__()
+        self.events = []
+
+    def on_notify(self, event):
+        self.events.append(event)
+
+
+class FakeScheduler:
+    def __init__(self):
+        self.callbacks = []
+
+    def __call__(self, callback):
+        self.callbacks.append(callback)
+
+    def run(self):
+        callbacks, self.callbacks = self.callbacks, []
+        for callback in callbacks:
+            callback()
+
+
+class TestEmitter(unittest.TestCase):
+    def setUp(self):
+        self.emitter = evt.Emitter()
+        self.recorder = Recorder()
+        self.emitter.add_observer(self.recorder)
+
+    def test_immediate(self):
+        self.emitter._notify_observers(EventA(1))
+        self.emitter._notify_observers(EventA(2))
+        self.assertEqual([e.value for e in self.recorder.events], [1, 2])
+
+    def test_batch_coalesces(self):
+        with self.emitter.batch_events():
+            self.emitter._notify_observers(EventA(1))
+            self.emitter._notify_observers(EventB())
+            self.emitter._notify_observers(EventA(2))
+            self.assertEqual(self.recorder.events, [])
+        self.assertEqual(
+            [type(e) for e in self.recorder.events], [EventA, EventB]
+        )
+        self.assertEqual(self.recorder.events[0].value, 2)
+
+    def test_nested_batches(self):
+        with self.emitter.batch_events():
+            with self.emitter.batch_events():
+                self.emitter._notify_observers(EventA(1))
+            self.assertEqual(self.recorder.events, [])
+        self.assertEqual(len(self.recorder.events), 1)
+
+    def test_per_problem_keys(self):
+        with self.emitter.batch_events():
+            for idx in range(3):
+                self.emitter._notify_observers(
+                    ProbStatusEvent(idx, ProblemStatus.SKIP)
+                )
+                self.emitter._notify_observers(
+                    ProbStatusEvent(idx, ProblemStatus.CORRECT)
+                )
+                self.emitter._notify_observers(ProbTimeEvent(idx, Time(1)))
+        self.assertEqual(len(self.recorder.events), 6)
+        statuses = [
+            e for e in self.recorder.events if isinstance(e, ProbStatusEvent)
+        ]
+        self.assertEqual([e.idx for e in statuses], [0, 1, 2])
+        self.assertTrue(
+            all(e.status == ProblemStatus.CORRECT for e in statuses)
+        )
+
+    def test_merge_game_diffs(self):
+        sq1, sq2 = Square.from_cr(7, 7), Square.from_cr(7, 6)
+        with self.emitter.batch_events():
+            self.emitter._notify_observers(
+                GameStepEvent(None, PositionDiff([sq1]))
+            )
+            self.emitter._notify_observers(
+                GameStepEvent(None, PositionDiff([sq2]))
+            )
+        (event,) = self.recorder.events
+        self.assertEqual(event.diff, PositionDiff([sq1, sq2]))
+
+    def test_merge_unknown_diff(self):
+        with self.emitter.batch_events():
+            self.emitter._notify_observers(GameUpdateEvent(None, None))
+            self.emitter._notify_observers(
+                GameUpdateEvent(None, PositionDiff())
+            )
+        (event,) = self.recorder.events
+        self.assertIsNone(event.diff)
+
+    def test_deferred(self):
+        scheduler = FakeScheduler()
+        self.emitter.defer_events(scheduler)
+        for value in range(5):
+            self.emitter._notify_observers(EventA(value))
+        self.assertEqual(len(scheduler.callbacks), 1)
+        self.assertEqual(self.recorder.events, [])
+        scheduler.run()
+        self.assertEqual([e.value for e in self.recorder.events], [4])
+        self.emitter._notify_observers(EventA(5))
+        self.assertEqual(len(scheduler.callbacks), 1)
+        self.emitter.defer_events(None)
+        self.assertEqual([e.value for e in self.recorder.events], [4, 5])
+        self.emitter._notify_observers(EventA(6))
+        self.assertEqual(len(self.recorder.events), 3)
+
+    def test_dead_observers_pruned(self):
+        other = Recorder()
+        self.emitter.add_observer(other)
+        del other
+        gc.collect()
+        self.emitter._notify_observers(EventA(1))
+        self.assertEqual(len(self.emitter.observer_refs), 1)
+        self.assertEqual(len(self.recorder.events), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,134 @@
+import random
+import time
+import unittest
+
+import tsumemi.src.tsumemi.problem_list.problem_list_model as plist
+
+from tsumemi.src.tsumemi.problem_list.history import (
+    AttemptHistory, AttemptRecorder,
+)
+from tsumemi.src.tsumemi.timer import Time
+
+
+CORRECT = plist.ProblemStatus.CORRECT
+WRONG = plist.ProblemStatus.WRONG
+SKIP = plist.ProblemStatus.SKIP
+
+
+class TestAttemptHistory(unittest.TestCase):
+    def setUp(self):
+        self.history = AttemptHistory(":memory:")
+
+    def tearDown(self):
+        self.history.close()
+
+    def test_problem_history(self):
+        for seconds, status, at in [
+                (30.0, WRONG, 100), (12.0, CORRECT, 200),
+                (20.0, CORRECT, 300), (25.0, SKIP, 400),
+            ]:
+            self.history.add_attempt("a", status, seconds, attempted_at=at)
+        self.history.add_attempt("b", CORRECT, 1.0, attempted_at=500)
+        summary = self.history.get_problem_history("a")
+        self.assertEqual(summary.num_attempts, 4)
+        self.assertEqual(summary.num_correct, 2)
+        self.assertEqual(summary.best_time, 12.0)
+        self.assertEqual(summary.median_time, 22.5)
+        self.assertEqual(summary.last_time, 25.0)
+        self.assertEqual(summary.last_status, SKIP)
+        self.assertEqual(summary.get_accuracy(), 0.5)
+        self.assertEqual(self.history.get_problem_history("b").median_time, 1.0)
+        self.assertIsNone(self.history.get_problem_history("c"))
+
+    def test_accuracy_trend(self):
+        day = 86400
+        rows = [
+            ("a", "", "folder", CORRECT.name, 1.0, 0.5*day),
+            ("b", "", "folder", WRONG.name, 1.0, 0.7*day),
+            ("a", "", "folder", CORRECT.name, 1.0, 2.1*day),
+            ("a", "", "other", WRONG.name, 1.0, 2.2*day),
+        ]
+        self.history.add_attempts(rows)
+        self.assertEqual(
+            self.history.get_accuracy_trend(0, day, "folder"),
+            [(0, 2, 1), (2*day, 1, 1)],
+        )
+        self.assertEqual(
+            self.history.get_accuracy_trend(day),
+            [(2*day, 2, 1)],
+        )
+
+    def test_slowest_attempts(self):
+        rows = [
+            (f"p{num}", f"{num}.kif", "folder" if num % 2 else "other",
+                CORRECT.name, float(num), 0)
+            for num in range(10)
+        ]
+        self.history.add_attempts(rows)
+        slowest = self.history.get_slowest_attempts(3, "folder")
+        self.assertEqual([row[2] for row in slowest], [9.0, 7.0, 5.0])
+        self.assertEqual(slowest[0][:2], ("p9", "9.kif"))
+        self.assertEqual(self.history.get_num_attempts(), 10)
+        self.assertEqual(self.history.get_num_attempts("folder"), 5)
+
+    def test_large_history(self):
+        # Queries are answered from indexes, not by scanning
+        rng = random.Random(0)
+        statuses = [CORRECT.name, WRONG.name, SKIP.name]
+        self.history.add_attempts(
+            (f"p{rng.randrange(20000)}", "", f"f{rng.randrange(20)}",
+                rng.choice(statuses), rng.uniform(1, 600), float(at))
+            for at in range(200_000)
+        )
+        start = time.perf_counter()
+        for num in range(100):
+            self.history.get_problem_history(f"p{num}")
+        self.history.get_slowest_attempts(10, "f3")
+        self.history.get_accuracy_trend(199_000, 100, "f3")
+        elapsed = time.perf_counter() - start
+        self.assertLess(elapsed, 1)
+
+
+class TestAttemptRecorder(unittest.TestCase):
+    def setUp(self):
+        self.history = AttemptHistory(":memory:")
+        self.problem_list = plist.ProblemList(
+            [plist.Problem(f"/folder/{num}.kif") for num in range(3)]
+        )
+        self.recorder = AttemptRecorder(
+            self.history, self.problem_list,
+            lambda prob: f"hash-{prob.filepath}", "/folder",
+        )
+
+    def tearDown(self):
+        self.recorder.close()
+        self.history.close()
+
+    def test_time_then_status(self):
+        self.problem_list.go_to_idx(0)
+        self.problem_list.set_time(Time(3.0))
+        self.assertEqual(self.history.get_num_attempts(), 0)
+        self.problem_list.set_status(SKIP)
+        summary = self.history.get_problem_history("hash-/folder/0.kif")
+        self.assertEqual(summary.last_status, SKIP)
+        self.assertEqual(summary.last_time, 3.0)
+
+    def test_status_then_time(self):
+        self.problem_list.go_to_idx(1)
+        self.problem_list.set_status(CORRECT)
+        self.problem_list.set_time(Time(4.0))
+        self.assertEqual(self.history.get_num_attempts("/folder"), 1)
+        (attempt,) = self.history.get_slowest_attempts(1)
+        self.assertEqual(attempt, ("hash-/folder/1.kif", "1.kif", 4.0, CORRECT))
+
+    def test_time_only(self):
+        # Free mode splits are not attempts
+        self.problem_list.go_to_idx(0)
+        self.problem_list.set_time(Time(3.0))
+        self.problem_list.go_to_idx(1)
+        self.problem_list.set_status(CORRECT)
+        self.assertEqual(self.history.get_num_attempts(), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
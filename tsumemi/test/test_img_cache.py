@@ -0,0 +1,50 @@
+import unittest
+
+from tsumemi.src.tsumemi.board_gui.img_handlers import ScaledImageCache, quantise_size
+
+
+class TestScaledImageCache(unittest.TestCase):
+    def setUp(self):
+        self.cache = ScaledImageCache(max_bytes=100)
+
+    def test_get_missing(self):
+        self.assertIsNone(self.cache.get(("skin", "upright", "FU", 40, 40)))
+
+    def test_evicts_least_recently_used(self):
+        self.cache.put("a", "img_a", 40)
+        self.cache.put("b", "img_b", 40)
+        self.assertEqual(self.cache.get("a"), "img_a")
+        self.cache.put("c", "img_c", 40)
+        self.assertNotIn("b", self.cache)
+        self.assertIn("a", self.cache)
+        self.assertIn("c", self.cache)
+        self.assertEqual(self.cache.nbytes, 80)
+
+    def test_replace_entry(self):
+        self.cache.put("a", "img_a", 40)
+        self.cache.put("a", "img_a2", 60)
+        self.assertEqual(len(self.cache), 1)
+        self.assertEqual(self.cache.nbytes, 60)
+        self.assertEqual(self.cache.get("a"), "img_a2")
+
+    def test_oversized_entry_kept(self):
+        self.cache.put("a", "img_a", 40)
+        self.cache.put("big", "img_big", 500)
+        self.assertEqual(len(self.cache), 1)
+        self.assertEqual(self.cache.get("big"), "img_big")
+
+    def test_clear(self):
+        self.cache.put("a", "img_a", 40)
+        self.cache.clear()
+        self.assertEqual(len(self.cache), 0)
+        self.assertEqual(self.cache.nbytes, 0)
+
+    def test_quantise_size(self):
+        self.assertEqual(quantise_size(41), 42)
+        self.assertEqual(quantise_size(41.9), 42)
+        self.assertEqual(quantise_size(42), 42)
+        self.assertEqual(quantise_size(0), quantise_size(1))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,173 @@
+import csv
+import json
+import os
+import tempfile
+import unittest
+
+import tsumemi.src.tsumemi.event as evt
+import tsumemi.src.tsumemi.instrumentation as instrumentation
+
+from tsumemi.src.tsumemi.instrumentation import EventTracer, Profiler, percentile
+
+
+class FakeClock:
+    def __init__(self, step):
+        self.now = 0
+        self.step = step
+
+    def __call__(self):
+        self.now += self.step
+        return self.now
+
+
+class TestProfiler(unittest.TestCase):
+    def setUp(self):
+        self.profiler = Profiler(enabled=True, window=100, clock=FakeClock(1000))
+
+    def test_percentile(self):
+        values = list(range(1, 101))
+        self.assertEqual(percentile(values, 50), 50)
+        self.assertEqual(percentile(values, 99), 99)
+        self.assertEqual(percentile(values, 100), 100)
+        self.assertEqual(percentile([7], 50), 7)
+
+    def test_measure(self):
+        with self.profiler.measure("section"):
+            pass
+        summary = self.profiler.get_summary()["section"]
+        self.assertEqual(summary["count"], 1)
+        self.assertEqual(summary["max_ms"], 0.001)
+
+    def test_timed(self):
+        @self.profiler.timed("func")
+        def func(x):
+            return 2 * x
+        self.assertEqual(func(3), 6)
+        self.assertEqual(self.profiler.get_summary()["func"]["count"], 1)
+
+    def test_disabled(self):
+        profiler = Profiler(enabled=False)
+        with profiler.measure("section"):
+            pass
+        self.assertEqual(profiler.get_summary(), {})
+
+    def test_rolling_window(self):
+        for duration in range(1, 251):
+            self.profiler.record("section", duration * 1_000_000)
+        summary = self.profiler.get_summary()["section"]
+        self.assertEqual(summary["count"], 250)
+        # Only the last 100 durations, 151 to 250 ms, are kept
+        self.assertEqual(summary["p50_ms"], 200)
+        self.assertEqual(summary["max_ms"], 250)
+        self.assertAlmostEqual(summary["mean_ms"], 200.5)
+
+    def test_dump(self):
+        self.profiler.record("a", 2_000_000)
+        self.profiler.record("b", 4_000_000)
+        with tempfile.TemporaryDirectory() as tmpdir:
+            csv_path = os.path.join(tmpdir, "timings.csv")
+            json_path = os.path.join(tmpdir, "timings.json")
+            self.profiler.dump(csv_path)
+            self.profiler.dump(json_path)
+            with open(csv_path, newline="", encoding="utf-8") as fin:
+                rows = list(csv.DictReader(fin))
+            with open(json_path, encoding="utf-8") as fin:
+                data = json.load(fin)
+        self.assertEqual([row["name"] for row in rows], ["a", "b"])
+        self.assertEqual(float(rows[1]["p99_ms"]), 4.0)
+        self.assertEqual(data["a"]["mean_ms"], 2.0)
+
+    def test_reset(self):
+        self.profiler.record("a", 1)
+        self.profiler.reset()
+        self.assertEqual(self.profiler.get_summary(), {})
+
+
+class PingEvent(evt.Event):
+    pass
+
+
+class PingObserver(evt.IObserver):
+    def __init__(self, emitter=None):
+        super().__init__()
+        self.emitter = emitter
+        self.set_callbacks({PingEvent: self.on_ping})
+
+    def on_ping(self, event):
+        if self.emitter is not None:
+            # Handling one event emits another
+            self.emitter._notify_observers(evt.Event())
+
+
+class TestEventTracer(unittest.TestCase):
+    def setUp(self):
+        self.tracer = EventTracer(enabled=True, clock=FakeClock(1000))
+        self.old_tracer = instrumentation.TRACER
+        # The emitter looks the tracer up in its own module
+        evt.TRACER = self.tracer
+
+    def tearDown(self):
+        evt.TRACER = self.old_tracer
+
+    def test_dispatch(self):
+        emitter = evt.Emitter()
+        observers = [PingObserver(), PingObserver()]
+        for observer in observers:
+            emitter.add_observer(observer)
+        emitter._notify_observers(PingEvent())
+        (trace,) = self.tracer.traces
+        self.assertEqual(trace.event_type, "PingEvent")
+        self.assertEqual(trace.sender, "Emitter")
+        self.assertEqual(trace.num_observers, 2)
+        self.assertEqual(
+            [handler.name for handler in trace.handlers],
+            ["PingObserver.on_ping"] * 2,
+        )
+        # Each tick of the fake clock is 1 us
+        self.assertEqual([h.duration_ns for h in trace.handlers], [1000] * 2)
+        self.assertEqual(trace.duration_ns, 5000)
+
+    def test_disabled(self):
+        self.tracer.enabled = False
+        emitter = evt.Emitter()
+        observer = PingObserver()
+        emitter.add_observer(observer)
+        emitter._notify_observers(PingEvent())
+        self.assertEqual(len(self.tracer.traces), 0)
+
+    def test_chrome_trace(self):
+        emitter = evt.Emitter()
+        observer = PingObserver(emitter)
+        emitter.add_observer(observer)
+        emitter._notify_observers(PingEvent())
+        with tempfile.TemporaryDirectory() as tmpdir:
+            filepath = os.path.join(tmpdir, "trace.json")
+            self.tracer.write_chrome_trace(filepath)
+            with open(filepath, encoding="utf-8") as fin:
+                data = json.load(fin)
+        trace_events = data["traceEvents"]
+        self.assertEqual(
+            [trace_event["name"] for trace_event in trace_events],
+            ["PingEvent", "PingObserver.on_ping", "Event",
+                "PingObserver.on_notify"],
+        )
+        self.assertTrue(all(e["ph"] == "X" for e in trace_events))
+        outer, handler, inner, _ = trace_events
+        # The nested dispatch lies within the handler that caused it
+        self.assertLessEqual(handler["ts"], inner["ts"])
+        self.assertLessEqual(
+            inner["ts"] + inner["dur"], handler["ts"] + handler["dur"]
+        )
+        self.assertEqual(outer["args"]["observers"], 1)
+
+    def test_max_events(self):
+        tracer = EventTracer(enabled=True, max_events=3)
+        for _ in range(5):
+            tracer.end_dispatch(tracer.start_dispatch("Event", "Emitter", 0))
+        self.assertEqual(len(tracer.traces), 3)
+        tracer.reset()
+        self.assertEqual(tracer.get_chrome_trace()["traceEvents"], [])
+
+
+if __name__ == "__main__":
+    unittest.main()
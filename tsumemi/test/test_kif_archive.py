@@ -0,0 +1,81 @@
+import os
+import tempfile
+import unittest
+
+import tsumemi.src.shogi.parsing.kif as kif
+import tsumemi.src.tsumemi.kif_archive as kif_archive
+
+
+KIF_DIR = os.path.normpath(r"./tsumemi/test/test_kifus")
+
+
+class TestKifArchive(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.archive_path = os.path.join(self.tmpdir.name, "test.tsma")
+        # testbranch.kif has an unsupported handicap; still packable
+        self.num_packed = kif_archive.pack_directory(
+            KIF_DIR, self.archive_path, recursive=False
+        )
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_pack_directory(self):
+        self.assertEqual(self.num_packed, 13)
+        with kif_archive.KifArchive(self.archive_path) as archive:
+            self.assertEqual(len(archive), 13)
+            self.assertIn("1.kif", archive.get_names())
+            self.assertIn("testlinear.kifu", archive.get_names())
+
+    def test_read_game(self):
+        with kif_archive.KifArchive(self.archive_path) as archive:
+            for idx, name in enumerate(archive.get_names()):
+                if name == "testbranch.kif":
+                    continue
+                game = archive.read_game(idx)
+                game.go_to_end()
+                archived_sfen = game.position.to_sfen()
+                game = kif.read_kif(os.path.join(KIF_DIR, name))
+                game.go_to_end()
+                self.assertEqual(archived_sfen, game.position.to_sfen())
+
+    def test_read_text_roundtrip(self):
+        with open(os.path.join(KIF_DIR, "1.kif"), "rb") as kif_file:
+            text = kif.decode_kif_bytes(kif_file.read())
+        with kif_archive.KifArchive(self.archive_path) as archive:
+            idx = archive.get_names().index("1.kif")
+            self.assertEqual(archive.read_text(idx), text)
+
+    def test_writer_streaming(self):
+        archive_path = os.path.join(self.tmpdir.name, "written.tsma")
+        with kif_archive.KifArchiveWriter(archive_path) as writer:
+            writer.add("a.kif", "手合割：平手\n")
+            writer.add("サブ/b.kif", "")
+        with kif_archive.KifArchive(archive_path) as archive:
+            self.assertEqual(archive.get_names(), ["a.kif", "サブ/b.kif"])
+            self.assertEqual(archive.read_text(0), "手合割：平手\n")
+            self.assertEqual(archive.read_text(1), "")
+
+    def test_writer_interrupted(self):
+        archive_path = os.path.join(self.tmpdir.name, "interrupted.tsma")
+        with self.assertRaises(KeyboardInterrupt):
+            with kif_archive.KifArchiveWriter(archive_path) as writer:
+                writer.add("a.kif", "手合割：平手\n")
+                raise KeyboardInterrupt
+        self.assertFalse(os.path.exists(archive_path))
+
+    def test_invalid_archive(self):
+        bad_path = os.path.join(self.tmpdir.name, "bad.tsma")
+        with open(bad_path, "wb") as bad_file:
+            bad_file.write(b"not an archive at all, not even close")
+        with self.assertRaises(kif_archive.ArchiveFormatError):
+            kif_archive.KifArchive(bad_path)
+        with open(bad_path, "wb") as bad_file:
+            pass
+        with self.assertRaises(kif_archive.ArchiveFormatError):
+            kif_archive.KifArchive(bad_path)
+
+
+if __name__ == '__main__':
+    unittest.main()
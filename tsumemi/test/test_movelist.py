@@ -0,0 +1,72 @@
+import unittest
+
+from unittest import mock
+
+from tsumemi.src.shogi import rules
+from tsumemi.src.shogi.basetypes import KOMA_TYPES
+from tsumemi.src.shogi.notation import WesternMoveWriter, WESTERN_MOVE_FORMAT
+from tsumemi.src.shogi.parsing.base_readers_visitors import GameBuilderPVis
+from tsumemi.src.shogi.parsing.kif_reader import KifReader
+from tsumemi.src.shogi.position import Position
+from tsumemi.src.tsumemi.game.game_model import GameModel
+from tsumemi.src.tsumemi.movelist.movelist_viewmodel import MovelistViewModel
+from tsumemi.src.tsumemi.notation_writer import NotationWriter
+
+
+def read_game(filepath):
+    with open(filepath, "r", encoding="utf-8") as fin:
+        return KifReader().read(fin, GameBuilderPVis())
+
+
+class TestMovelistRows(unittest.TestCase):
+    def setUp(self):
+        self.move_writer = WesternMoveWriter(WESTERN_MOVE_FORMAT)
+        self.game = GameModel()
+        self.game.copy_from(read_game("./tsumemi/test/test_kifus/branchedgame.kif"))
+        self.viewmodel = MovelistViewModel(
+            self.game, NotationWriter(self.move_writer)
+        )
+
+    def get_expected_rows(self):
+        pos = Position()
+        pos.from_sfen(self.game.get_initial_sfen())
+        rows = []
+        for node in self.game.get_current_mainline():
+            move_str = node.write_move(self.move_writer, pos)
+            pos.make_move(node.move)
+            indicator = "+" if len(node.parent.variations) > 1 else ""
+            rows.append((str(node.id), (str(node.movenum), move_str, indicator)))
+        return rows
+
+    def test_rows(self):
+        self.assertEqual(self.viewmodel.get_mainline_rows(), self.get_expected_rows())
+
+    def test_rows_in_variation(self):
+        self.viewmodel.get_mainline_rows()
+        self.game.go_to_end()
+        self.game.go_prev_move()
+        for node in self.game.game.movetree.traverse_preorder():
+            if node.has_variations():
+                self.game.go_to_id(node.variations[1].id)
+                break
+        self.assertEqual(self.viewmodel.get_mainline_rows(), self.get_expected_rows())
+
+    def test_added_move_written_once(self):
+        self.viewmodel.get_mainline_rows()
+        self.game.go_to_end()
+        pos = self.game.get_position()
+        move = next(
+            move for ktype in KOMA_TYPES
+            for move in rules.generate_valid_moves(pos, pos.turn, ktype)
+        )
+        with mock.patch.object(
+            self.move_writer, "write_move", wraps=self.move_writer.write_move
+        ) as write_move:
+            self.game.add_move(move)
+            rows = self.viewmodel.get_mainline_rows()
+        self.assertEqual(write_move.call_count, 1)
+        self.assertEqual(rows, self.get_expected_rows())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,48 @@
+import unittest
+
+from unittest import mock
+
+from tsumemi.src.shogi import notation, rules
+from tsumemi.src.tsumemi.notation_writer import NotationWriter
+from tsumemi.test.test_movelist import read_game
+
+
+class TestNotationWriter(unittest.TestCase):
+    def setUp(self):
+        self.game = read_game("./tsumemi/test/test_kifus/branchedgame.kif")
+        self.western = notation.WesternMoveWriter(notation.WESTERN_MOVE_FORMAT)
+        self.japanese = notation.JapaneseMoveWriter(
+            notation.JAPANESE_MOVE_FORMAT
+        )
+        self.writer = NotationWriter(self.western)
+
+    def test_mainline_matches_game(self):
+        self.assertEqual(
+            self.writer.write_mainline(self.game),
+            self.game.get_mainline_notation(self.western),
+        )
+
+    def test_disambiguation_shared_between_writers(self):
+        num_moves = len(self.writer.write_mainline(self.game))
+        with mock.patch.object(
+            rules, "get_ambiguous_moves", wraps=rules.get_ambiguous_moves
+        ) as get_ambiguous_moves:
+            self.writer.change_move_writer(self.japanese)
+            japanese = self.writer.write_mainline(self.game)
+            self.writer.change_move_writer(self.western)
+            western = self.writer.write_mainline(self.game)
+        get_ambiguous_moves.assert_not_called()
+        self.assertEqual(len(japanese), num_moves)
+        self.assertEqual(japanese, self.game.get_mainline_notation(self.japanese))
+        self.assertEqual(western, self.game.get_mainline_notation(self.western))
+
+    def test_aggressive_disambiguation_cached_separately(self):
+        normal = self.writer.write_mainline(self.game)
+        self.western.aggressive_disambiguation = True
+        aggressive = self.writer.write_mainline(self.game)
+        self.assertEqual(aggressive, self.game.get_mainline_notation(self.western))
+        self.assertEqual(len(normal), len(aggressive))
+
+
+if __name__ == "__main__":
+    unittest.main()
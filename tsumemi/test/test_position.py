@@ -44,3 +44,54 @@ class TestPositionMethods(unittest.TestCase):
         sfen_hirate = "lnsgkgsnl/1r5b1/ppppppppp/9/9/9/PPPPPPPPP/1B5R1/LNSGKGSNL b - 1"
         self.position.from_sfen(sfen_hirate)
         self.assertEqual(self.position.to_sfen(), sfen_hirate)
+
+
+class TestPositionDiff(unittest.TestCase):
+    def setUp(self):
+        self.position = Position()
+        self.position.from_sfen("4k4/9/4p4/9/9/9/2s6/1G7/4K4 b Pr 1")
+
+    def assert_diff_matches(self, move):
+        before = self.position.copy()
+        self.position.make_move(move)
+        self.assertEqual(move.get_diff(), before.get_diff(self.position))
+        self.assertEqual(
+            move.get_diff().reverse(), self.position.get_diff(before)
+        )
+
+    def test_copy_is_independent(self):
+        copied = self.position.copy()
+        self.position.set_koma(Koma.NONE, Square.b53)
+        self.position.inc_hand_koma(Side.SENTE, KomaType.FU)
+        self.assertEqual(copied.get_koma(Square.b53), Koma.vFU)
+        self.assertEqual(copied.get_hand_koma_count(Side.SENTE, KomaType.FU), 1)
+        self.assertTrue(self.position.copy().get_diff(self.position).is_empty())
+
+    def test_board_move_diff(self):
+        move = self.position.create_move(Square.b88, Square.b77)
+        self.assertEqual(move.get_diff().squares, {Square.b88, Square.b77})
+        self.assertEqual(move.get_diff().hand_deltas, {(Side.SENTE, KomaType.GI): 1})
+        self.assert_diff_matches(move)
+
+    def test_promoting_capture_diff(self):
+        self.position.from_sfen("4k4/9/4p4/9/9/9/2+s6/1G7/4K4 b - 1")
+        move = self.position.create_move(Square.b88, Square.b77)
+        self.assertEqual(move.get_diff().hand_deltas, {(Side.SENTE, KomaType.GI): 1})
+        self.assert_diff_matches(move)
+
+    def test_drop_diff(self):
+        move = self.position.create_drop_move(Side.SENTE, KomaType.FU, Square.b54)
+        self.assertEqual(move.get_diff().squares, {Square.b54})
+        self.assertEqual(move.get_diff().hand_deltas, {(Side.SENTE, KomaType.FU): -1})
+        self.assert_diff_matches(move)
+
+    def test_merge(self):
+        first = self.position.create_drop_move(Side.SENTE, KomaType.FU, Square.b54)
+        self.position.make_move(first)
+        second = self.position.create_move(Square.b53, Square.b54)
+        merged = first.get_diff().merge(second.get_diff())
+        self.assertEqual(merged.squares, {Square.b53, Square.b54})
+        self.assertEqual(merged.hand_deltas, {
+            (Side.SENTE, KomaType.FU): -1, (Side.GOTE, KomaType.FU): 1
+        })
+        self.assertEqual(merged.get_hand_sides(), {Side.SENTE, Side.GOTE})
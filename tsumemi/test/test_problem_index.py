@@ -0,0 +1,114 @@
+import os
+import unittest
+
+import tsumemi.src.tsumemi.problem_list.problem_list_model as plist
+
+from tsumemi.src.tsumemi import files
+from tsumemi.src.tsumemi.problem_list.problem_index import mirror_sfen_board, position_key
+from tsumemi.src.tsumemi.problem_list.problem_list_controller import ProblemListController
+
+
+class TestPositionKey(unittest.TestCase):
+    def test_ignores_move_number(self):
+        self.assertEqual(
+            position_key("9/4k4/9/4S4/9/9/9/9/9 b GS2r2b3g2s4n4l18p 1"),
+            position_key("9/4k4/9/4S4/9/9/9/9/9 b GS2r2b3g2s4n4l18p 37"),
+        )
+
+    def test_distinguishes_hands(self):
+        self.assertNotEqual(
+            position_key("9/4k4/9/4S4/9/9/9/9/9 b GS2r2b3g2s4n4l18p 1"),
+            position_key("9/4k4/9/4S4/9/9/9/9/9 b G2S2r2b3gs4n4l18p 1"),
+        )
+
+    def test_mirror_sfen_board(self):
+        self.assertEqual(
+            mirror_sfen_board("7kl/9/5+P3/9/9/9/9/9/9"),
+            "lk7/9/3+P5/9/9/9/9/9/9",
+        )
+        self.assertEqual(
+            mirror_sfen_board("lnsgkgsnl/1r5b1/9/9/9/9/9/9/9"),
+            "lnsgkgsnl/1b5r1/9/9/9/9/9/9/9",
+        )
+
+    def test_mirror(self):
+        sfen = "7kl/9/5+P3/9/9/9/9/9/9 b GS2r2b3g3s4n3l17p 1"
+        mirrored = "lk7/9/3+P5/9/9/9/9/9/9 b GS2r2b3g3s4n3l17p 1"
+        self.assertNotEqual(position_key(sfen), position_key(mirrored))
+        self.assertEqual(
+            position_key(sfen, mirror=True), position_key(mirrored, mirror=True)
+        )
+
+
+class TestProblemIndex(unittest.TestCase):
+    def setUp(self):
+        # sample_problems/3te holds the same problems as test_kifus.
+        # Leave out one of the two full games from the even position.
+        filepaths = [
+            filepath for filepath in files.get_kif_files(
+                os.path.normpath("./tsumemi/test/test_kifus"), False
+            )
+            if os.path.basename(filepath) != "testlinear.kifu"
+        ] + list(files.get_kif_files(
+            os.path.normpath("./sample_problems/3te"), False
+        ))
+        self.controller = ProblemListController()
+        self.controller.problem_list.add_problems(
+            (plist.Problem(filepath) for filepath in filepaths),
+            suppress=True
+        )
+        self.controller.problem_list.sort_by_file()
+        self.index = self.controller.build_problem_index()
+
+    def test_find_duplicates(self):
+        duplicates = self.index.find_duplicates()
+        self.assertEqual(len(duplicates), 10)
+        for group in duplicates:
+            self.assertEqual(
+                sorted(os.path.basename(prob.filepath) for prob in group),
+                [os.path.basename(group[0].filepath)] * 2
+            )
+
+    def test_lookup_by_position(self):
+        sfen = "9/4k4/9/4S4/9/9/9/9/9 b GS2r2b3g2s4n4l18p 5"
+        found = self.index.lookup_by_position(sfen)
+        self.assertEqual(
+            sorted(os.path.basename(prob.filepath) for prob in found),
+            ["1.kif", "1.kif"]
+        )
+        self.assertEqual(self.index.lookup_by_position(
+            "9/4k4/9/4S4/9/9/9/9/9 w GS2r2b3g2s4n4l18p 5"
+        ), [])
+
+    def test_incremental_remove(self):
+        prob = self.index.find_duplicates()[0][0]
+        key = self.index.get_key(prob)
+        self.index.remove(prob)
+        self.assertNotIn(prob, self.index)
+        self.assertIsNone(self.index.get_key(prob))
+        self.assertEqual(len(self.index.find_duplicates()), 9)
+        self.assertNotIn(key, [
+            self.index.get_key(group[0])
+            for group in self.index.find_duplicates()
+        ])
+
+    def test_remove_duplicates(self):
+        problem_list = self.controller.problem_list
+        num_problems = len(problem_list)
+        problem_list.go_to_idx(0)
+        self.assertEqual(self.controller.remove_duplicates(), 10)
+        self.assertEqual(len(problem_list), num_problems - 10)
+        self.assertEqual(problem_list.curr_prob_idx, 0)
+        self.assertEqual(self.index.find_duplicates(), [])
+        self.assertEqual(self.controller.remove_duplicates(), 0)
+
+    def test_read_problem_indexes(self):
+        self.index.clear()
+        prob = self.controller.problem_list.problems[0]
+        self.controller.read_problem(prob)
+        self.assertIn(prob, self.index)
+        self.assertEqual(len(self.index), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,7 +1,10 @@
+import random
 import unittest
 
 import tsumemi.src.tsumemi.problem_list.problem_list_model as plist
 
+from tsumemi.src.tsumemi.timer import Time
+
 
 class TestProblemList(unittest.TestCase):
     '''Tests for the internals of the ProblemList class.'''
@@ -217,3 +220,94 @@ class TestProblemList(unittest.TestCase):
         self.event = None
         self.problem_list.sort_by_time()
         self.verify_list_event()
+
+
+class TestProblemListAggregates(unittest.TestCase):
+    """Running aggregates must always match a full scan of the list.
+    """
+    def setUp(self):
+        self.rng = random.Random(0)
+        self.problem_list = plist.ProblemList(
+            [plist.Problem(f"{num}.kif") for num in range(50)]
+        )
+
+    def verify_aggregates(self):
+        problems = self.problem_list.problems
+        for status in plist.ProblemStatus:
+            self.assertEqual(
+                self.problem_list.get_num_with_status(status),
+                sum(prob.status == status for prob in problems),
+            )
+        seen = (plist.ProblemStatus.CORRECT, plist.ProblemStatus.WRONG)
+        self.assertAlmostEqual(
+            self.problem_list.get_total_time(*seen).seconds,
+            sum(prob.time.seconds for prob in problems
+                if prob.time is not None and prob.status in seen),
+        )
+        timed = [prob for prob in problems if prob.time is not None]
+        if not timed:
+            self.assertIsNone(self.problem_list.get_slowest_problem())
+            self.assertIsNone(self.problem_list.get_fastest_problem())
+            return
+        self.assertEqual(
+            self.problem_list.get_slowest_problem().time,
+            max(prob.time for prob in timed),
+        )
+        self.assertEqual(
+            self.problem_list.get_fastest_problem().time,
+            min(prob.time for prob in timed),
+        )
+
+    def test_random_operations(self):
+        statuses = list(plist.ProblemStatus)
+        for step in range(2000):
+            action = self.rng.random()
+            if action < 0.4:
+                self.problem_list.go_to_idx(
+                    self.rng.randrange(len(self.problem_list))
+                )
+                self.problem_list.set_time(Time(self.rng.uniform(1, 100)))
+            elif action < 0.8:
+                self.problem_list.go_to_idx(
+                    self.rng.randrange(len(self.problem_list))
+                )
+                self.problem_list.set_status(self.rng.choice(statuses))
+            elif action < 0.85:
+                self.problem_list.remove_problems(
+                    self.rng.sample(self.problem_list.problems, 3)
+                )
+                self.problem_list.add_problems(
+                    plist.Problem(f"new{step}-{num}.kif") for num in range(3)
+                )
+            elif action < 0.88:
+                self.problem_list.clear_times()
+            elif action < 0.91:
+                self.problem_list.clear_statuses()
+            elif action < 0.95:
+                self.problem_list.sort_by_time()
+            else:
+                self.problem_list.set_results(
+                    (prob, self.rng.choice(statuses), None)
+                    for prob in self.rng.sample(self.problem_list.problems, 5)
+                )
+            if step % 50 == 0:
+                self.verify_aggregates()
+        self.verify_aggregates()
+
+    def test_stale_entries_compacted(self):
+        self.problem_list.go_to_idx(0)
+        for num in range(10_000):
+            self.problem_list.set_time(Time(num))
+        self.assertLess(len(self.problem_list._min_times), 200)
+        self.assertEqual(
+            self.problem_list.get_slowest_problem().time, Time(9999)
+        )
+
+    def test_float_times(self):
+        self.problem_list.go_to_idx(3)
+        self.problem_list.set_time(12.5)
+        self.assertEqual(self.problem_list.get_total_time(), Time(12.5))
+        self.assertIs(
+            self.problem_list.get_fastest_problem(),
+            self.problem_list.problems[3],
+        )
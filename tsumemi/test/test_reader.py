@@ -1,6 +1,10 @@
+import io
+import os
+import tempfile
 import unittest
 
 import tsumemi.src.shogi.parsing.kif as kif
+import tsumemi.src.shogi.parsing.kif_reader as kif_reader
 
 from tsumemi.src.shogi.parsing.kif_reader import KifReader, SFEN_FROM_HANDICAP
 from tsumemi.src.shogi.parsing.base_readers_visitors import GameBuilderPVis
@@ -58,4 +62,198 @@ class TestReadKifu(unittest.TestCase):
         visitor = GameBuilderPVis()
         read_file(r"./tsumemi/test/test_kifus/branchedgame.kif", reader, visitor)
         # print(reader.game.position)
-        # print(reader.game.movetree.to_latin())
\ No newline at end of file
+        # print(reader.game.movetree.to_latin())
+
+
+class CheckedKifReader(KifReader):
+    """KifReader that reads every move line with both the fast path
+    and the regex path, recording any disagreement.
+    """
+    def __init__(self):
+        super().__init__()
+        self.num_fast = 0
+        self.num_fast_same = 0
+        self.mismatches = []
+
+    def read_move(self, line):
+        fast_move = self._read_move_fast(line)
+        regex_move = self._read_move_regex(line)
+        if fast_move is not None:
+            self.num_fast += 1
+            if "同" in line:
+                self.num_fast_same += 1
+            if fast_move != regex_move:
+                self.mismatches.append(line)
+        return regex_move
+
+
+class TestFastMoveParsing(unittest.TestCase):
+    def setUp(self):
+        self.reader = KifReader()
+        self.reader.game.position.from_sfen(SFEN_FROM_HANDICAP["平手"])
+
+    def test_fast_path_matches_regex_path(self):
+        filenames = [str(i) + ".kif" for i in range(1, 11)] + [
+            "branchedgame.kif", "testlinear.kifu"
+        ]
+        for filename in filenames:
+            with self.subTest(filename=filename):
+                reader = CheckedKifReader()
+                read_file(r"./tsumemi/test/test_kifus/" + filename,
+                    reader, GameBuilderPVis()
+                )
+                self.assertGreater(reader.num_fast, 0)
+                self.assertEqual(reader.mismatches, [])
+
+    def test_fast_path_forms(self):
+        lines = [
+            "1 ７六歩(77)        ( 0:00/00:00:00)",
+            "1 7六歩(77)",
+            "1\t７六歩(77)",
+            "3 ２二角成(88)",
+            "11 ４五角打",
+        ]
+        for line in lines:
+            with self.subTest(line=line):
+                self.assertEqual(
+                    self.reader._read_move_fast(line),
+                    self.reader._read_move_regex(line),
+                )
+
+    def test_fast_path_same_square(self):
+        reader = CheckedKifReader()
+        read_file(r"./tsumemi/test/test_kifus/testlinear.kifu",
+            reader, GameBuilderPVis()
+        )
+        self.assertGreater(reader.num_fast_same, 0)
+        self.assertEqual(reader.mismatches, [])
+        # Explicit case with a real previous move
+        for line in ("1 ７六歩(77)", "2 ３四歩(33)", "3 ２二角成(88)"):
+            self.reader.game.add_move(self.reader._read_move_regex(line))
+        line = "4 同　銀(31)"
+        fast_move = self.reader._read_move_fast(line)
+        self.assertIsNotNone(fast_move)
+        self.assertEqual(fast_move, self.reader._read_move_regex(line))
+        self.assertEqual(fast_move.to_latin(), "S22(31)")
+
+    def test_fast_path_falls_back(self):
+        lines = [
+            "１ ７六歩(77)", # full-width move number
+            "1 同　歩(77)", # no previous move
+            "1 ７六王(77)", # not accepted by the regex either
+            "1 ７六歩不成(77)",
+            "1 ７六成と(77)",
+            "1 ７六歩", # missing origin
+            "1 ７六歩(7)",
+            "1 ７六と打", # not a hand piece
+            "5 投了",
+            "1 ７六",
+            "17",
+        ]
+        for line in lines:
+            with self.subTest(line=line):
+                self.assertIsNone(self.reader._read_move_fast(line))
+
+
+MALFORMED_KIF = """手合割：平手
+手数----指手---------消費時間--
+   1 ７六歩(77)        ( 0:00/00:00:00)
+   2 ３四歩(33)        ( 0:00/00:00:00)
+   3 ２二象成(88)       ( 0:00/00:00:00)
+   4 同　銀(31)        ( 0:00/00:00:00)
+   5 ４五角打           ( 0:00/00:00:00)
+
+変化：3手
+   3 ６六歩(67)        ( 0:00/00:00:00)
+   4 ８四歩(83)        ( 0:00/00:00:00)
+
+変化：9手
+   9 ６八銀(79)        ( 0:00/00:00:00)
+
+変化：4手
+   4 ４四歩(43)        ( 0:00/00:00:00)
+"""
+
+
+class TestTolerantReading(unittest.TestCase):
+    def test_strict_mode_raises(self):
+        reader = KifReader()
+        with self.assertRaises(ValueError):
+            reader.read(io.StringIO(MALFORMED_KIF), GameBuilderPVis())
+
+    def test_tolerant_mode_collects_diagnostics(self):
+        reader = KifReader(tolerant=True)
+        game = reader.read(io.StringIO(MALFORMED_KIF), GameBuilderPVis())
+        self.assertEqual(
+            [diagnostic.line_num for diagnostic in reader.diagnostics],
+            [5, 13]
+        )
+        self.assertTrue(reader.diagnostics[0].line.startswith("3 ２二象成"))
+        # Main line stops before the bad move; the variations are read
+        self.assertEqual(
+            game.movetree.to_latin(),
+            "1.P76(77) 2.P34(33) 3.P66(67) 4.P84(83) 4.P44(43)"
+        )
+
+    def test_missing_variation_start(self):
+        for var_line in ("変化：9手", "変化：0手"):
+            with self.subTest(var_line=var_line):
+                text = MALFORMED_KIF.replace("変化：3手", var_line)
+                reader = KifReader(tolerant=True)
+                reader.read(io.StringIO(text), GameBuilderPVis())
+                self.assertEqual(reader.diagnostics[1].line_num, 9)
+                self.assertEqual(reader.diagnostics[1].line, var_line)
+
+    def test_variation_at_first_move(self):
+        text = MALFORMED_KIF.replace("変化：3手", "変化：1手").replace(
+            "   3 ６六歩(67)", "   1 ５六歩(57)"
+        )
+        reader = KifReader(tolerant=True)
+        game = reader.read(io.StringIO(text), GameBuilderPVis())
+        self.assertEqual(len(game.movetree.variations), 2)
+
+    def test_read_kifs_tolerant(self):
+        filepaths = [
+            r"./tsumemi/test/test_kifus/1.kif",
+            r"./tsumemi/test/test_kifus/testbranch.kif",
+            r"./tsumemi/test/test_kifus/nonexistent.kif",
+        ]
+        results = list(kif.read_kifs_tolerant(filepaths))
+        self.assertEqual([result.is_ok() for result in results],
+            [True, False, False]
+        )
+        # testbranch.kif has an unknown handicap but a BOD, so the game
+        # itself is still read completely
+        self.assertEqual(len(results[1].diagnostics), 1)
+        self.assertEqual(results[1].diagnostics[0].line_num, 3)
+        self.assertIsNotNone(results[1].game)
+        self.assertIsNone(results[2].game)
+        report = io.StringIO()
+        counts = kif.write_diagnostics_report(results, report)
+        self.assertEqual(counts, (3, 2))
+        self.assertTrue(report.getvalue().endswith(
+            "3 files read, 2 with problems\n"
+        ))
+
+    def test_bad_hand_count(self):
+        # A hand count that is not a kanji number must not stop the
+        # files after it from being read
+        with open(r"./tsumemi/test/test_kifus/testbranch.kif",
+                encoding="utf-8") as fin:
+            text = fin.read().replace("歩十七", "歩一二三")
+        with tempfile.TemporaryDirectory() as tmpdir:
+            bad_path = os.path.join(tmpdir, "bad.kif")
+            with open(bad_path, "w", encoding="utf-8") as fout:
+                fout.write(text)
+            results = list(kif.read_kifs_tolerant(
+                [bad_path, r"./tsumemi/test/test_kifus/1.kif"]
+            ))
+        self.assertEqual([result.is_ok() for result in results],
+            [False, True]
+        )
+        self.assertTrue(any(
+            "歩一二三" in diagnostic.reason
+            for diagnostic in results[0].diagnostics
+        ))
+        with self.assertRaises(ValueError):
+            kif_reader._read_bod_hand("後手の持駒：歩一二三")
@@ -0,0 +1,50 @@
+import unittest
+
+from tsumemi.src.tsumemi.utils import RowWindow
+
+
+class TestRowWindow(unittest.TestCase):
+    def setUp(self):
+        self.window = RowWindow(num_rows=100_000, num_visible=20, margin=1)
+
+    def test_initial_rows(self):
+        self.assertEqual(self.window.get_rows(), range(0, 21))
+        self.assertEqual(self.window.get_fractions(), (0.0, 20/100_000))
+
+    def test_scroll_clamped(self):
+        self.window.scroll_by(-5)
+        self.assertEqual(self.window.first, 0)
+        self.window.scroll_to(200_000)
+        self.assertEqual(self.window.first, 99_980)
+        self.assertEqual(self.window.get_rows(), range(99_980, 100_000))
+        self.assertEqual(self.window.get_fractions()[1], 1.0)
+
+    def test_moveto(self):
+        self.window.moveto(0.5)
+        self.assertEqual(self.window.first, 50_000)
+
+    def test_see(self):
+        self.window.see(10)
+        self.assertEqual(self.window.first, 0)
+        self.window.see(50)
+        self.assertEqual(self.window.first, 31)
+        self.assertIn(50, self.window.get_rows())
+        self.window.see(5)
+        self.assertEqual(self.window.first, 5)
+
+    def test_shrink_list(self):
+        self.window.scroll_to(5000)
+        self.window.set_num_rows(30)
+        self.assertEqual(self.window.first, 10)
+        self.window.set_num_rows(5)
+        self.assertEqual(self.window.first, 0)
+        self.assertEqual(self.window.get_rows(), range(0, 5))
+
+    def test_empty(self):
+        window = RowWindow()
+        self.assertEqual(window.get_rows(), range(0, 0))
+        self.assertEqual(window.get_fractions(), (0.0, 1.0))
+
+
+if __name__ == "__main__":
+    unittest.main()
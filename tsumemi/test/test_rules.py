@@ -1,7 +1,8 @@
 import unittest
 
-from tsumemi.src.shogi.basetypes import KomaType, Side
+from tsumemi.src.shogi.basetypes import KOMA_TYPES, Koma, KomaType, Side
 from tsumemi.src.shogi.position import Position
+from tsumemi.src.shogi.square import Square
 import tsumemi.src.shogi.rules as rules
 
 
@@ -119,4 +120,57 @@ class TestMoveGeneration(unittest.TestCase):
         # check answers
         # print([mv.to_latin() for mv in droplist_fu])
         # print([mv.to_latin() for mv in droplist_ke])
-        # print([mv.to_latin() for mv in droplist_ka])
\ No newline at end of file
+        # print([mv.to_latin() for mv in droplist_ka])
+
+
+BOARD_SQUARES = [sq for sq in Square if sq.is_board()]
+
+
+class TestAttackers(unittest.TestCase):
+    """Checks the reverse attack queries against move generation.
+    """
+    SFENS = (
+        "p1p4P1/2P5P/3p3P1/3P4P/9/p4p3/1p3P3/p5p2/1p4P1P b - 1",
+        "4p4/4L2P1/5L2l/6l2/9/7L1/5l2L/4l1p2/4P4 b - 1",
+        "lnsgkgsnl/1r5b1/ppppppppp/9/9/9/PPPPPPPPP/1B5R1/LNSGKGSNL b - 1",
+        "4k4/1+R5+B1/3G1G3/2S3S2/1N1+P1+P1N1/2L3L2/3g1g3/1+r5+b1/4K4 w - 1",
+        "8l/1S2+B2G1/2G1k4/3s1N3/4R4/1G1N1P1R1/2b2+s3/1N2K2G1/L7L b - 1",
+    )
+
+    def get_positions(self):
+        for sfen in self.SFENS:
+            pos = Position()
+            pos.from_sfen(sfen)
+            yield pos
+
+    def test_attacker_squares(self):
+        for pos in self.get_positions():
+            for side in (Side.SENTE, Side.GOTE):
+                for ktype in KOMA_TYPES:
+                    expected = {}
+                    for move in rules.generate_valid_moves(pos, side, ktype):
+                        expected.setdefault(move.end_sq, set()).add(move.start_sq)
+                    for sq in BOARD_SQUARES:
+                        koma = pos.get_koma(sq)
+                        if koma != Koma.NONE and koma.side() == side:
+                            # Move generation leaves out own koma
+                            continue
+                        with self.subTest(sfen=pos.to_sfen(), side=side, ktype=ktype, sq=sq):
+                            self.assertEqual(
+                                set(rules.get_attacker_squares(pos, sq, side, ktype)),
+                                expected.get(sq, set()),
+                            )
+
+    def test_is_in_check(self):
+        for pos in self.get_positions():
+            for side in (Side.SENTE, Side.GOTE):
+                king_sqs = {
+                    sq for sq in BOARD_SQUARES
+                    if pos.get_koma(sq) == Koma.make(side, KomaType.OU)
+                }
+                expected = any(
+                    move.end_sq in king_sqs
+                    for ktype in KOMA_TYPES
+                    for move in rules.generate_valid_moves(pos, side.switch(), ktype)
+                )
+                self.assertEqual(rules.is_in_check(pos, side), expected)
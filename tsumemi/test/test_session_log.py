@@ -0,0 +1,179 @@
+import os
+import tempfile
+import unittest
+
+import tsumemi.src.tsumemi.problem_list.problem_list_model as plist
+import tsumemi.src.tsumemi.problem_list.session_log as slog
+
+from tsumemi.src.tsumemi.timer import Time
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestSessionLog(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.base_dir = os.path.join(self.tmpdir.name, "problems")
+        self.log_path = slog.get_session_log_path(
+            self.base_dir, self.tmpdir.name
+        )
+        self.problem_list = self.make_problem_list()
+        self.clock = FakeClock()
+        self.session_log = slog.SessionLog(
+            self.log_path, self.problem_list, self.base_dir,
+            fsync_interval=5, clock=self.clock,
+        )
+
+    def tearDown(self):
+        self.session_log.close()
+        self.tmpdir.cleanup()
+
+    def make_problem_list(self):
+        return plist.ProblemList([
+            plist.Problem(os.path.join(self.base_dir, f"{num}.kif"))
+            for num in range(1, 6)
+        ])
+
+    def solve(self, problem_list, idx, status, seconds):
+        problem_list.go_to_idx(idx)
+        problem_list.set_time(Time(seconds))
+        problem_list.set_status(status)
+
+    def restore(self):
+        problem_list = self.make_problem_list()
+        num_restored = slog.restore_session(
+            problem_list, slog.read_session_log(self.log_path), self.base_dir
+        )
+        return problem_list, num_restored
+
+    def test_log_path(self):
+        self.assertTrue(
+            os.path.basename(self.log_path).startswith("problems-")
+        )
+        self.assertNotEqual(
+            self.log_path,
+            slog.get_session_log_path(self.tmpdir.name, self.tmpdir.name),
+        )
+
+    def test_round_trip(self):
+        self.solve(self.problem_list, 0, plist.ProblemStatus.CORRECT, 12.5)
+        self.solve(self.problem_list, 3, plist.ProblemStatus.WRONG, 30.25)
+        # Solved again later in the session
+        self.solve(self.problem_list, 0, plist.ProblemStatus.SKIP, 4.0)
+        problem_list, num_restored = self.restore()
+        self.assertEqual(num_restored, 6)
+        for prob, restored in zip(self.problem_list, problem_list):
+            self.assertEqual(prob.status, restored.status)
+            self.assertEqual(prob.time, restored.time)
+        self.assertEqual(problem_list.problems[0].time, Time(4.0))
+
+    def test_records_survive_sorting(self):
+        # Records name problems, not their place in the list
+        self.problem_list.sort(key=lambda prob: str(prob.filepath),
+            suppress=True
+        )
+        self.problem_list.problems.reverse()
+        self.solve(self.problem_list, 0, plist.ProblemStatus.CORRECT, 1.0)
+        problem_list, _ = self.restore()
+        self.assertEqual(problem_list.problems[4].status,
+            plist.ProblemStatus.CORRECT
+        )
+
+    def test_clear(self):
+        self.solve(self.problem_list, 1, plist.ProblemStatus.CORRECT, 5.0)
+        self.problem_list.clear_statuses()
+        self.session_log.log_clear(statuses=True, times=False)
+        self.solve(self.problem_list, 2, plist.ProblemStatus.WRONG, 6.0)
+        problem_list, _ = self.restore()
+        self.assertEqual(problem_list.problems[1].status,
+            plist.ProblemStatus.NONE
+        )
+        self.assertEqual(problem_list.problems[1].time, Time(5.0))
+        self.assertEqual(problem_list.problems[2].status,
+            plist.ProblemStatus.WRONG
+        )
+
+    def test_truncated_last_line(self):
+        self.solve(self.problem_list, 0, plist.ProblemStatus.CORRECT, 1.0)
+        self.session_log.close()
+        # Crash in the middle of writing a record
+        with open(self.log_path, "a", encoding="utf-8") as fout:
+            fout.write('{"type":"status","problem":"2.k')
+        problem_list, num_restored = self.restore()
+        self.assertEqual(num_restored, 2)
+        # Resuming cuts off the partial record before appending
+        self.session_log = slog.SessionLog(
+            self.log_path, problem_list, self.base_dir
+        )
+        self.solve(problem_list, 4, plist.ProblemStatus.SKIP, 2.0)
+        self.session_log.close()
+        records = list(slog.read_session_log(self.log_path))
+        self.assertEqual(len(records), 4)
+        self.assertEqual(records[-1]["problem"], "5.kif")
+
+    def test_corrupt_line(self):
+        self.session_log.close()
+        with open(self.log_path, "a", encoding="utf-8") as fout:
+            fout.write("not json\n{}\n")
+        with self.assertRaises(ValueError):
+            self.restore()
+
+    def test_unknown_records_skipped(self):
+        self.solve(self.problem_list, 0, plist.ProblemStatus.CORRECT, 1.0)
+        self.session_log.close()
+        # Hand-edited or written by another version
+        with open(self.log_path, "a", encoding="utf-8") as fout:
+            fout.write(
+                '{"type":"status","problem":"2.kif","status":"GIVEN_UP"}\n'
+                '{"type":"status","problem":"2.kif"}\n'
+                '{"type":"time","problem":"2.kif"}\n'
+                '{"type":"time","problem":"2.kif","seconds":"slow"}\n'
+                '{"type":"note","problem":"2.kif"}\n'
+                '[1, 2]\n'
+                '{"type":"time","problem":"3.kif","seconds":7.5}\n'
+            )
+        problem_list, num_restored = self.restore()
+        self.assertEqual(num_restored, 3)
+        self.assertEqual(problem_list.problems[0].status,
+            plist.ProblemStatus.CORRECT
+        )
+        self.assertEqual(problem_list.problems[1].status,
+            plist.ProblemStatus.NONE
+        )
+        self.assertIsNone(problem_list.problems[1].time)
+        self.assertEqual(problem_list.problems[2].time, Time(7.5))
+
+    def test_periodic_fsync(self):
+        syncs = []
+        original_sync = self.session_log.sync
+        def sync():
+            syncs.append(self.clock.now)
+            original_sync()
+        self.session_log.sync = sync
+        for now in (1, 2, 6, 7, 12):
+            self.clock.now = now
+            self.session_log.log_clear(statuses=True, times=True)
+        self.assertEqual(syncs, [6, 12])
+
+    def test_unknown_problems_skipped(self):
+        self.solve(self.problem_list, 0, plist.ProblemStatus.CORRECT, 1.0)
+        problem_list = plist.ProblemList([
+            plist.Problem(os.path.join(self.base_dir, "other.kif"))
+        ])
+        num_restored = slog.restore_session(
+            problem_list, slog.read_session_log(self.log_path), self.base_dir
+        )
+        self.assertEqual(num_restored, 0)
+        self.assertEqual(problem_list.problems[0].status,
+            plist.ProblemStatus.NONE
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
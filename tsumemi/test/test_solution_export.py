@@ -0,0 +1,87 @@
+import csv
+import io
+import os
+import tempfile
+import unittest
+
+from tsumemi.src.shogi import notation
+from tsumemi.src.shogi.position import Position
+from tsumemi.src.tsumemi import solution_export
+from tsumemi.test.test_movelist import read_game
+
+
+KIF_DIR = os.path.normpath(r"./tsumemi/test/test_kifus")
+
+
+class TestWriteGameNotation(unittest.TestCase):
+    def setUp(self):
+        self.game = read_game(os.path.join(KIF_DIR, "branchedgame.kif"))
+        self.move_writers = list(solution_export.MOVE_WRITERS.values())
+
+    def test_matches_single_writer(self):
+        res = notation.write_game_notation(self.game, self.move_writers)
+        self.assertEqual(
+            len(res), len(list(self.game.movetree.traverse_preorder()))
+        )
+        for i, move_writer in enumerate(self.move_writers):
+            for line in solution_export.get_lines(self.game, variations=True):
+                pos = Position()
+                pos.from_sfen(self.game.movetree.start_pos)
+                for node in line:
+                    self.assertEqual(
+                        res[node.id][i], node.write_move(move_writer, pos)
+                    )
+                    pos.make_move(node.move)
+
+    def test_mainline_lines(self):
+        lines = solution_export.get_lines(self.game)
+        self.assertEqual(len(lines), 1)
+        self.assertEqual(
+            lines[0], list(self.game.movetree.traverse_mainline())[1:]
+        )
+
+
+class TestExportSolutions(unittest.TestCase):
+    def test_export(self):
+        kif_paths = [os.path.join(KIF_DIR, f"{i}.kif") for i in range(1, 11)]
+        handle = io.StringIO()
+        results = list(solution_export.export_solutions(
+            kif_paths, handle, ["western", "japanese"], directory=KIF_DIR
+        ))
+        self.assertEqual(results, [None] * 10)
+        rows = list(csv.reader(io.StringIO(handle.getvalue())))
+        self.assertEqual(rows[0], ["file", "line", "western", "japanese"])
+        self.assertEqual(len(rows), 11)
+        self.assertEqual(rows[1][:2], ["1.kif", "1"])
+        self.assertTrue(all(row[2] and row[3] for row in rows[1:]))
+
+    def test_unreadable_file(self):
+        results = list(solution_export.export_solutions(
+            [os.path.join(KIF_DIR, "missing.kif")], io.StringIO(), ["western"]
+        ))
+        self.assertEqual(len(results), 1)
+        self.assertIsNotNone(results[0])
+
+    def test_malformed_file(self):
+        # The mainline would stop before the bad move, so no partial
+        # solution is written
+        with open(os.path.join(KIF_DIR, "1.kif"), "rb") as fin:
+            text = fin.read().decode("cp932")
+        bad_text = text.replace("４二金打", "４二象打")
+        with tempfile.TemporaryDirectory() as tmpdir:
+            bad_path = os.path.join(tmpdir, "bad.kif")
+            with open(bad_path, "w", encoding="utf-8") as fout:
+                fout.write(bad_text)
+            handle = io.StringIO()
+            results = list(solution_export.export_solutions(
+                [bad_path, os.path.join(KIF_DIR, "1.kif")], handle,
+                ["western"], directory=KIF_DIR,
+            ))
+        self.assertIn("line", results[0])
+        self.assertIsNone(results[1])
+        rows = list(csv.reader(io.StringIO(handle.getvalue())))
+        self.assertEqual([row[0] for row in rows[1:]], ["1.kif"])
+
+
+if __name__ == "__main__":
+    unittest.main()
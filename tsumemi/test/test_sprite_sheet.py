@@ -0,0 +1,50 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+from PIL import Image, ImageChops
+
+from tsumemi.src.shogi.basetypes import KomaType
+from tsumemi.src.tsumemi.board_gui.sprite_sheet import LazyImage, SpriteSheet
+from tsumemi.src.tsumemi.board_gui.sprite_sheet import build_sprite_sheet, get_koma_image_filename
+
+
+SKIN_DIR = os.path.normpath(r"./tsumemi/resources/images/pieces/kanji_light")
+
+
+class TestSpriteSheet(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.skin_dir = os.path.join(self.tmpdir.name, "skin")
+        shutil.copytree(SKIN_DIR, self.skin_dir)
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_no_sprite_sheet(self):
+        self.assertIsNone(SpriteSheet.find(self.skin_dir))
+
+    def test_sprite_sheet_matches_images(self):
+        build_sprite_sheet(self.skin_dir)
+        sheet = SpriteSheet.find(self.skin_dir)
+        self.assertIsNotNone(sheet)
+        for ktype in (KomaType.FU, KomaType.OU, KomaType.RY):
+            for invert in (False, True):
+                with self.subTest(ktype=ktype, invert=invert):
+                    expected = Image.open(os.path.join(
+                        self.skin_dir, get_koma_image_filename(ktype, invert)
+                    )).convert("RGBA")
+                    actual = sheet.get_image(ktype, invert)
+                    self.assertEqual(actual.size, expected.size)
+                    self.assertIsNone(
+                        ImageChops.difference(actual, expected).getbbox()
+                    )
+
+    def test_lazy_image_decodes_once(self):
+        lazy_img = LazyImage(os.path.join(self.skin_dir, "0FU.png"))
+        self.assertIs(lazy_img(), lazy_img())
+
+
+if __name__ == '__main__':
+    unittest.main()
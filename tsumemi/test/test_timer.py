@@ -1,6 +1,7 @@
+import math
 import unittest
 
-from time import sleep
+from time import perf_counter, sleep
 
 from tsumemi.src.tsumemi import timer
 
@@ -124,4 +125,54 @@ class TestTimer(unittest.TestCase):
             self.assertEqual(
                 timer.Time.to_hms_str(timer.Time(case), places=1),
                 answer
-            )
\ No newline at end of file
+            )
+
+
+class FakeClock:
+    """Clock in nanoseconds that advances by a fixed step on each
+    reading.
+    """
+    def __init__(self, step):
+        self.now = 0
+        self.step = step
+
+    def __call__(self):
+        self.now += self.step
+        return self.now
+
+
+class TestSplitTimerTotals(unittest.TestCase):
+    '''Tests for SplitTimer's running totals, with a fake clock.'''
+    def setUp(self):
+        self.clock = FakeClock(100_000_001)
+        self.timer = timer.SplitTimer(clock=self.clock)
+
+    def test_pause_within_lap(self):
+        self.timer.start()  # 1
+        self.timer.stop()  # 2
+        self.timer.start()  # 3
+        self.assertEqual(self.timer.split(), 0.200000002)  # 4
+        self.timer.stop()  # 5
+        self.assertEqual(self.timer.split(), 0.100000001)
+        self.assertEqual(self.timer.read(), 0.300000003)
+
+    def test_long_session(self):
+        num_laps = 100_000
+        self.timer.start()
+        start = perf_counter()
+        for _ in range(num_laps):
+            self.timer.split()
+            self.timer.read()
+        elapsed = perf_counter() - start
+        # Each lap is one step of the clock, and reads in between
+        # count towards the next lap. The total is exact.
+        self.timer.stop()
+        total_ns = self.clock.now - self.clock.step
+        self.timer.split()
+        self.assertEqual(len(self.timer.lap_times), num_laps + 1)
+        self.assertEqual(self.timer.read(), total_ns / 1e9)
+        self.assertAlmostEqual(
+            self.timer.read(), math.fsum(self.timer.lap_times), places=6
+        )
+        # Summing the laps on every read takes minutes here
+        self.assertLess(elapsed, 10)
@@ -0,0 +1,88 @@
+import io
+import os
+import tempfile
+import unittest
+
+import tsumemi.src.shogi.parsing.kif as kif
+
+from tsumemi.src.shogi.parsing.kif_reader import KifReader
+from tsumemi.src.shogi.parsing.kif_writer import KifWriter
+from tsumemi.src.shogi.parsing.base_readers_visitors import GameBuilderPVis
+
+
+def write_to_string(game):
+    handle = io.StringIO()
+    KifWriter().write(game, handle)
+    return handle.getvalue()
+
+
+def read_from_string(text):
+    return KifReader().read(io.StringIO(text), GameBuilderPVis())
+
+
+class TestWriteKif(unittest.TestCase):
+    def assert_same_game(self, game, other):
+        self.assertEqual(game.movetree.start_pos, other.movetree.start_pos)
+        self.assertEqual(game.movetree.to_latin(), other.movetree.to_latin())
+        self.assertEqual(
+            [node.comment for node in game.movetree.traverse_preorder()],
+            [node.comment for node in other.movetree.traverse_preorder()]
+        )
+
+    def test_roundtrip(self):
+        filenames = [str(i) + ".kif" for i in range(1, 11)] + [
+            "branchedgame.kif", "testlinear.kifu"
+        ]
+        for filename in filenames:
+            with self.subTest(filename=filename):
+                game = kif.read_kif(r"./tsumemi/test/test_kifus/" + filename)
+                text = write_to_string(game)
+                self.assert_same_game(game, read_from_string(text))
+                # Writing is deterministic
+                self.assertEqual(text, write_to_string(read_from_string(text)))
+
+    def test_variations(self):
+        game = kif.read_kif(r"./tsumemi/test/test_kifus/branchedgame.kif")
+        text = write_to_string(game)
+        num_variations = sum(
+            len(node.variations) - 1
+            for node in game.movetree.traverse_preorder() if node.variations
+        )
+        self.assertGreater(num_variations, 0)
+        self.assertEqual(text.count("変化："), num_variations)
+
+    def test_header(self):
+        game = kif.read_kif(r"./tsumemi/test/test_kifus/testlinear.kifu")
+        self.assertIn("手合割：平手\n", write_to_string(game))
+        game = kif.read_kif(r"./tsumemi/test/test_kifus/1.kif")
+        text = write_to_string(game)
+        self.assertNotIn("手合割", text)
+        self.assertIn("後手の持駒：飛二　角二　金三　銀二　桂四　香四　歩十八\n", text)
+        self.assertIn("| ・ ・ ・ ・v玉 ・ ・ ・ ・|二\n", text)
+        self.assertIn("先手の持駒：金　銀\n", text)
+        self.assertIn("   1 ５三銀打\n", text)
+        self.assertIn("   4 詰み\n", text)
+
+    def test_comments(self):
+        game = kif.read_kif(r"./tsumemi/test/test_kifus/1.kif")
+        game.movetree.comment = "第１問"
+        node = game.movetree.variations[0]
+        node.comment = "王手\n二行目"
+        text = write_to_string(game)
+        self.assertIn("   1 ５三銀打\n*王手\n*二行目\n", text)
+        self.assert_same_game(game, read_from_string(text))
+
+    def test_write_kif(self):
+        # kif.read_kif() reuses its game, so read the original separately
+        with open(r"./tsumemi/test/test_kifus/branchedgame.kif",
+                encoding="utf-8") as kif_file:
+            game = read_from_string(kif_file.read())
+        with tempfile.TemporaryDirectory() as tmpdir:
+            for filename in ("game.kif", "game.kifu"):
+                filepath = os.path.join(tmpdir, filename)
+                kif.write_kif(game, filepath)
+                self.assert_same_game(game, kif.read_kif(filepath))
+
+
+if __name__ == '__main__':
+    unittest.main()